@@ -0,0 +1,173 @@
+import bisect
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.urls import reverse
+
+from dogs.models import Breed, Dog
+
+AUTOCOMPLETE_VERSION_KEY = 'autocomplete:version'
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+
+def normalize(text):
+    """
+    Приводит текст к виду для сравнения: нижний регистр, ё -> е.
+    Параметры:
+    text (str): Текст.
+    Возвращает:
+    str: Нормализованный текст.
+    """
+    return text.lower().replace('ё', 'е').strip()
+
+
+def get_autocomplete_version():
+    """
+    Возвращает версию данных подсказок.
+    Версия хранится в общем кэше (CACHE_ENABLED). Без него кэш принадлежит процессу и
+    не узнает об изменениях из других процессов сервера, поэтому версией служат
+    количество и дата последнего изменения пород и собак (запросы к базе данных).
+    Возвращает:
+    int | tuple: Версия.
+    """
+    if settings.CACHE_ENABLED:
+        return cache.get(AUTOCOMPLETE_VERSION_KEY, 0)
+    return tuple(
+        tuple(model.objects.aggregate(count=Count('pk'), updated_at=Max('updated_at')).values())
+        for model in (Breed, Dog)
+    )
+
+
+def bump_autocomplete_version():
+    """
+    Помечает индексы подсказок всех процессов устаревшими.
+    Вызывается при сохранении и удалении пород и собак.
+    """
+    if not settings.CACHE_ENABLED:
+        return
+    try:
+        cache.incr(AUTOCOMPLETE_VERSION_KEY)
+    except ValueError:
+        cache.set(AUTOCOMPLETE_VERSION_KEY, 1, None)
+
+
+class PrefixIndex:
+    """
+    Индекс подсказок по префиксу в памяти процесса.
+    Ключи (нормализованное название с начала каждого слова) хранятся в отсортированном списке,
+    поиск находит первый ключ с префиксом через bisect и читает подряд идущие ключи.
+    Атрибуты:
+    version (int | tuple): Версия данных, по которой построен индекс.
+    """
+
+    def __init__(self, entries, version):
+        """
+        Параметры:
+        entries (iterable): Пары (название, данные подсказки).
+        version (int | tuple): Версия данных.
+        """
+        self.version = version
+        self.items = []
+        keys = []
+        for position, (name, item) in enumerate(entries):
+            self.items.append(item)
+            words = normalize(name).split()
+            for start in range(len(words)):
+                keys.append((' '.join(words[start:]), position))
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.positions = [position for _, position in keys]
+
+    def search(self, prefix, limit):
+        """
+        Возвращает подсказки, название которых (или одно из его слов) начинается с prefix.
+        Параметры:
+        prefix (str): Введенный текст.
+        limit (int): Максимальное количество подсказок.
+        Возвращает:
+        list: Данные подсказок без повторов.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        found = []
+        seen = set()
+        index = bisect.bisect_left(self.keys, prefix)
+        while index < len(self.keys) and self.keys[index].startswith(prefix) and len(found) < limit:
+            position = self.positions[index]
+            if position not in seen:
+                seen.add(position)
+                found.append(self.items[position])
+            index += 1
+        return found
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def build_breed_index(version):
+    """
+    Строит индекс подсказок пород.
+    """
+    breeds = Breed.objects.order_by('name').values_list('pk', 'name')
+    return PrefixIndex(
+        ((name, {'id': pk, 'name': name, 'url': reverse('dogs:breed_dogs', args=[pk])}) for pk, name in breeds),
+        version,
+    )
+
+
+def build_dog_index(version):
+    """
+    Строит индекс подсказок активных собак.
+    """
+    dogs = Dog.objects.filter(is_active=True).order_by('name').values_list('pk', 'name', 'breed__name')
+    return PrefixIndex(
+        ((name, {'id': pk, 'name': name, 'breed': breed, 'url': reverse('dogs:dog_detail', args=[pk])})
+         for pk, name, breed in dogs),
+        version,
+    )
+
+
+INDEX_BUILDERS = {
+    'breed': build_breed_index,
+    'dog': build_dog_index,
+}
+
+
+def get_index(kind, version=None):
+    """
+    Возвращает индекс подсказок процесса, перестраивая его, если версия данных изменилась.
+    Пока версия не меняется, поиск не обращается к базе данных (кроме проверки версии без CACHE_ENABLED).
+    Параметры:
+    kind (str): 'breed' или 'dog'.
+    version (int | tuple): Текущая версия данных, если уже получена.
+    Возвращает:
+    PrefixIndex: Индекс подсказок.
+    """
+    if version is None:
+        version = get_autocomplete_version()
+    index = _indexes.get(kind)
+    if index is None or index.version != version:
+        with _lock:
+            index = _indexes.get(kind)
+            if index is None or index.version != version:
+                index = INDEX_BUILDERS[kind](version)
+                _indexes[kind] = index
+    return index
+
+
+def autocomplete(query, kinds=('breed', 'dog'), limit=10):
+    """
+    Возвращает подсказки пород и активных собак по началу названия.
+    Параметры:
+    query (str): Введенный текст.
+    kinds (tuple): Типы подсказок.
+    limit (int): Максимальное количество подсказок каждого типа.
+    Возвращает:
+    dict: Тип -> список подсказок.
+    """
+    version = get_autocomplete_version()
+    return {kind: get_index(kind, version).search(query, limit) for kind in kinds}
@@ -0,0 +1,196 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, Http404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+from django.views import View
+
+from api.utils import compute_etag, get_feed_version
+from dogs.models import Dog
+from reviews.models import Review
+
+FEED_LIMIT = 30
+FEED_CACHE_TIMEOUT = 60 * 60
+FEED_CLIENT_MAX_AGE = 60
+
+
+class FeedView(View):
+    """
+    Базовое представление ленты в форматах Atom и JSON Feed.
+    Тело ленты формируется один раз для каждой версии (см. bump_feed_version) и хранится в кэше
+    вместе с ETag и датой последнего изменения, поэтому опрос ленты не обращается к базе данных.
+    Без общего кэша (CACHE_ENABLED) лента формируется на каждый запрос: кэш процесса не узнает
+    об изменениях, сделанных в других процессах сервера.
+    Атрибуты:
+    name (str): Имя ленты, часть ключа кэша.
+    title (str): Заголовок ленты.
+    list_url_name (str): Имя маршрута HTML-страницы со списком.
+    queryset (QuerySet): Упорядоченный запрос values() записей ленты.
+    make_entry: Функция, превращающая строку queryset в запись ленты - словарь с ключами
+    title, url (путь), content, updated (datetime) и author.
+    """
+    name = None
+    title = None
+    list_url_name = None
+    queryset = None
+    make_entry = None
+    content_types = {
+        'atom': 'application/atom+xml; charset=utf-8',
+        'json': 'application/feed+json; charset=utf-8',
+    }
+
+    def get_entries(self):
+        """
+        Возвращает последние FEED_LIMIT записей ленты одним запросом.
+        Возвращает:
+        list: Записи ленты (см. make_entry).
+        """
+        return [self.make_entry(row) for row in self.queryset.all()[:FEED_LIMIT]]
+
+    def render_atom(self, request, entries):
+        """
+        Формирует ленту Atom.
+        Возвращает:
+        bytes: XML ленты.
+        """
+        feed = Atom1Feed(
+            title=self.title,
+            link=request.build_absolute_uri(reverse(self.list_url_name)),
+            description=self.title,
+            language='ru',
+            feed_url=request.build_absolute_uri(request.path),
+        )
+        for entry in entries:
+            feed.add_item(
+                title=entry['title'],
+                link=request.build_absolute_uri(entry['url']),
+                description=entry['content'],
+                unique_id=request.build_absolute_uri(entry['url']),
+                updateddate=entry['updated'],
+                author_name=entry['author'],
+            )
+        return feed.writeString('utf-8').encode()
+
+    def render_json(self, request, entries):
+        """
+        Формирует ленту в формате JSON Feed 1.1.
+        Возвращает:
+        bytes: JSON ленты.
+        """
+        feed = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': self.title,
+            'home_page_url': request.build_absolute_uri(reverse(self.list_url_name)),
+            'feed_url': request.build_absolute_uri(request.path),
+            'language': 'ru',
+            'items': [
+                {
+                    'id': request.build_absolute_uri(entry['url']),
+                    'url': request.build_absolute_uri(entry['url']),
+                    'title': entry['title'],
+                    'content_text': entry['content'],
+                    'date_modified': entry['updated'],
+                    'authors': [{'name': entry['author']}] if entry['author'] else [],
+                }
+                for entry in entries
+            ],
+        }
+        return json.dumps(feed, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+
+    def build(self, request, feed_format):
+        """
+        Формирует тело ленты и её валидаторы.
+        Возвращает:
+        tuple: Тело, ETag и дата последнего изменения в секундах (или None).
+        """
+        entries = self.get_entries()
+        render = self.render_atom if feed_format == 'atom' else self.render_json
+        body = render(request, entries)
+        updated = [entry['updated'] for entry in entries if entry['updated']]
+        last_modified = int(max(updated).timestamp()) if updated else None
+        return body, compute_etag(body), last_modified
+
+    def get(self, request, feed_format):
+        """
+        Отдает ленту из кэша, формируя её при первом обращении к текущей версии.
+        Возвращает:
+        HttpResponse: Лента или 304 Not Modified.
+        Исключения:
+        Http404: Если формат ленты не поддерживается.
+        """
+        if feed_format not in self.content_types:
+            raise Http404('Неизвестный формат ленты')
+        if settings.CACHE_ENABLED:
+            key = f'feeds:{self.name}:{get_feed_version(self.name)}:{feed_format}:{request.get_host()}'
+            cached = cache.get(key)
+            if cached is None:
+                cached = self.build(request, feed_format)
+                cache.set(key, cached, FEED_CACHE_TIMEOUT)
+        else:
+            cached = self.build(request, feed_format)
+        body, etag, last_modified = cached
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(body, content_type=self.content_types[feed_format])
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=FEED_CLIENT_MAX_AGE)
+        return response
+
+
+def review_entry(row):
+    """
+    Превращает строку запроса отзывов в запись ленты.
+    """
+    return {
+        'title': f'{row["title"]} ({row["dog__name"]})',
+        'url': reverse('reviews:review_detail', args=[row['slug']]),
+        'content': row['content'],
+        'updated': row['updated_at'],
+        'author': row['author__first_name'] or '',
+    }
+
+
+def dog_entry(row):
+    """
+    Превращает строку запроса собак в запись ленты.
+    """
+    return {
+        'title': f'{row["name"]} ({row["breed__name"]})',
+        'url': reverse('dogs:dog_detail', args=[row['pk']]),
+        'content': f'Порода: {row["breed__name"]}. Дата рождения: {row["birth_date"] or "не известна"}.',
+        'updated': row['updated_at'],
+        'author': '',
+    }
+
+
+class ReviewFeedView(FeedView):
+    """
+    Лента последних активных отзывов.
+    """
+    name = 'reviews'
+    title = 'Питомник - новые отзывы'
+    list_url_name = 'reviews:reviews_list'
+    queryset = Review.objects.filter(sign_of_review=True).order_by('-created', '-id').values(
+        'slug', 'title', 'content', 'updated_at', 'dog__name', 'author__first_name',
+    )
+    make_entry = staticmethod(review_entry)
+
+
+class DogFeedView(FeedView):
+    """
+    Лента последних добавленных активных собак.
+    """
+    name = 'dogs'
+    title = 'Питомник - новые собаки'
+    list_url_name = 'dogs:dogs_list'
+    queryset = Dog.objects.filter(is_active=True).order_by('-pk').values(
+        'pk', 'name', 'birth_date', 'updated_at', 'breed__name',
+    )
+    make_entry = staticmethod(dog_entry)
@@ -0,0 +1,136 @@
+from django.db.models import Q
+
+from api.utils import media_url
+from dogs.models import Breed, Dog
+from reviews.models import Review
+from users.capabilities import get_capabilities
+from users.models import User
+
+
+class ModelLoader:
+    """
+    Загрузчик записей модели по ключам в стиле DataLoader.
+    Ключи копятся через load(), повторы отбрасываются, а dispatch()
+    выбирает все накопленные ключи одним запросом IN. Загруженные
+    записи запоминаются на время жизни загрузчика (одного запроса).
+    Атрибуты:
+    queryset (QuerySet): Набор записей, из которого выполняется выборка.
+    fields (tuple): Поля, выбираемые через values().
+    key (str): Поле, по которому ищутся записи.
+    media_fields (tuple): Поля с путями к медиафайлам, преобразуемые в URL.
+    """
+
+    def __init__(self, queryset, fields, key='pk', media_fields=()):
+        self.queryset = queryset
+        self.fields = fields
+        self.key = key
+        self.media_fields = media_fields
+        self._pending = set()
+        self._cache = {}
+
+    def load(self, *keys):
+        """
+        Ставит ключи в очередь на загрузку.
+        Параметры:
+        *keys: Ключи записей (None пропускаются).
+        """
+        for key in keys:
+            if key is not None and key not in self._cache:
+                self._pending.add(key)
+
+    def dispatch(self):
+        """
+        Загружает все ключи из очереди одним запросом.
+        Ключи, для которых запись не найдена, запоминаются со значением None.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, set()
+        extra = () if self.key in self.fields else (self.key,)
+        rows = self.queryset.filter(**{f'{self.key}__in': pending}).values(*extra, *self.fields)
+        for row in rows:
+            for name in self.media_fields:
+                row[name] = media_url(row[name])
+            key = row.pop(self.key) if extra else row[self.key]
+            self._cache[key] = row
+        for key in pending:
+            self._cache.setdefault(key, None)
+
+    def get(self, key):
+        """
+        Возвращает загруженную запись.
+        Параметры:
+        key: Ключ записи.
+        Возвращает:
+        dict | None: Значения полей записи или None, если запись не найдена.
+        """
+        return self._cache.get(key)
+
+    def items(self):
+        """
+        Возвращает все загруженные записи, которые удалось найти.
+        Возвращает:
+        dict: Ключ -> значения полей записи.
+        """
+        return {key: row for key, row in self._cache.items() if row is not None}
+
+
+class BatchLoader:
+    """
+    Набор загрузчиков одного запроса к пакетному API.
+    Связанные записи (собаки отзывов, породы и хозяева собак, авторы отзывов)
+    собираются со всех запрошенных объектов и загружаются вместе с ними,
+    поэтому число запросов к базе данных не зависит от числа ключей.
+    Эл. почта пользователей не отдается: API доступно без входа.
+    """
+
+    def __init__(self, user):
+        self.reviews = ModelLoader(
+            Review.objects.filter(sign_of_review=True),
+            ('slug', 'title', 'content', 'created', 'dog_id', 'author_id'),
+            key='slug',
+        )
+        self.dogs = ModelLoader(
+            self.get_dog_queryset(user),
+            ('id', 'name', 'breed_id', 'owner_id', 'photo', 'birth_date', 'is_active', 'views'),
+            media_fields=('photo',),
+        )
+        self.breeds = ModelLoader(Breed.objects.all(), ('id', 'name', 'description'))
+        self.users = ModelLoader(
+            User.objects.filter(is_active=True),
+            ('id', 'first_name', 'last_name', 'avatar'),
+            media_fields=('avatar',),
+        )
+
+    @staticmethod
+    def get_dog_queryset(user):
+        """
+        Возвращает собак, доступных пользователю.
+        Неактивных собак видят модераторы и администраторы, а пользователи - только своих.
+        Параметры:
+        user: Текущий пользователь.
+        Возвращает:
+        QuerySet: Доступные собаки.
+        """
+        queryset = Dog.objects.all()
+        if not user.is_authenticated:
+            return queryset.filter(is_active=True)
+        if 'dog_view_inactive_all' not in get_capabilities(user):
+            return queryset.filter(Q(is_active=True) | Q(owner=user))
+        return queryset
+
+    def resolve(self):
+        """
+        Загружает запрошенные записи и все связанные с ними записи.
+        Выполняет не больше одного запроса на каждую модель.
+        """
+        self.reviews.dispatch()
+        for review in self.reviews.items().values():
+            self.dogs.load(review['dog_id'])
+            self.users.load(review['author_id'])
+        self.dogs.dispatch()
+        for dog in self.dogs.items().values():
+            self.breeds.load(dog['breed_id'])
+            self.users.load(dog['owner_id'])
+        self.breeds.dispatch()
+        self.users.dispatch()
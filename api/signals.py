@@ -0,0 +1,40 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from api.autocomplete import bump_autocomplete_version
+from api.utils import bump_feed_version
+from dogs.models import Breed, Dog
+from reviews.models import Review
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, raw=False, **kwargs):
+    """
+    Сбрасывает ленту отзывов после сохранения или удаления отзыва.
+    """
+    if not raw:
+        bump_feed_version('reviews')
+
+
+@receiver(post_save, sender=Dog)
+@receiver(post_delete, sender=Dog)
+def dog_changed(sender, raw=False, **kwargs):
+    """
+    Сбрасывает ленты собак и отзывов и подсказки после сохранения или удаления собаки:
+    в ленте отзывов выводится кличка собаки.
+    """
+    if not raw:
+        bump_feed_version('dogs')
+        bump_feed_version('reviews')
+        bump_autocomplete_version()
+
+
+@receiver(post_save, sender=Breed)
+@receiver(post_delete, sender=Breed)
+def breed_changed(sender, raw=False, **kwargs):
+    """
+    Сбрасывает подсказки после сохранения или удаления породы.
+    """
+    if not raw:
+        bump_autocomplete_version()
@@ -0,0 +1,22 @@
+from django.urls import path
+
+from api.apps import ApiConfig
+from api.feeds import ReviewFeedView, DogFeedView
+from api.views import BreedApiListView, DogApiListView, ReviewApiListView, ApiBatchView, \
+    DatabasePoolStatsView, AutocompleteView, BreedLookupView, DogLookupView, UserLookupView
+
+app_name = ApiConfig.name
+
+urlpatterns = [
+    path('breeds/', BreedApiListView.as_view(), name='breeds'),
+    path('dogs/', DogApiListView.as_view(), name='dogs'),
+    path('reviews/', ReviewApiListView.as_view(), name='reviews'),
+    path('batch/', ApiBatchView.as_view(), name='batch'),
+    path('feeds/reviews.<str:feed_format>', ReviewFeedView.as_view(), name='reviews_feed'),
+    path('feeds/dogs.<str:feed_format>', DogFeedView.as_view(), name='dogs_feed'),
+    path('autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
+    path('lookup/breeds/', BreedLookupView.as_view(), name='lookup_breeds'),
+    path('lookup/dogs/', DogLookupView.as_view(), name='lookup_dogs'),
+    path('lookup/users/', UserLookupView.as_view(), name='lookup_users'),
+    path('db-pool/', DatabasePoolStatsView.as_view(), name='db_pool'),
+]
@@ -0,0 +1,87 @@
+import base64
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def encode_cursor(value):
+    """
+    Кодирует значение ключа последней записи страницы в непрозрачный курсор.
+    Параметры:
+    value: Первичный ключ последней записи страницы.
+    Возвращает:
+    str: Курсор, пригодный для передачи в параметре ?cursor=.
+    """
+    return base64.urlsafe_b64encode(str(value).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Декодирует курсор, полученный от клиента.
+    Параметры:
+    cursor (str): Курсор из параметра ?cursor= (может быть пустым).
+    Возвращает:
+    int | None: Первичный ключ, после которого начинается страница.
+    Исключения:
+    ValueError: Если курсор поврежден.
+    """
+    if not cursor:
+        return None
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(cursor + padding).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Некорректный курсор')
+
+
+def compute_etag(content):
+    """
+    Вычисляет ETag по содержимому ответа.
+    Параметры:
+    content (bytes): Тело ответа.
+    Возвращает:
+    str: Значение ETag в кавычках.
+    """
+    return f'"{hashlib.md5(content).hexdigest()}"'
+
+
+def media_url(value):
+    """
+    Возвращает URL медиафайла по пути, сохраненному в базе данных.
+    Параметры:
+    value (str): Путь к файлу относительно MEDIA_ROOT (может быть пустым).
+    Возвращает:
+    str | None: URL файла или None, если файла нет.
+    """
+    if value:
+        return f'{settings.MEDIA_URL}{value}'
+    return None
+
+
+def get_feed_version(name):
+    """
+    Возвращает текущую версию ленты.
+    Версия хранится только в общем кэше (CACHE_ENABLED): без него лента не кэшируется.
+    Параметры:
+    name (str): Имя ленты ('reviews' или 'dogs').
+    Возвращает:
+    int: Версия ленты.
+    """
+    return cache.get(f'feeds:version:{name}', 0)
+
+
+def bump_feed_version(name):
+    """
+    Делает сохраненные версии ленты недействительными.
+    Вызывается при любом изменении отзывов или собак.
+    Параметры:
+    name (str): Имя ленты ('reviews' или 'dogs').
+    """
+    if not settings.CACHE_ENABLED:
+        return
+    key = f'feeds:version:{name}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
@@ -0,0 +1,434 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.views import View
+
+from api.autocomplete import autocomplete, INDEX_BUILDERS, AUTOCOMPLETE_MAX_LIMIT
+from api.loaders import BatchLoader
+from api.utils import encode_cursor, decode_cursor, compute_etag, media_url
+from database.pool import get_pool_stats
+from dogs.models import Breed, Dog
+from reviews.models import Review
+from users.capabilities import CapabilityRequiredMixin
+from users.models import User
+
+
+def json_response_with_etag(request, data):
+    """
+    Сериализует данные в JSON и проставляет ETag.
+    Параметры:
+    request: Запрос от клиента.
+    data (dict): Данные ответа.
+    Возвращает:
+    HttpResponse: JSON-ответ или 304, если у клиента актуальная версия.
+    """
+    content = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+    etag = compute_etag(content)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    return response
+
+
+class ApiListView(View):
+    """
+    Базовое представление JSON API только для чтения.
+    Отдает записи модели с курсорной пагинацией по первичному ключу,
+    выбором полей через ?fields= и проверкой ETag.
+    Атрибуты:
+    model: Модель, записи которой отдаются.
+    fields (dict): Доступные поля: публичное имя -> путь поля ORM.
+    default_fields (tuple): Поля, отдаваемые, если ?fields= не указан.
+    media_fields (tuple): Поля с путями к медиафайлам, преобразуемые в URL.
+    filters (dict): Числовые фильтры: параметр запроса -> поле ORM.
+    page_size (int): Размер страницы по умолчанию.
+    max_page_size (int): Максимальный размер страницы.
+    """
+    model = None
+    fields = {}
+    default_fields = ()
+    media_fields = ()
+    filters = {}
+    page_size = 20
+    max_page_size = 100
+
+    def get_queryset(self):
+        """
+        Возвращает набор записей, отдаваемых представлением, с учетом фильтров.
+        Возвращает:
+        QuerySet: Записи модели.
+        """
+        queryset = self.model._default_manager.all()
+        for param, lookup in self.filters.items():
+            value = self.request.GET.get(param)
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+    def check_filters(self):
+        """
+        Проверяет значения фильтров из параметров запроса.
+        Исключения:
+        ValueError: Если значение фильтра не является числом.
+        """
+        for param in self.filters:
+            value = self.request.GET.get(param)
+            if value and not value.isdigit():
+                raise ValueError(f'Параметр {param} должен быть числом')
+
+    def get_fields(self):
+        """
+        Определяет список запрошенных полей.
+        Возвращает:
+        list: Публичные имена полей.
+        Исключения:
+        ValueError: Если запрошено неизвестное поле.
+        """
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.default_fields)
+        names = list(dict.fromkeys(name.strip() for name in requested.split(',') if name.strip()))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ValueError(f'Неизвестные поля: {", ".join(unknown)}')
+        return names
+
+    def get_limit(self):
+        """
+        Определяет размер страницы из параметра ?limit=.
+        Возвращает:
+        int: Размер страницы.
+        Исключения:
+        ValueError: Если размер страницы некорректен.
+        """
+        limit = self.request.GET.get('limit')
+        if not limit:
+            return self.page_size
+        limit = int(limit)
+        if not 1 <= limit <= self.max_page_size:
+            raise ValueError(f'Параметр limit должен быть от 1 до {self.max_page_size}')
+        return limit
+
+    def get_rows(self, fields, limit, after):
+        """
+        Выбирает из базы данных только запрошенные поля одной страницы.
+        Параметры:
+        fields (list): Публичные имена полей.
+        limit (int): Размер страницы.
+        after (int | None): Первичный ключ, после которого начинается страница.
+        Возвращает:
+        list: Словари со значениями полей (на одну запись больше страницы).
+        """
+        queryset = self.get_queryset().order_by('pk')
+        if after is not None:
+            queryset = queryset.filter(pk__gt=after)
+        plain = [name for name in fields if self.fields[name] == name]
+        expressions = {name: F(self.fields[name]) for name in fields if self.fields[name] != name}
+        return list(queryset.values('pk', *plain, **expressions)[:limit + 1])
+
+    def get(self, request, *args, **kwargs):
+        """
+        Обрабатывает GET-запрос к списку записей.
+        Возвращает:
+        HttpResponse: JSON со страницей записей и курсором следующей страницы,
+        304, если содержимое не изменилось, или 400 при некорректных параметрах.
+        """
+        try:
+            self.check_filters()
+            fields = self.get_fields()
+            limit = self.get_limit()
+            after = decode_cursor(request.GET.get('cursor'))
+        except ValueError as ex:
+            return JsonResponse({'error': str(ex)}, status=400)
+
+        rows = self.get_rows(fields, limit, after)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['pk'])
+
+        results = []
+        for row in rows:
+            item = {name: row[name] for name in fields}
+            for name in self.media_fields:
+                if name in item:
+                    item[name] = media_url(item[name])
+            results.append(item)
+
+        return json_response_with_etag(request, {'results': results, 'next': next_cursor})
+
+
+class BreedApiListView(ApiListView):
+    """
+    JSON API списка пород собак.
+    """
+    model = Breed
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'description': 'description',
+    }
+    default_fields = ('id', 'name')
+
+
+class DogApiListView(ApiListView):
+    """
+    JSON API списка собак.
+    Поддерживает фильтры ?breed=<pk> и ?is_active=0|1. Неактивных собак
+    видят модераторы и администраторы, а пользователи - только своих.
+    """
+    model = Dog
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'breed': 'breed',
+        'breed_name': 'breed__name',
+        'photo': 'photo',
+        'birth_date': 'birth_date',
+        'is_active': 'is_active',
+        'owner': 'owner',
+        'views': 'views',
+    }
+    default_fields = ('id', 'name', 'breed', 'breed_name', 'birth_date')
+    media_fields = ('photo',)
+    filters = {'breed': 'breed_id'}
+
+    def get_queryset(self):
+        """
+        Возвращает собак с учетом фильтров и возможностей пользователя.
+        Возвращает:
+        QuerySet: Собаки, доступные пользователю.
+        """
+        queryset = super().get_queryset()
+        if self.request.GET.get('is_active', '1') != '0':
+            return queryset.filter(is_active=True)
+        user = self.request.user
+        if not user.is_authenticated:
+            return queryset.none()
+        if 'dog_view_inactive_all' not in self.request.capabilities:
+            return queryset.filter(is_active=False, owner=user)
+        return queryset.filter(is_active=False)
+
+
+class ReviewApiListView(ApiListView):
+    """
+    JSON API списка активных отзывов.
+    Поддерживает фильтр ?dog=<pk>.
+    """
+    model = Review
+    fields = {
+        'slug': 'slug',
+        'title': 'title',
+        'content': 'content',
+        'created': 'created',
+        'dog': 'dog',
+        'dog_name': 'dog__name',
+        'author': 'author',
+    }
+    default_fields = ('slug', 'title', 'created', 'dog', 'dog_name')
+    filters = {'dog': 'dog_id'}
+
+    def get_queryset(self):
+        """
+        Возвращает только активные отзывы.
+        Возвращает:
+        QuerySet: Активные отзывы.
+        """
+        return super().get_queryset().filter(sign_of_review=True)
+
+
+class ApiBatchView(View):
+    """
+    Пакетное JSON API: отдает много собак, пользователей и отзывов за один запрос.
+    Ключи передаются списками через запятую: ?dogs=1,2&users=3&reviews=<slug>,<slug>.
+    Связанные породы, хозяева, собаки и авторы отзывов добавляются в ответ,
+    на каждую модель выполняется не больше одного запроса к базе данных.
+    Атрибуты:
+    max_keys (int): Максимальное число ключей каждого вида.
+    """
+    max_keys = 100
+
+    def get_keys(self, param, convert=str):
+        """
+        Разбирает список ключей из параметра запроса.
+        Параметры:
+        param (str): Имя параметра запроса.
+        convert: Функция преобразования ключа.
+        Возвращает:
+        list: Ключи без повторов в порядке запроса.
+        Исключения:
+        ValueError: Если ключ некорректен или ключей слишком много.
+        """
+        raw = self.request.GET.get(param, '')
+        keys = list(dict.fromkeys(convert(key.strip()) for key in raw.split(',') if key.strip()))
+        if len(keys) > self.max_keys:
+            raise ValueError(f'Параметр {param} содержит больше {self.max_keys} ключей')
+        return keys
+
+    def get(self, request, *args, **kwargs):
+        """
+        Обрабатывает GET-запрос к пакетному API.
+        Возвращает:
+        HttpResponse: JSON с найденными записями (ненайденные - null)
+        или 400 при некорректных параметрах.
+        """
+        try:
+            dog_ids = self.get_keys('dogs', int)
+            user_ids = self.get_keys('users', int)
+            review_slugs = self.get_keys('reviews')
+        except ValueError as ex:
+            return JsonResponse({'error': str(ex)}, status=400)
+
+        loader = BatchLoader(request.user)
+        loader.reviews.load(*review_slugs)
+        loader.dogs.load(*dog_ids)
+        loader.users.load(*user_ids)
+        loader.resolve()
+
+        data = {
+            'dogs': loader.dogs.items(),
+            'users': loader.users.items(),
+            'reviews': loader.reviews.items(),
+            'breeds': loader.breeds.items(),
+        }
+        for name, keys, source in (('dogs', dog_ids, loader.dogs),
+                                   ('users', user_ids, loader.users),
+                                   ('reviews', review_slugs, loader.reviews)):
+            for key in keys:
+                data[name].setdefault(key, source.get(key))
+        return json_response_with_etag(request, data)
+
+
+class AutocompleteView(View):
+    """
+    Подсказки для полей поиска: породы и активные собаки, название которых
+    или одно из слов названия начинается с ?q=.
+    Параметры ?type=breed|dog ограничивают тип подсказок, ?limit= - их количество.
+    Ответ строится по индексу в памяти процесса (см. api.autocomplete); при общем кэше (CACHE_ENABLED)
+    без запросов к базе данных.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        Возвращает подсказки.
+        Возвращает:
+        JsonResponse: Тип подсказки -> список {'id', 'name', 'url'}; 400 при неизвестном типе.
+        """
+        kind = request.GET.get('type')
+        if kind and kind not in INDEX_BUILDERS:
+            return JsonResponse({'error': f'Неизвестный тип подсказок: {kind}'}, status=400)
+        try:
+            limit = min(int(request.GET.get('limit', 10)), AUTOCOMPLETE_MAX_LIMIT)
+        except ValueError:
+            return JsonResponse({'error': 'Некорректный limit'}, status=400)
+        kinds = (kind,) if kind else tuple(INDEX_BUILDERS)
+        return JsonResponse(autocomplete(request.GET.get('q', ''), kinds, max(limit, 1)))
+
+
+class LookupView(LoginRequiredMixin, View):
+    """
+    Базовое представление поиска вариантов для RemoteSelect (users.widgets).
+    Ищет записи, поле search_field которых начинается с ?q=, и отдает страницу ?page=
+    в формате {'results': [{'id', 'text'}], 'more': bool}.
+    Атрибуты:
+    model: Модель, записи которой ищутся.
+    search_field (str): Поле поиска и сортировки.
+    related (tuple): Связи, нужные для подписи варианта (select_related).
+    page_size (int): Размер страницы.
+    """
+    model = None
+    search_field = 'name'
+    related = ()
+    page_size = 20
+
+    def get_queryset(self):
+        """
+        Возвращает записи, доступные для выбора.
+        Возвращает:
+        QuerySet: Записи модели.
+        """
+        return self.model._default_manager.all()
+
+    def get_label(self, obj):
+        """
+        Возвращает подпись варианта.
+        """
+        return str(obj)
+
+    def get(self, request, *args, **kwargs):
+        """
+        Возвращает страницу найденных вариантов.
+        Лишняя запись страницы показывает, есть ли следующая, без отдельного COUNT.
+        Возвращает:
+        JsonResponse: Найденные варианты; 400 при некорректном номере страницы.
+        """
+        page = request.GET.get('page', '1')
+        if not page.isdigit() or int(page) < 1:
+            return JsonResponse({'error': 'Параметр page должен быть положительным числом'}, status=400)
+        offset = (int(page) - 1) * self.page_size
+        queryset = self.get_queryset()
+        query = request.GET.get('q', '').strip()
+        if query:
+            queryset = queryset.filter(**{f'{self.search_field}__istartswith': query})
+        if self.related:
+            queryset = queryset.select_related(*self.related)
+        rows = list(queryset.order_by(self.search_field, 'pk')[offset:offset + self.page_size + 1])
+        return JsonResponse({
+            'results': [{'id': obj.pk, 'text': self.get_label(obj)} for obj in rows[:self.page_size]],
+            'more': len(rows) > self.page_size,
+        })
+
+
+class BreedLookupView(LookupView):
+    """
+    Поиск пород по началу названия (поля породы в DogForm и DogParentForm).
+    """
+    model = Breed
+
+
+class DogLookupView(LookupView):
+    """
+    Поиск активных собак по началу клички (поле собаки в ReviewForm).
+    """
+    model = Dog
+    related = ('breed',)
+
+    def get_queryset(self):
+        return Dog.objects.filter(is_active=True)
+
+
+class UserLookupView(CapabilityRequiredMixin, LookupView):
+    """
+    Поиск пользователей по началу адреса эл. почты (поле хозяина в DogAdminForm).
+    Доступно только пользователям с возможностью dog_change_owner.
+    """
+    capability_required = 'dog_change_owner'
+    model = User
+    search_field = 'email'
+
+
+class DatabasePoolStatsView(UserPassesTestMixin, View):
+    """
+    Метрики пулов соединений с базой данных текущего процесса.
+    Доступно только суперпользователям.
+    """
+
+    def test_func(self):
+        """
+        Проверяет, является ли пользователь суперпользователем.
+        """
+        return self.request.user.is_superuser
+
+    def get(self, request, *args, **kwargs):
+        """
+        Возвращает метрики пулов соединений.
+        Возвращает:
+        JsonResponse: Список метрик пулов.
+        """
+        return JsonResponse({'pools': get_pool_stats()})
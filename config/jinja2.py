@@ -0,0 +1,89 @@
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.templatetags.static import static
+from django.urls import get_script_prefix, reverse
+from django.template import defaultfilters
+from django.utils import formats
+from django.utils.text import Truncator
+from django.utils.timezone import template_localtime
+from jinja2 import Environment, FileSystemBytecodeCache
+
+from dogs.templatetags.my_tags import dogs_media, user_media
+
+
+@lru_cache(maxsize=4096)
+def _reverse(viewname, args, kwargs, script_prefix):
+    """
+    Вычисляет URL и запоминает результат.
+    Префикс скрипта входит в ключ, так как reverse() учитывает его в результате.
+    """
+    return reverse(viewname, args=args or None, kwargs=dict(kwargs) or None)
+
+
+def url(viewname, *args, **kwargs):
+    """
+    Возвращает URL по имени маршрута, аналог тега {% url %}.
+    Карточки списков вызывают его несколько раз на каждый объект,
+    поэтому вычисленные URL запоминаются.
+    Параметры:
+    viewname (str): Имя маршрута, например 'dogs:dog_detail'.
+    *args: Позиционные параметры маршрута.
+    **kwargs: Именованные параметры маршрута.
+    Возвращает:
+    str: URL.
+    """
+    return _reverse(viewname, args, tuple(sorted(kwargs.items())), get_script_prefix())
+
+
+def localize(value):
+    """
+    Форматирует дату и число так же, как их выводит шаблон Django
+    (с учетом часового пояса и языка).
+    """
+    return formats.localize(template_localtime(value))
+
+
+def date(value, arg=None):
+    """
+    Форматирует дату, аналог фильтра date. Как и шаблон Django, переводит дату
+    из UTC в текущий часовой пояс до форматирования.
+    """
+    return defaultfilters.date(template_localtime(value), arg)
+
+
+def truncatechars(value, length):
+    """
+    Обрезает строку до length символов, аналог фильтра truncatechars.
+    """
+    return Truncator(value).chars(length)
+
+
+def environment(**options):
+    """
+    Создает окружение Jinja2 для шаблонов списков.
+    Байт-код скомпилированных шаблонов хранится в каталоге JINJA2_BYTECODE_CACHE_DIR
+    и используется всеми рабочими процессами сервера.
+    Параметры:
+    **options: Настройки окружения из OPTIONS движка шаблонов.
+    Возвращает:
+    Environment: Окружение Jinja2.
+    """
+    cache_dir = settings.JINJA2_BYTECODE_CACHE_DIR
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        options.setdefault('bytecode_cache', FileSystemBytecodeCache(str(cache_dir)))
+    env = Environment(**options)
+    env.globals.update({
+        'static': static,
+        'url': url,
+    })
+    env.filters.update({
+        'dogs_media': dogs_media,
+        'user_media': user_media,
+        'localize': localize,
+        'date': date,
+        'truncatechars': truncatechars,
+    })
+    return env
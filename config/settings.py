@@ -44,37 +44,60 @@ INSTALLED_APPS = [
     'users',
     'dogs',
     'reviews',
+    'api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'database.middleware.ReadConsistencyMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.CapabilitiesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
+DJANGO_TEMPLATES = {
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': [],
+    'APP_DIRS': True,
+    'OPTIONS': {
+        'context_processors': [
+            'django.template.context_processors.debug',
+            'django.template.context_processors.request',
+            'django.contrib.auth.context_processors.auth',
+            'django.contrib.messages.context_processors.messages',
+        ],
     },
-]
+}
+
+# Шаблоны списков и карточек на Jinja2 (dogs/jinja2/, reviews/jinja2/).
+# При JINJA2_ENABLED=True движок Jinja2 стоит первым и перехватывает эти шаблоны,
+# иначе используются шаблоны Django, а Jinja2 доступен только для команды bench_templates.
+JINJA2_ENABLED = os.getenv('JINJA2_ENABLED') == 'True'
+JINJA2_BYTECODE_CACHE_DIR = os.getenv('JINJA2_BYTECODE_CACHE_DIR') or BASE_DIR / '.jinja2_cache'
+JINJA2_TEMPLATES = {
+    'BACKEND': 'django.template.backends.jinja2.Jinja2',
+    'DIRS': [],
+    'APP_DIRS': True,
+    'OPTIONS': {
+        'environment': 'config.jinja2.environment',
+        'context_processors': [
+            'django.contrib.auth.context_processors.auth',
+        ],
+    },
+}
+TEMPLATES = [JINJA2_TEMPLATES, DJANGO_TEMPLATES] if JINJA2_ENABLED else [DJANGO_TEMPLATES, JINJA2_TEMPLATES]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Асинхронные версии списков и страницы собаки (для запуска под ASGI).
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS') == 'True'
 
 
 # Database
@@ -90,18 +113,60 @@ PAD_DATABASE = os.getenv('MS_PAD_DATABASE')
 DRIVER = os.getenv('MS_SQL_DRIVER')
 
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'mssql',
-        'NAME': DATABASE,
-        'PASSWORD': PASSWORD,
-        'HOST': HOST,
-        'PORT': '',
-        'OPTIONS': {
-            'driver': DRIVER
+DATABASE_POOL = {
+    'MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE') or 1),
+    'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE') or 10),
+    'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT') or 10),
+    'MAX_IDLE': float(os.getenv('DB_POOL_MAX_IDLE') or 300),
+    'MAX_LIFETIME': float(os.getenv('DB_POOL_MAX_LIFETIME') or 3600),
+    # Пустое значение в .env означает значение по умолчанию (проверка включена).
+    'PING': (os.getenv('DB_POOL_PING') or 'True') == 'True',
+}
+
+# Локальный режим (разработка и тесты) на SQLite вместо SQL Server.
+DATABASE_SQLITE = os.getenv('DATABASE_SQLITE') == 'True'
+
+if DATABASE_SQLITE:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'database.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'POOL': DATABASE_POOL,
         }
     }
-}
+    # Реплики - файлы SQLite через запятую (копии db.sqlite3).
+    REPLICA_SOURCES = [{'NAME': BASE_DIR / name.strip()}
+                       for name in os.getenv('DATABASE_SQLITE_REPLICAS', '').split(',') if name.strip()]
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'database.backends.mssql',
+            'NAME': DATABASE,
+            'PASSWORD': PASSWORD,
+            'HOST': HOST,
+            'PORT': '',
+            'OPTIONS': {
+                'driver': DRIVER
+            },
+            'POOL': DATABASE_POOL,
+        }
+    }
+    # Реплики - серверы SQL Server через запятую.
+    REPLICA_SOURCES = [{'HOST': host.strip()}
+                       for host in os.getenv('MS_SQL_REPLICA_SERVERS', '').split(',') if host.strip()]
+
+# Реплики только для чтения (см. database.routers.ReadReplicaRouter).
+DATABASE_REPLICAS = []
+for number, replica in enumerate(REPLICA_SOURCES, start=1):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {**DATABASES['default'], **replica, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['database.routers.ReadReplicaRouter']
+# Сколько секунд после записи чтение пользователя идет в основную базу.
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv('DATABASE_REPLICA_PIN_SECONDS') or 10)
+# Сколько секунд не использовать недоступную реплику.
+DATABASE_REPLICA_RETRY_SECONDS = int(os.getenv('DATABASE_REPLICA_RETRY_SECONDS') or 30)
 
 
 # Password validation
@@ -149,6 +214,26 @@ MEDIA_ROOT = (
         BASE_DIR / 'media'
 )
 
+# Загруженные файлы хранятся под хэшем содержимого (см. config.storage).
+# Файлы без ссылок, измененные позже MEDIA_GC_GRACE_SECONDS секунд назад, не удаляются сразу,
+# их удаляет команда gc_media.
+STORAGES = {
+    'default': {'BACKEND': 'config.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+MEDIA_GC_GRACE_SECONDS = int(os.getenv('MEDIA_GC_GRACE_SECONDS') or 3600)
+
+# Загрузка фото и аватаров (см. config.uploads): файл пишется во временный файл частями
+# и отбрасывается после UPLOAD_MAX_FILE_SIZE байт, размеры изображения проверяются по заголовку,
+# нормализация (поворот по EXIF, уменьшение, перекодирование) выполняется в UPLOAD_NORMALIZE_WORKERS
+# фоновых потоках (0 - сразу при сохранении).
+FILE_UPLOAD_HANDLERS = ['config.uploads.BoundedTemporaryFileUploadHandler']
+UPLOAD_MAX_FILE_SIZE = int(os.getenv('UPLOAD_MAX_FILE_SIZE') or 10 * 1024 * 1024)
+UPLOAD_MAX_IMAGE_SIDE = int(os.getenv('UPLOAD_MAX_IMAGE_SIDE') or 8000)
+UPLOAD_MAX_IMAGE_PIXELS = int(os.getenv('UPLOAD_MAX_IMAGE_PIXELS') or 40_000_000)
+UPLOAD_NORMALIZED_MAX_SIDE = int(os.getenv('UPLOAD_NORMALIZED_MAX_SIDE') or 2048)
+UPLOAD_NORMALIZE_WORKERS = int(os.getenv('UPLOAD_NORMALIZE_WORKERS') or 1)
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
@@ -159,6 +244,17 @@ LOGIN_REDIRECT_URL = 'dogs:index'
 # LOGOUT_REDIRECT_URL = 'dogs:index'
 LOGIN_URL = '/users/'
 
+# Просмотры собак копятся в памяти процесса и записываются в DogViewStat пачками
+# (см. dogs.view_stats); дневные записи старше VIEW_STATS_RETENTION_DAYS сворачиваются в месячные.
+VIEW_STATS_FLUSH_SIZE = int(os.getenv('VIEW_STATS_FLUSH_SIZE') or 100)
+VIEW_STATS_FLUSH_SECONDS = int(os.getenv('VIEW_STATS_FLUSH_SECONDS') or 60)
+VIEW_STATS_RETENTION_DAYS = int(os.getenv('VIEW_STATS_RETENTION_DAYS') or 90)
+
+# Рейтинг популярных собак (см. dogs.trending): вес просмотров и отзывов уменьшается вдвое
+# каждые TRENDING_HALF_LIFE_HOURS часов, перестройка учитывает последние TRENDING_WINDOW_DAYS дней.
+TRENDING_HALF_LIFE_HOURS = int(os.getenv('TRENDING_HALF_LIFE_HOURS') or 24)
+TRENDING_WINDOW_DAYS = int(os.getenv('TRENDING_WINDOW_DAYS') or 14)
+
 CACHE_ENABLED = os.getenv('CACHE_ENABLED') == 'True'
 if CACHE_ENABLED:
     CACHES = {
@@ -167,6 +263,16 @@ if CACHE_ENABLED:
             "LOCATION": os.getenv('CACHE_LOCATION')
         }
     }
+    # Сессии читаются из кэша, запись идет и в кэш, и в базу данных.
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Пользователь запроса берется из кэша (см. users.backends.CachedModelBackend).
+# ModelBackend оставлен для сессий, созданных до подключения кэша.
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_TIMEOUT = 60 * 60
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.yandex.com'
@@ -0,0 +1,214 @@
+import hashlib
+import os
+import posixpath
+import secrets
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.utils.deconstruct import deconstructible
+
+# Поля моделей, которые ссылаются на файлы хранилища (app_label.Model, поле).
+MEDIA_FIELDS = (
+    ('dogs.Dog', 'photo'),
+    ('users.User', 'avatar'),
+)
+HASH_CHUNK_SIZE = 64 * 1024
+MAX_EXTENSION_LENGTH = 10
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, в котором имя файла - SHA-256 его содержимого:
+    <каталог upload_to>/<2 символа хэша>/<следующие 2 символа>/<хэш>.<расширение>.
+    Одинаковые файлы хранятся один раз, а содержимое файла по имени никогда не меняется,
+    поэтому URL можно кэшировать без ограничения срока.
+    Файл сначала пишется во временный файл того же каталога с подсчетом хэша,
+    затем переименовывается (или удаляется, если такой файл уже есть).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Итоговое имя определяется содержимым в _save(), подбирать свободное имя не нужно.
+        return name
+
+    def _save(self, name, content):
+        directory, filename = posixpath.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        if len(extension) > MAX_EXTENSION_LENGTH or not extension[1:].isalnum():
+            extension = ''
+        upload_directory = self.path(directory)
+        os.makedirs(upload_directory, exist_ok=True)
+        temporary_path = os.path.join(upload_directory, f'.upload-{secrets.token_hex(8)}')
+        digest = hashlib.sha256()
+        try:
+            fd = os.open(temporary_path, self.OS_OPEN_FLAGS, 0o666)
+            with os.fdopen(fd, 'wb') as temporary_file:
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    temporary_file.write(chunk)
+            content_hash = digest.hexdigest()
+            name = posixpath.join(directory, content_hash[:2], content_hash[2:4], content_hash + extension)
+            full_path = self.path(name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            if os.path.exists(full_path):
+                # Повторная загрузка: файл уже есть, обновляется только время изменения,
+                # чтобы сборщик мусора не удалил его до сохранения ссылки на него.
+                os.utime(full_path)
+            else:
+                if self.file_permissions_mode is not None:
+                    os.chmod(temporary_path, self.file_permissions_mode)
+                os.replace(temporary_path, full_path)
+                self._ensure_location_group_id(full_path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        return name
+
+
+def get_media_fields():
+    """
+    Возвращает поля моделей, ссылающиеся на файлы хранилища.
+    Возвращает:
+    list: Пары (модель, имя поля).
+    """
+    return [(apps.get_model(model), field_name) for model, field_name in MEDIA_FIELDS]
+
+
+def get_referenced_names(names):
+    """
+    Возвращает имена из names, на которые ссылается хотя бы одна запись (запросы по индексам полей).
+    Параметры:
+    names (list): Имена файлов.
+    Возвращает:
+    set: Имена файлов, которые используются.
+    """
+    referenced = set()
+    for model, field_name in get_media_fields():
+        lookup = {f'{field_name}__in': names}
+        referenced.update(model._default_manager.filter(**lookup).values_list(field_name, flat=True))
+    return referenced
+
+
+def count_references(name):
+    """
+    Считает записи, ссылающиеся на файл: собаки с этим фото и пользователи с этим аватаром.
+    Параметры:
+    name (str): Имя файла в хранилище.
+    Возвращает:
+    int: Количество ссылок.
+    """
+    return sum(
+        model._default_manager.filter(**{field_name: name}).count()
+        for model, field_name in get_media_fields()
+    )
+
+
+def is_recent(name, storage=default_storage):
+    """
+    Проверяет, изменялся ли файл за последние MEDIA_GC_GRACE_SECONDS секунд
+    (только что загружен или загружен повторно и, возможно, еще не сохранен в записи).
+    """
+    return time.time() - storage.get_modified_time(name).timestamp() < settings.MEDIA_GC_GRACE_SECONDS
+
+
+def release_file(name, storage=default_storage):
+    """
+    Удаляет файл, если на него больше не ссылается ни одна запись.
+    Недавно измененные файлы остаются: их удалит команда gc_media.
+    Параметры:
+    name (str): Имя файла в хранилище.
+    Возвращает:
+    bool: True, если файл удален.
+    """
+    if not name or count_references(name) or not storage.exists(name) or is_recent(name, storage):
+        return False
+    storage.delete(name)
+    return True
+
+
+def iter_stored_files(directory, storage=default_storage):
+    """
+    Перебирает файлы каталога хранилища и его подкаталогов.
+    Параметры:
+    directory (str): Каталог относительно корня хранилища.
+    Возвращает:
+    Генератор имен файлов.
+    """
+    if not storage.exists(directory):
+        return
+    directories, files = storage.listdir(directory)
+    for filename in files:
+        yield posixpath.join(directory, filename)
+    for subdirectory in directories:
+        yield from iter_stored_files(posixpath.join(directory, subdirectory), storage)
+
+
+def collect_garbage(dry_run=False, batch_size=500, storage=default_storage):
+    """
+    Удаляет файлы каталогов upload_to полей MEDIA_FIELDS, на которые не ссылается ни одна запись
+    и которые не изменялись последние MEDIA_GC_GRACE_SECONDS секунд (в том числе брошенные
+    временные файлы загрузок). Ссылки проверяются пачками по batch_size имен.
+    Параметры:
+    dry_run (bool): Только посчитать файлы без ссылок.
+    batch_size (int): Размер пачки имен для проверки ссылок.
+    Возвращает:
+    tuple: Количество проверенных и удаленных (при dry_run - найденных) файлов.
+    """
+    directories = sorted({
+        model._meta.get_field(field_name).upload_to.rstrip('/') for model, field_name in get_media_fields()
+    })
+    checked = deleted = 0
+    for directory in directories:
+        batch = []
+        for name in iter_stored_files(directory, storage):
+            batch.append(name)
+            if len(batch) >= batch_size:
+                deleted += _collect_batch(batch, dry_run, storage)
+                checked += len(batch)
+                batch = []
+        if batch:
+            deleted += _collect_batch(batch, dry_run, storage)
+            checked += len(batch)
+    return checked, deleted
+
+
+def _collect_batch(names, dry_run, storage):
+    referenced = get_referenced_names(names)
+    orphans = [name for name in names if name not in referenced and not is_recent(name, storage)]
+    if not dry_run:
+        for name in orphans:
+            storage.delete(name)
+    return len(orphans)
+
+
+def remember_replaced_file(sender, instance, field_name, update_fields=None):
+    """
+    Запоминает в instance прежний файл поля перед сохранением записи, если файл заменяется или очищается.
+    Вызывается из обработчиков pre_save; запрос выполняется только при новой загрузке или очистке поля.
+    Параметры:
+    sender: Модель.
+    instance: Сохраняемая запись.
+    field_name (str): Имя файлового поля.
+    update_fields (frozenset): Сохраняемые поля.
+    """
+    if instance.pk is None or (update_fields is not None and field_name not in update_fields):
+        return
+    field_file = getattr(instance, field_name)
+    if field_file and field_file._committed:
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).values_list(field_name, flat=True).first()
+    if previous and previous != field_file.name:
+        instance._replaced_files = getattr(instance, '_replaced_files', []) + [previous]
+
+
+def pop_replaced_files(instance):
+    """
+    Возвращает и забывает файлы, запомненные remember_replaced_file().
+    Возвращает:
+    list: Имена файлов.
+    """
+    return instance.__dict__.pop('_replaced_files', [])
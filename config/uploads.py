@@ -0,0 +1,228 @@
+import io
+import logging
+import posixpath
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from django import forms
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import connections
+from django.template.defaultfilters import filesizeformat
+
+from config.storage import get_media_fields, release_file
+
+logger = logging.getLogger(__name__)
+
+# Форматы изображений, которые принимают формы, и их MIME-типы для атрибута accept.
+IMAGE_FORMATS = {
+    'JPEG': 'image/jpeg',
+    'PNG': 'image/png',
+    'GIF': 'image/gif',
+    'WEBP': 'image/webp',
+}
+# Метка в комментарии файла, по которой нормализованное изображение не обрабатывается повторно.
+NORMALIZED_MARK = 'normalized'
+JPEG_QUALITY = 85
+
+
+class RejectedUpload(UploadedFile):
+    """
+    Файл, загрузка которого прервана из-за превышения UPLOAD_MAX_FILE_SIZE.
+    Содержимое не сохраняется, остается только имя и размер для сообщения об ошибке.
+    """
+
+    def __init__(self, name, content_type, size, charset, content_type_extra=None):
+        super().__init__(io.BytesIO(), name, content_type, size, charset, content_type_extra)
+
+
+class BoundedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Обработчик загрузки, который всегда пишет файл во временный файл частями (память процесса
+    не зависит от размера файла) и перестает сохранять файл, как только он превысил
+    UPLOAD_MAX_FILE_SIZE байт: временный файл удаляется, остаток данных отбрасывается,
+    а в request.FILES попадает RejectedUpload.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.rejected = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.rejected:
+            return None
+        if start + len(raw_data) > settings.UPLOAD_MAX_FILE_SIZE:
+            self.rejected = True
+            self.file.close()
+            return None
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.rejected:
+            return RejectedUpload(self.file_name, self.content_type, file_size, self.charset,
+                                  self.content_type_extra)
+        return super().file_complete(file_size)
+
+
+def read_image_header(data):
+    """
+    Читает формат и размеры изображения из заголовка файла без декодирования пикселей.
+    Параметры:
+    data (UploadedFile): Загруженный файл.
+    Возвращает:
+    tuple: Формат Pillow и размеры (ширина, высота) или (None, None), если это не изображение.
+    Исключения:
+    ValidationError: Если размеры изображения превышают встроенный предел Pillow.
+    """
+    from PIL import Image
+
+    source = data.temporary_file_path() if hasattr(data, 'temporary_file_path') else data
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+            with Image.open(source) as image:
+                return image.format, image.size
+    except Image.DecompressionBombError:
+        raise forms.ValidationError('Изображение слишком большое', code='image_too_large')
+    except Exception:
+        return None, None
+    finally:
+        if hasattr(data, 'seek'):
+            data.seek(0)
+
+
+class BoundedImageField(forms.ImageField):
+    """
+    Поле изображения с ограничениями загрузки:
+    размер файла (UPLOAD_MAX_FILE_SIZE, проверяется обработчиком загрузки),
+    формат (IMAGE_FORMATS) и размеры в пикселях (UPLOAD_MAX_IMAGE_SIDE, UPLOAD_MAX_IMAGE_PIXELS),
+    которые читаются из заголовка до проверки Django и без декодирования изображения.
+    """
+
+    def to_python(self, data):
+        if isinstance(data, RejectedUpload):
+            raise forms.ValidationError(
+                f'Файл больше {filesizeformat(settings.UPLOAD_MAX_FILE_SIZE)}', code='file_too_large',
+            )
+        if data and hasattr(data, 'read'):
+            image_format, size = read_image_header(data)
+            if image_format is not None:
+                if image_format not in IMAGE_FORMATS:
+                    raise forms.ValidationError('Допустимые форматы: JPEG, PNG, GIF, WebP', code='image_format')
+                width, height = size
+                max_side = settings.UPLOAD_MAX_IMAGE_SIDE
+                if width > max_side or height > max_side or width * height > settings.UPLOAD_MAX_IMAGE_PIXELS:
+                    raise forms.ValidationError(
+                        f'Изображение {width}x{height} слишком большое: не больше {max_side} точек по стороне',
+                        code='image_too_large',
+                    )
+        return super().to_python(data)
+
+    def widget_attrs(self, widget):
+        attrs = super().widget_attrs(widget)
+        if 'accept' in attrs:
+            attrs['accept'] = ','.join(IMAGE_FORMATS.values())
+        return attrs
+
+
+def normalize_stored_image(name, storage=default_storage):
+    """
+    Нормализует загруженное изображение: поворачивает по EXIF, уменьшает до UPLOAD_NORMALIZED_MAX_SIDE,
+    удаляет метаданные и перекодирует в JPEG (или PNG при прозрачности).
+    JPEG декодируется сразу в уменьшенном масштабе (draft), чтобы не держать в памяти исходный размер.
+    Записи, ссылающиеся на исходный файл, переводятся на новый файл, исходный файл освобождается.
+    Параметры:
+    name (str): Имя файла в хранилище.
+    Возвращает:
+    str: Имя нормализованного файла (name, если изображение уже нормализовано или анимировано).
+    """
+    from PIL import Image, ImageOps, PngImagePlugin
+
+    max_side = settings.UPLOAD_NORMALIZED_MAX_SIDE
+    with storage.open(name) as source, Image.open(source) as image:
+        comment = image.info.get('comment', image.info.get('Comment', b''))
+        if isinstance(comment, bytes):
+            comment = comment.decode(errors='ignore')
+        if comment == NORMALIZED_MARK or getattr(image, 'is_animated', False):
+            return name
+        if image.format == 'JPEG':
+            image.draft('RGB', (max_side, max_side))
+        normalized = ImageOps.exif_transpose(image)
+        normalized.thumbnail((max_side, max_side))
+        buffer = io.BytesIO()
+        if normalized.mode in ('RGBA', 'LA') or (normalized.mode == 'P' and 'transparency' in normalized.info):
+            info = PngImagePlugin.PngInfo()
+            info.add_text('Comment', NORMALIZED_MARK)
+            normalized.save(buffer, 'PNG', optimize=True, pnginfo=info)
+            extension = '.png'
+        else:
+            normalized.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True,
+                                           comment=NORMALIZED_MARK)
+            extension = '.jpg'
+    directory = name.split('/', 1)[0]
+    new_name = storage.save(posixpath.join(directory, 'image' + extension), ContentFile(buffer.getvalue()))
+    if new_name == name:
+        return name
+    for model, field_name in get_media_fields():
+        # Запись обновляется, только если файл не заменили, пока шла нормализация.
+        # Дата изменения сохраняется вместе с файлом, чтобы сменились ETag и Last-Modified страниц.
+        for obj in model._default_manager.filter(**{field_name: name}).only('pk', field_name):
+            setattr(obj, field_name, new_name)
+            obj.save(update_fields=[field_name, 'updated_at'])
+    release_file(name, storage)
+    return new_name
+
+
+_executor = None
+
+
+def _normalize_task(name):
+    try:
+        normalize_stored_image(name)
+    except Exception:
+        logger.exception('Ошибка нормализации изображения %s', name)
+    finally:
+        # Соединения с базой данных принадлежат потоку обработчика и закрываются после задачи.
+        connections.close_all()
+
+
+def schedule_normalization(name):
+    """
+    Ставит нормализацию изображения в очередь фонового потока, не задерживая ответ.
+    При UPLOAD_NORMALIZE_WORKERS = 0 нормализация выполняется сразу.
+    Параметры:
+    name (str): Имя файла в хранилище.
+    """
+    global _executor
+    if not settings.UPLOAD_NORMALIZE_WORKERS:
+        try:
+            normalize_stored_image(name)
+        except Exception:
+            logger.exception('Ошибка нормализации изображения %s', name)
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.UPLOAD_NORMALIZE_WORKERS,
+                                       thread_name_prefix='normalize-image')
+    _executor.submit(_normalize_task, name)
+
+
+def remember_new_upload(instance, field_name):
+    """
+    Запоминает в instance файловое поле, в которое перед сохранением загружен новый файл.
+    Вызывается из обработчиков pre_save.
+    """
+    field_file = getattr(instance, field_name)
+    if field_file and not field_file._committed:
+        instance._new_uploads = getattr(instance, '_new_uploads', []) + [field_name]
+
+
+def pop_new_uploads(instance):
+    """
+    Возвращает и забывает поля, запомненные remember_new_upload().
+    Возвращает:
+    list: Имена полей.
+    """
+    return instance.__dict__.pop('_new_uploads', [])
@@ -24,5 +24,6 @@ urlpatterns = [
         path('admin/', admin.site.urls),
         path('', include('dogs.urls', namespace='dogs')),
         path('users/', include('users.urls', namespace='users')),
-        path('reviews/', include('reviews.urls', namespace='reviews'))
+        path('reviews/', include('reviews.urls', namespace='reviews')),
+        path('api/', include('api.urls', namespace='api')),
     ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
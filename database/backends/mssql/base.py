@@ -0,0 +1,11 @@
+from mssql.base import DatabaseWrapper as MssqlDatabaseWrapper
+
+from database.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, MssqlDatabaseWrapper):
+    """
+    Бэкенд mssql-django с пулом соединений.
+    Избавляет каждый запрос от ODBC-подключения и входа на SQL Server.
+    """
+    pass
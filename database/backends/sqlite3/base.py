@@ -0,0 +1,17 @@
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from database.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, SQLiteDatabaseWrapper):
+    """
+    Бэкенд SQLite с пулом соединений.
+    Используется для локальной разработки и тестов вместо SQL Server.
+    База в памяти работает без пула.
+    """
+
+    def is_pool_disabled(self):
+        """
+        Отключает пул для базы в памяти (её соединения нельзя передавать между запросами).
+        """
+        return self.is_in_memory_db()
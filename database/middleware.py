@@ -0,0 +1,75 @@
+import time
+
+from django.conf import settings
+
+from database.routers import start_request, finish_request, read_from_primary
+
+PIN_COOKIE_NAME = 'db_primary_until'
+
+
+class ReadConsistencyMiddleware:
+    """
+    Middleware политики согласованности чтения.
+    Безопасные запросы (GET, HEAD, OPTIONS) читают из реплик. После записи пользователя -
+    в небезопасном запросе (POST и т.д.) или в безопасном, отмеченном mark_user_write() -
+    он получает cookie, и его чтение еще DATABASE_REPLICA_PIN_SECONDS секунд идет
+    в основную базу, чтобы он сразу видел свои изменения. Служебные записи
+    (счетчик просмотров, статистика, сессии) чтение не переключают.
+    Представления с атрибутом read_from_primary = True (см. use_primary_db)
+    всегда читают из основной базы.
+    """
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Обрабатывает запрос с учетом политики согласованности чтения.
+        """
+        token = start_request(self.is_pinned(request), request.method not in self.safe_methods)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = finish_request(token)
+        if wrote:
+            pin_seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+            response.set_cookie(PIN_COOKIE_NAME, str(int(time.time()) + pin_seconds),
+                                max_age=pin_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def is_pinned(self, request):
+        """
+        Проверяет, должно ли чтение запроса идти в основную базу.
+        Параметры:
+        request: Запрос от клиента.
+        Возвращает:
+        bool: True для небезопасных запросов и в течение короткого времени после записи.
+        """
+        if request.method not in self.safe_methods:
+            return True
+        try:
+            return int(request.COOKIES.get(PIN_COOKIE_NAME, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Переключает чтение на основную базу для представлений с read_from_primary = True.
+        """
+        view_class = getattr(view_func, 'view_class', None)
+        if getattr(view_func, 'read_from_primary', False) or getattr(view_class, 'read_from_primary', False):
+            read_from_primary()
+        return None
+
+
+def use_primary_db(view_func):
+    """
+    Декоратор функции-представления, читающего данные только из основной базы.
+    Параметры:
+    view_func: Функция-представление.
+    Возвращает:
+    Та же функция с атрибутом read_from_primary = True.
+    """
+    view_func.read_from_primary = True
+    return view_func
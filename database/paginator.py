@@ -0,0 +1,58 @@
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+# Запросы оценки количества строк таблицы по статистике СУБД (connection.vendor -> SQL).
+ESTIMATE_QUERIES = {
+    'microsoft': 'SELECT SUM(p.rows) FROM sys.partitions p WHERE p.object_id = OBJECT_ID(%s) AND p.index_id IN (0, 1)',
+    'postgresql': 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+    'sqlite': 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+}
+
+
+def estimate_row_count(model, using):
+    """
+    Оценивает количество строк таблицы модели по статистике СУБД без COUNT(*).
+    Параметры:
+    model: Модель.
+    using (str): Псевдоним базы данных.
+    Возвращает:
+    int | None: Оценка или None, если статистики нет.
+    """
+    connection = connections[using]
+    sql = ESTIMATE_QUERIES.get(connection.vendor)
+    if sql is None:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [model._meta.db_table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        # Например, в SQLite таблица sqlite_stat1 появляется только после ANALYZE.
+        return None
+    if not row or row[0] is None:
+        return None
+    # В sqlite_stat1 первое число строки статистики - количество строк таблицы.
+    value = int(str(row[0]).split()[0])
+    return value if value >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор для больших таблиц.
+    Количество записей считается точно, но не больше exact_count_limit. Если без фильтров
+    в таблице по статистике СУБД (estimate_row_count) больше записей, берется оценка;
+    в отфильтрованной большой выборке дальние страницы недоступны, их заменяет уточнение фильтра или поиска.
+    Атрибуты:
+    exact_count_limit (int): Максимальное количество записей, считаемое точно.
+    """
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+        return queryset.order_by()[:self.exact_count_limit].count()
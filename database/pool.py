@@ -0,0 +1,343 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_OPTIONS = {
+    'MIN_SIZE': 1,
+    'MAX_SIZE': 10,
+    'TIMEOUT': 10,
+    'MAX_IDLE': 300,
+    'MAX_LIFETIME': 3600,
+    'PING': True,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    """
+    Исключение: за отведенное время в пуле не освободилось ни одного соединения.
+    """
+    pass
+
+
+class PooledConnection:
+    """
+    Соединение с базой данных, хранящееся в пуле.
+    Атрибуты:
+    raw: Соединение драйвера базы данных (pyodbc, sqlite3).
+    created_at (float): Время открытия соединения (time.monotonic()).
+    last_used_at (float): Время возврата соединения в пул.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул соединений с базой данных одного псевдонима (alias).
+    При выдаче соединения проверяет его запросом SELECT 1, закрывает соединения,
+    простаивающие дольше MAX_IDLE (оставляя не меньше MIN_SIZE) или живущие
+    дольше MAX_LIFETIME, и ждет освобождения соединения не дольше TIMEOUT секунд,
+    если открыто MAX_SIZE соединений.
+    Атрибуты:
+    alias (str): Псевдоним базы данных.
+    min_size (int): Минимальное число соединений, не закрываемых по простою.
+    max_size (int): Максимальное число открытых соединений.
+    timeout (float): Время ожидания свободного соединения, секунд.
+    max_idle (float): Максимальное время простоя соединения, секунд.
+    max_lifetime (float): Максимальное время жизни соединения, секунд.
+    ping (bool): Проверять ли соединение при каждой выдаче.
+    """
+
+    def __init__(self, alias, options=None):
+        options = {**DEFAULT_POOL_OPTIONS, **(options or {})}
+        self.alias = alias
+        self.min_size = options['MIN_SIZE']
+        self.max_size = options['MAX_SIZE']
+        self.timeout = options['TIMEOUT']
+        self.max_idle = options['MAX_IDLE']
+        self.max_lifetime = options['MAX_LIFETIME']
+        self.ping = options['PING']
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'ping_failures': 0,
+        }
+
+    def checkout(self, factory):
+        """
+        Выдает соединение из пула или открывает новое.
+        Параметры:
+        factory: Функция без аргументов, открывающая новое соединение драйвера.
+        Возвращает:
+        Соединение драйвера базы данных.
+        Исключения:
+        PoolTimeout: Если свободное соединение не появилось за timeout секунд.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            record = self._acquire(deadline)
+            if record is None:
+                try:
+                    record = PooledConnection(factory())
+                except Exception:
+                    self._release_slot()
+                    raise
+                with self._condition:
+                    self._stats['created'] += 1
+            elif self.ping and not self._is_alive(record.raw):
+                with self._condition:
+                    self._stats['ping_failures'] += 1
+                self._discard(record)
+                continue
+            with self._condition:
+                self._in_use[id(record.raw)] = record
+                self._stats['checkouts'] += 1
+            return record.raw
+
+    def checkin(self, raw):
+        """
+        Возвращает соединение в пул.
+        Незавершенная транзакция откатывается, устаревшее или сломанное соединение закрывается.
+        Параметры:
+        raw: Соединение драйвера, ранее выданное checkout().
+        """
+        with self._condition:
+            record = self._in_use.pop(id(raw), None)
+        if record is None:
+            self._close_raw(raw)
+            return
+        try:
+            raw.rollback()
+        except Exception:
+            self._discard(record)
+            return
+        if self._is_expired(record, time.monotonic()):
+            self._discard(record)
+            return
+        with self._condition:
+            record.last_used_at = time.monotonic()
+            self._idle.append(record)
+            self._condition.notify()
+
+    def close_all(self):
+        """
+        Закрывает все простаивающие соединения пула.
+        """
+        with self._condition:
+            records, self._idle = list(self._idle), deque()
+        for record in records:
+            self._discard(record)
+
+    def get_stats(self):
+        """
+        Возвращает метрики пула.
+        Возвращает:
+        dict: Размер пула, число свободных и занятых соединений и счетчики
+        выдач, ожиданий, таймаутов, открытых и закрытых соединений и неудачных проверок.
+        """
+        with self._condition:
+            return {
+                'alias': self.alias,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                **self._stats,
+            }
+
+    def _acquire(self, deadline):
+        """
+        Берет свободное соединение или резервирует место под новое.
+        Параметры:
+        deadline (float): Момент (time.monotonic()), после которого ожидание прекращается.
+        Возвращает:
+        PooledConnection | None: Свободное соединение или None, если нужно открыть новое.
+        """
+        waited = False
+        with self._condition:
+            while True:
+                expired = self._pop_expired_locked()
+                if expired:
+                    self._condition.release()
+                    try:
+                        for record in expired:
+                            self._discard(record)
+                    finally:
+                        self._condition.acquire()
+                    continue
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'Нет свободных соединений с базой данных {self.alias} '
+                        f'(открыто {self._size} из {self.max_size})'
+                    )
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                self._condition.wait(remaining)
+
+    def _pop_expired_locked(self):
+        """
+        Извлекает из очереди свободных соединений устаревшие.
+        Вызывается под блокировкой пула.
+        Возвращает:
+        list: Соединения, которые нужно закрыть.
+        """
+        now = time.monotonic()
+        expired = []
+        kept = deque()
+        for record in self._idle:
+            idle_too_long = now - record.last_used_at > self.max_idle and self._size - len(expired) > self.min_size
+            if idle_too_long or self._is_expired(record, now):
+                expired.append(record)
+            else:
+                kept.append(record)
+        self._idle = kept
+        return expired
+
+    def _is_expired(self, record, now):
+        """
+        Проверяет, превысило ли соединение максимальное время жизни.
+        """
+        return now - record.created_at > self.max_lifetime
+
+    @staticmethod
+    def _is_alive(raw):
+        """
+        Проверяет соединение запросом SELECT 1.
+        Возвращает:
+        bool: True, если соединение работает.
+        """
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute('SELECT 1')
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
+
+    def _discard(self, record):
+        """
+        Закрывает соединение и освобождает его место в пуле.
+        """
+        self._close_raw(record.raw)
+        with self._condition:
+            self._stats['closed'] += 1
+        self._release_slot()
+
+    def _release_slot(self):
+        """
+        Уменьшает размер пула и будит один ожидающий поток.
+        """
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _close_raw(raw):
+        """
+        Закрывает соединение драйвера, игнорируя ошибки.
+        """
+        try:
+            raw.close()
+        except Exception:
+            logger.warning('Не удалось закрыть соединение с базой данных', exc_info=True)
+
+
+def get_pool(alias, options=None):
+    """
+    Возвращает пул соединений псевдонима базы данных, создавая его при первом обращении.
+    Параметры:
+    alias (str): Псевдоним базы данных.
+    options (dict): Настройки пула (ключ POOL в настройках базы данных).
+    Возвращает:
+    ConnectionPool: Пул соединений.
+    """
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = ConnectionPool(alias, options)
+    return pool
+
+
+def get_pool_stats():
+    """
+    Возвращает метрики всех пулов соединений текущего процесса.
+    Возвращает:
+    list: Метрики пулов (см. ConnectionPool.get_stats()).
+    """
+    return [pool.get_stats() for pool in list(_pools.values())]
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Миксин для DatabaseWrapper бэкенда Django, берущий соединения из пула.
+    Django по-прежнему открывает и закрывает соединение на каждый запрос
+    (CONN_MAX_AGE = 0), но открытие берет готовое соединение из пула,
+    а закрытие возвращает его в пул вместо разрыва.
+    Настройки пула задаются ключом POOL в настройках базы данных.
+    """
+
+    @property
+    def pool(self):
+        """
+        Пул соединений псевдонима этой базы данных.
+        """
+        return get_pool(self.alias, self.settings_dict.get('POOL'))
+
+    def get_new_connection(self, conn_params):
+        """
+        Выдает соединение из пула, при необходимости открывая новое.
+        """
+        if self.is_pool_disabled():
+            return super().get_new_connection(conn_params)
+        return self.pool.checkout(lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params))
+
+    def _close(self):
+        """
+        Возвращает соединение в пул вместо закрытия.
+        """
+        if self.connection is None:
+            return
+        if self.is_pool_disabled():
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.checkin(self.connection)
+
+    def is_pool_disabled(self):
+        """
+        Проверяет, нужно ли работать без пула (например, для базы SQLite в памяти).
+        Возвращает:
+        bool: True, если пул не используется.
+        """
+        return False
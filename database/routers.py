@@ -0,0 +1,193 @@
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+_request_state = ContextVar('database_request_state', default=None)
+_bookkeeping = ContextVar('database_bookkeeping', default=False)
+
+_unavailable_until = {}
+_unavailable_lock = threading.Lock()
+_replica_counter = itertools.count()
+
+
+def start_request(read_from_primary, track_writes=True):
+    """
+    Начинает отслеживание обращений к базе данных в рамках HTTP-запроса.
+    Параметры:
+    read_from_primary (bool): Читать ли данные только из основной базы.
+    track_writes (bool): Считать ли записи запроса записями пользователя (для небезопасных запросов);
+    в безопасных запросах запись пользователя отмечается явно через mark_user_write().
+    Возвращает:
+    Token: Токен для завершения отслеживания в finish_request().
+    """
+    return _request_state.set({
+        'read_from_primary': read_from_primary,
+        'track_writes': track_writes,
+        'wrote': False,
+        'replica': None,
+    })
+
+
+def finish_request(token):
+    """
+    Завершает отслеживание обращений к базе данных.
+    Параметры:
+    token: Токен, полученный из start_request().
+    Возвращает:
+    bool: True, если во время запроса выполнялась запись пользователя.
+    """
+    state = _request_state.get()
+    _request_state.reset(token)
+    return bool(state and state['wrote'])
+
+
+def read_from_primary():
+    """
+    Переключает чтение до конца текущего запроса на основную базу данных.
+    """
+    state = _request_state.get()
+    if state is not None:
+        state['read_from_primary'] = True
+
+
+def mark_user_write():
+    """
+    Отмечает, что безопасный запрос (например, GET-переключатель активности) изменил данные
+    пользователя: чтение до конца запроса и еще DATABASE_REPLICA_PIN_SECONDS секунд
+    идет в основную базу.
+    """
+    state = _request_state.get()
+    if state is not None:
+        state['wrote'] = True
+        state['read_from_primary'] = True
+
+
+@contextmanager
+def bookkeeping_writes():
+    """
+    Контекст служебных записей (счетчики просмотров, статистика), которые не являются
+    изменениями пользователя и не переключают его чтение на основную базу.
+    """
+    token = _bookkeeping.set(True)
+    try:
+        yield
+    finally:
+        _bookkeeping.reset(token)
+
+
+def get_replicas():
+    """
+    Возвращает псевдонимы реплик из настройки DATABASE_REPLICAS.
+    Возвращает:
+    tuple: Псевдонимы реплик.
+    """
+    return tuple(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def is_available(alias):
+    """
+    Проверяет, доступна ли реплика.
+    Реплика, к которой не удалось подключиться, не используется
+    DATABASE_REPLICA_RETRY_SECONDS секунд.
+    Параметры:
+    alias (str): Псевдоним реплики.
+    Возвращает:
+    bool: True, если к реплике удалось подключиться.
+    """
+    if _unavailable_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except Exception:
+        retry = getattr(settings, 'DATABASE_REPLICA_RETRY_SECONDS', 30)
+        with _unavailable_lock:
+            _unavailable_until[alias] = time.monotonic() + retry
+        logger.warning('Реплика %s недоступна, чтение переключено на основную базу', alias, exc_info=True)
+        return False
+    return True
+
+
+def choose_replica():
+    """
+    Выбирает доступную реплику; запросы распределяются по репликам по кругу.
+    Возвращает:
+    str | None: Псевдоним реплики или None, если доступных реплик нет.
+    """
+    replicas = get_replicas()
+    if not replicas:
+        return None
+    start = next(_replica_counter)
+    for offset in range(len(replicas)):
+        alias = replicas[(start + offset) % len(replicas)]
+        if is_available(alias):
+            return alias
+    return None
+
+
+def get_request_replica(state):
+    """
+    Возвращает реплику текущего запроса. Реплика выбирается при первом чтении и
+    запоминается в состоянии запроса, чтобы все чтения запроса видели одни и те же данные.
+    Параметры:
+    state (dict): Состояние запроса из start_request().
+    Возвращает:
+    str: Псевдоним реплики или основной базы, если доступных реплик нет.
+    """
+    if state['replica'] is None:
+        state['replica'] = choose_replica() or DEFAULT_DB_ALIAS
+    return state['replica']
+
+
+class ReadReplicaRouter:
+    """
+    Маршрутизатор баз данных: запись в основную базу, безопасное чтение - из реплик.
+    Чтение идет в основную базу вне HTTP-запросов (команды управления),
+    в небезопасных запросах (POST и т.д.), в представлениях с read_from_primary = True,
+    в течение короткого времени после записи пользователя (см. ReadConsistencyMiddleware)
+    и при недоступности всех реплик.
+    Атрибуты:
+    primary_app_labels (set): Приложения, чтение которых всегда идет в основную базу.
+    """
+    primary_app_labels = {'sessions'}
+
+    def db_for_read(self, model, **hints):
+        """
+        Возвращает псевдоним базы для чтения.
+        """
+        state = _request_state.get()
+        if state is None or state['read_from_primary'] or model._meta.app_label in self.primary_app_labels:
+            return DEFAULT_DB_ALIAS
+        return get_request_replica(state)
+
+    def db_for_write(self, model, **hints):
+        """
+        Возвращает псевдоним базы для записи. Запись в небезопасном запросе запоминается
+        как запись пользователя, а чтение до конца запроса переключается на основную базу.
+        Служебные записи (bookkeeping_writes(), сессии из primary_app_labels) не учитываются.
+        """
+        state = _request_state.get()
+        if state is not None and not _bookkeeping.get() and model._meta.app_label not in self.primary_app_labels:
+            if state['track_writes']:
+                state['wrote'] = True
+            state['read_from_primary'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Разрешает связи между объектами из основной базы и реплик (это одни и те же данные).
+        """
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Разрешает миграции только в основной базе: реплики получают схему репликацией.
+        """
+        return db not in get_replicas()
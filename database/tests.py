@@ -0,0 +1,259 @@
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.contrib.sessions.models import Session
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from database import routers
+from database.middleware import PIN_COOKIE_NAME, ReadConsistencyMiddleware
+from database.pool import ConnectionPool, PoolTimeout
+from dogs import view_stats
+from dogs.models import Breed, Dog
+from users.models import User
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    """
+    Тесты пула соединений на соединениях sqlite3 к временному файлу.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'pool.sqlite3'
+        self.opened = []
+
+    def tearDown(self):
+        for raw in self.opened:
+            try:
+                raw.close()
+            except sqlite3.Error:
+                pass
+        self.directory.cleanup()
+
+    def connect(self):
+        raw = sqlite3.connect(self.path, check_same_thread=False)
+        self.opened.append(raw)
+        return raw
+
+    def make_pool(self, **options):
+        return ConnectionPool('test', {key.upper(): value for key, value in options.items()})
+
+    def test_checkin_reuses_connection(self):
+        pool = self.make_pool(max_size=2)
+        raw = pool.checkout(self.connect)
+        pool.checkin(raw)
+        self.assertIs(pool.checkout(self.connect), raw)
+        stats = pool.get_stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['in_use'], 1)
+
+    def test_checkout_times_out_when_pool_is_full(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        pool.checkout(self.connect)
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(self.connect)
+        self.assertEqual(pool.get_stats()['timeouts'], 1)
+
+    def test_waiting_checkout_gets_released_connection(self):
+        pool = self.make_pool(max_size=1, timeout=5)
+        raw = pool.checkout(self.connect)
+        timer = threading.Timer(0.05, pool.checkin, args=(raw,))
+        timer.start()
+        self.assertIs(pool.checkout(self.connect), raw)
+        timer.join()
+        self.assertEqual(pool.get_stats()['waits'], 1)
+
+    def test_broken_connection_is_replaced(self):
+        pool = self.make_pool(max_size=1)
+        raw = pool.checkout(self.connect)
+        pool.checkin(raw)
+        raw.close()
+        fresh = pool.checkout(self.connect)
+        self.assertIsNot(fresh, raw)
+        stats = pool.get_stats()
+        self.assertEqual(stats['ping_failures'], 1)
+        self.assertEqual(stats['size'], 1)
+
+    def test_expired_connection_is_closed(self):
+        pool = self.make_pool(max_lifetime=0.01)
+        raw = pool.checkout(self.connect)
+        time.sleep(0.02)
+        pool.checkin(raw)
+        stats = pool.get_stats()
+        self.assertEqual(stats['closed'], 1)
+        self.assertEqual(stats['size'], 0)
+
+    def test_checkin_rolls_back_open_transaction(self):
+        pool = self.make_pool()
+        raw = pool.checkout(self.connect)
+        raw.execute('CREATE TABLE item (id INTEGER)')
+        raw.commit()
+        raw.execute('INSERT INTO item VALUES (1)')
+        pool.checkin(raw)
+        raw = pool.checkout(self.connect)
+        self.assertEqual(raw.execute('SELECT COUNT(*) FROM item').fetchone()[0], 0)
+
+
+class ReadReplicaRouterTestCase(SimpleTestCase):
+    """
+    Тесты маршрутизатора реплик и middleware согласованности чтения на двух файлах SQLite.
+    Каждая реплика хранит свое имя в таблице replica_name.
+    """
+    replicas = ('test_replica_a', 'test_replica_b')
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        databases = {}
+        for alias in self.replicas:
+            path = Path(self.directory.name) / f'{alias}.sqlite3'
+            with sqlite3.connect(path) as raw:
+                raw.execute('CREATE TABLE replica_name (name TEXT)')
+                raw.execute('INSERT INTO replica_name VALUES (?)', [alias])
+            raw.close()
+            databases[alias] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path}
+        configured = connections.configure_settings({**connections.settings, **databases})
+        for alias in self.replicas:
+            connections.settings[alias] = configured[alias]
+        self.settings_override = override_settings(DATABASE_REPLICAS=self.replicas)
+        self.settings_override.enable()
+        routers._unavailable_until.clear()
+        self.router = routers.ReadReplicaRouter()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        routers._unavailable_until.clear()
+        for alias in self.replicas:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        self.directory.cleanup()
+
+    def read_replica_name(self):
+        alias = self.router.db_for_read(Dog)
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT name FROM replica_name')
+            return cursor.fetchone()[0]
+
+    def test_request_reads_from_one_replica(self):
+        names = []
+        for _ in range(4):
+            token = routers.start_request(False)
+            try:
+                request_names = {self.read_replica_name() for _ in range(3)}
+            finally:
+                routers.finish_request(token)
+            self.assertEqual(len(request_names), 1)
+            names.extend(request_names)
+        self.assertEqual(set(names), set(self.replicas))
+
+    def test_write_switches_reads_to_primary(self):
+        token = routers.start_request(False)
+        try:
+            self.assertIn(self.router.db_for_read(Dog), self.replicas)
+            self.assertEqual(self.router.db_for_write(Dog), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(Dog), DEFAULT_DB_ALIAS)
+        finally:
+            self.assertTrue(routers.finish_request(token))
+
+    def test_unavailable_replica_is_skipped(self):
+        connections.settings['test_replica_a']['NAME'] = Path(self.directory.name) / 'missing' / 'db.sqlite3'
+        with self.assertLogs('database.routers', 'WARNING'):
+            for _ in range(2):
+                token = routers.start_request(False)
+                try:
+                    self.assertEqual(self.read_replica_name(), 'test_replica_b')
+                finally:
+                    routers.finish_request(token)
+
+    def test_reads_outside_request_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Dog), DEFAULT_DB_ALIAS)
+
+    def test_write_in_post_request_pins_reads(self):
+        def view(request):
+            self.router.db_for_write(Dog)
+            return HttpResponse()
+
+        response = ReadConsistencyMiddleware(view)(RequestFactory().post('/'))
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+        request = RequestFactory().get('/')
+        request.COOKIES[PIN_COOKIE_NAME] = response.cookies[PIN_COOKIE_NAME].value
+
+        def read_view(request):
+            return HttpResponse(self.router.db_for_read(Dog))
+
+        response = ReadConsistencyMiddleware(read_view)(request)
+        self.assertEqual(response.content.decode(), DEFAULT_DB_ALIAS)
+
+    def test_unmarked_write_in_get_request_is_not_pinned(self):
+        def view(request):
+            self.router.db_for_write(Dog)
+            return HttpResponse()
+
+        response = ReadConsistencyMiddleware(view)(RequestFactory().get('/'))
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_marked_write_in_get_request_pins_reads(self):
+        def view(request):
+            self.router.db_for_write(Dog)
+            routers.mark_user_write()
+            return HttpResponse(self.router.db_for_read(Dog))
+
+        response = ReadConsistencyMiddleware(view)(RequestFactory().get('/'))
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+        self.assertEqual(response.content.decode(), DEFAULT_DB_ALIAS)
+
+    def test_bookkeeping_write_is_not_pinned(self):
+        def view(request):
+            with routers.bookkeeping_writes():
+                self.router.db_for_write(Dog)
+            self.router.db_for_write(Session)
+            return HttpResponse(self.router.db_for_read(Dog))
+
+        response = ReadConsistencyMiddleware(view)(RequestFactory().post('/'))
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_read_only_get_request_is_not_pinned(self):
+        response = ReadConsistencyMiddleware(lambda request: HttpResponse())(RequestFactory().get('/'))
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+
+class ReadConsistencyViewsTestCase(TestCase):
+    """
+    Тесты cookie закрепления чтения за основной базой на представлениях собак.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create(email='owner@test.local')
+        self.dog = Dog.objects.create(name='Бобик', breed=Breed.objects.create(name='Такса'), owner=self.owner)
+
+    def tearDown(self):
+        # Просмотры, накопленные в памяти процесса, относятся к собакам тестовой базы.
+        view_stats._pending.clear()
+
+    def test_dog_detail_view_by_visitor_is_not_pinned(self):
+        response = self.client.get(reverse('dogs:dog_detail', args=[self.dog.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+        self.dog.refresh_from_db()
+        self.assertEqual(self.dog.views, 1)
+
+    def test_dog_detail_not_modified_is_not_pinned(self):
+        url = reverse('dogs:dog_detail', args=[self.dog.pk])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_dog_toggle_activity_pins_reads(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('dogs:dog_toggle_activity', args=[self.dog.pk]))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
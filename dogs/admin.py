@@ -1,29 +1,46 @@
 from django.contrib import admin
 
 from dogs.models import Breed, Dog
+from users.admin_utils import AutocompleteFilter, LargeTableAdminMixin
 
 
 @admin.register(Breed)
-class BreedAdmin(admin.ModelAdmin):
+class BreedAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Админский интерфейс для модели породы собак (Breed).
     Атрибуты:
     list_display (tuple): Поля, отображаемые в списке объектов породы.
     ordering (tuple): Порядок сортировки объектов породы по первичному ключу.
+    search_fields (tuple): Поиск по началу названия (индекс breed_name_idx),
+    используется и автодополнением полей породы.
     """
     list_display = ('pk', 'name',)
     ordering = ('pk',)
+    search_fields = ('^name',)
 
 
 @admin.register(Dog)
-class DogAdmin(admin.ModelAdmin):
+class DogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Админский интерфейс для модели собак (Dog).
     Атрибуты:
     list_display (tuple): Поля, отображаемые в списке объектов собак.
+    list_select_related (tuple): Связи, загружаемые вместе со списком.
     list_filter (tuple): Поля, по которым можно фильтровать объекты собак.
+    search_fields (tuple): Поиск по началу клички (индекс dog_name_idx).
+    autocomplete_fields (tuple): Внешние ключи, выбираемые поиском.
     ordering (tuple): Порядок сортировки объектов собак по имени.
     """
     list_display = ('name', 'breed', 'owner')
-    list_filter = ('breed',)
+    list_select_related = ('breed', 'owner')
+    list_filter = (('breed', AutocompleteFilter), 'is_active')
+    search_fields = ('^name',)
+    autocomplete_fields = ('breed', 'owner')
     ordering = ('name',)
+
+    def get_queryset(self, request):
+        """
+        Загружает связи list_select_related и вне списка собак: порода входит в подпись собаки
+        в автодополнении полей и фильтров других моделей.
+        """
+        return super().get_queryset(request).select_related(*self.list_select_related)
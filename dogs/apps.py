@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dogs'
+
+    def ready(self):
+        import dogs.signals  # noqa: F401
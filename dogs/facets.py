@@ -0,0 +1,239 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.http import urlencode
+
+AGE_BANDS = (
+    ('puppy', 'до 1 года', 0, 1),
+    ('young', '1-3 года', 1, 3),
+    ('adult', '3-8 лет', 3, 8),
+    ('senior', 'старше 8 лет', 8, None),
+    ('unknown', 'не указан', None, None),
+)
+FLAG_VALUES = (('1', 'да'), ('0', 'нет'))
+SORTS = {
+    'name': ('name', 'pk'),
+    'views': ('-views', 'pk'),
+    'young': ('-birth_date', 'pk'),
+    'old': ('birth_date', 'pk'),
+}
+SORT_LABELS = (('name', 'по кличке'), ('views', 'по просмотрам'), ('young', 'сначала молодые'),
+               ('old', 'сначала старые'))
+DEFAULT_SORT = 'name'
+
+
+def years_ago(today, years):
+    """
+    Возвращает дату years лет назад (29 февраля переходит в 28 февраля).
+    Параметры:
+    today (date): Текущая дата.
+    years (int): Количество лет.
+    Возвращает:
+    date: Дата.
+    """
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        return today.replace(year=today.year - years, day=28)
+
+
+def age_band_q(band, today):
+    """
+    Возвращает условие на дату рождения для возрастной группы.
+    Параметры:
+    band (str): Код группы из AGE_BANDS.
+    today (date): Текущая дата.
+    Возвращает:
+    Q: Условие фильтрации.
+    """
+    for code, _, min_years, max_years in AGE_BANDS:
+        if code != band:
+            continue
+        if code == 'unknown':
+            return Q(birth_date__isnull=True)
+        condition = Q(birth_date__lte=years_ago(today, min_years)) if min_years else Q(birth_date__isnull=False)
+        if max_years is not None:
+            condition &= Q(birth_date__gt=years_ago(today, max_years))
+        return condition
+    return Q()
+
+
+class DogFacets:
+    """
+    Фасетный поиск собак: порода, возраст, активность, наличие хозяина и фото.
+    Количество собак для каждого значения каждого фасета считается с учетом выбранных
+    значений остальных фасетов (выбор внутри фасета не сужает его собственные варианты).
+    Все количества вычисляются одним запросом: GROUP BY по породе с условной агрегацией
+    Count(filter=...) для значений остальных фасетов, суммы по породам считаются в Python.
+    Атрибуты:
+    queryset (QuerySet): Собаки, доступные пользователю.
+    params (QueryDict): Параметры запроса.
+    """
+    facet_names = ('breed', 'age', 'active', 'owner', 'photo')
+
+    def __init__(self, queryset, params):
+        self.queryset = queryset
+        self.today = timezone.localdate()
+        self.selected = {}
+        for name in self.facet_names:
+            value = params.get(name, '')
+            if value and self.is_valid(name, value):
+                self.selected[name] = value
+        sort = params.get('sort', DEFAULT_SORT)
+        self.sort = sort if sort in SORTS else DEFAULT_SORT
+
+    def is_valid(self, name, value):
+        """
+        Проверяет значение фасета из параметров запроса.
+        Возвращает:
+        bool: True, если значение допустимо.
+        """
+        if name == 'breed':
+            return value.isdigit()
+        if name == 'age':
+            return value in {code for code, *_ in AGE_BANDS}
+        return value in {'0', '1'}
+
+    def value_q(self, name, value):
+        """
+        Возвращает условие для значения фасета.
+        Параметры:
+        name (str): Имя фасета.
+        value (str): Значение фасета.
+        Возвращает:
+        Q: Условие фильтрации.
+        """
+        if name == 'breed':
+            return Q(breed_id=int(value))
+        if name == 'age':
+            return age_band_q(value, self.today)
+        flag = value == '1'
+        if name == 'active':
+            return Q(is_active=flag)
+        if name == 'owner':
+            return Q(owner__isnull=not flag)
+        has_photo = Q(photo__isnull=False) & ~Q(photo='')
+        return has_photo if flag else ~has_photo
+
+    def filters_q(self, *exclude):
+        """
+        Возвращает условие по всем выбранным фасетам, кроме exclude.
+        Параметры:
+        *exclude (str): Имена фасетов, условия которых не учитываются.
+        Возвращает:
+        Q: Условие фильтрации.
+        """
+        condition = Q()
+        for name, value in self.selected.items():
+            if name not in exclude:
+                condition &= self.value_q(name, value)
+        return condition
+
+    def get_queryset(self):
+        """
+        Возвращает собак по выбранным фасетам в выбранном порядке.
+        Возвращает:
+        QuerySet: Собаки с породой.
+        """
+        return self.queryset.filter(self.filters_q()).select_related('breed').order_by(*SORTS[self.sort])
+
+    def get_value_options(self):
+        """
+        Возвращает значения фасетов, кроме породы.
+        Возвращает:
+        dict: Имя фасета -> список пар (значение, подпись).
+        """
+        return {
+            'age': [(code, label) for code, label, *_ in AGE_BANDS],
+            'active': list(FLAG_VALUES),
+            'owner': list(FLAG_VALUES),
+            'photo': list(FLAG_VALUES),
+        }
+
+    def get_counts(self):
+        """
+        Считает количество собак для всех значений всех фасетов одним запросом.
+        Возвращает:
+        tuple: Количество собак по всем выбранным фасетам и
+        словарь имя фасета -> список (значение, подпись, количество).
+        """
+        options = self.get_value_options()
+        # Условие по породе не входит в фильтры: оно учитывается выбором строк GROUP BY.
+        aggregates = {
+            'breed_count': Count('pk', filter=self.filters_q('breed')),
+        }
+        for name, values in options.items():
+            others = self.filters_q(name, 'breed')
+            for value, _ in values:
+                aggregates[f'{name}__{value}'] = Count('pk', filter=others & self.value_q(name, value))
+        rows = (
+            self.queryset.order_by().values('breed_id', 'breed__name').annotate(**aggregates)
+            .order_by('breed__name')
+        )
+        selected_breed = int(self.selected['breed']) if 'breed' in self.selected else None
+        counts = {name: {value: 0 for value, _ in values} for name, values in options.items()}
+        breeds = []
+        total = 0
+        for row in rows:
+            breeds.append((str(row['breed_id']), row['breed__name'], row['breed_count']))
+            if selected_breed is not None and row['breed_id'] != selected_breed:
+                continue
+            total += row['breed_count']
+            for name, values in options.items():
+                for value, _ in values:
+                    counts[name][value] += row[f'{name}__{value}']
+        facets = {'breed': breeds}
+        for name, values in options.items():
+            facets[name] = [(value, label, counts[name][value]) for value, label in values]
+        return total, facets
+
+    def get_query(self, **changes):
+        """
+        Возвращает строку параметров для ссылки с измененными фасетами.
+        Параметры:
+        **changes: Имя фасета -> новое значение (None снимает выбор).
+        Возвращает:
+        str: Строка параметров без номера страницы.
+        """
+        params = dict(self.selected, sort=self.sort)
+        for name, value in changes.items():
+            if value is None:
+                params.pop(name, None)
+            else:
+                params[name] = value
+        return urlencode(params)
+
+    def get_context(self):
+        """
+        Собирает контекст для боковой панели фасетов.
+        Возвращает:
+        dict: total, facets (список фасетов со ссылками), sorts и page_query для пагинации.
+        """
+        total, facets = self.get_counts()
+        titles = {'breed': 'Порода', 'age': 'Возраст', 'active': 'Активна', 'owner': 'Есть хозяин',
+                  'photo': 'Есть фото'}
+        panel = []
+        for name in self.facet_names:
+            selected = self.selected.get(name)
+            panel.append({
+                'title': titles[name],
+                'reset_query': self.get_query(**{name: None}) if selected else None,
+                'values': [
+                    {
+                        'label': label,
+                        'count': count,
+                        'selected': value == selected,
+                        'query': self.get_query(**{name: None if value == selected else value}),
+                    }
+                    for value, label, count in facets[name]
+                ],
+            })
+        sorts = [
+            {'label': label, 'selected': code == self.sort, 'query': self.get_query(sort=code)}
+            for code, label in SORT_LABELS
+        ]
+        return {
+            'total': total,
+            'facets': panel,
+            'sorts': sorts,
+            'page_query': self.get_query() + '&',
+        }
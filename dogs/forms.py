@@ -2,14 +2,18 @@ import datetime
 
 from django import forms
 
+from config.uploads import BoundedImageField
 from dogs.models import Dog, DogParent
 from users.forms import StyleFormMixin
+from users.widgets import RemoteSelect
 
 
 class DogForm(StyleFormMixin, forms.ModelForm):
     """
     Форма для модели Dog с применением миксина стилей.
     Исключает из формы поля: owner, is_active, views.
+    Порода выбирается через RemoteSelect: варианты подгружаются поиском, а не выводятся все сразу.
+    Фото проверяется BoundedImageField (размер файла, формат и размеры изображения).
     Методы:
     clean_birth_date: Валидирует поле даты рождения собаки,
     чтобы возраст собаки не превышал 35 лет.
@@ -18,6 +22,8 @@ class DogForm(StyleFormMixin, forms.ModelForm):
     class Meta:
         model = Dog
         exclude = ('owner', 'is_active', 'views')
+        widgets = {'breed': RemoteSelect('api:lookup_breeds')}
+        field_classes = {'photo': BoundedImageField}
 
     def clean_birth_date(self):
         """
@@ -38,10 +44,12 @@ class DogAdminForm(DogForm):
     """
     Форма для администрирования модели Dog, наследующая DogForm.
     Исключает из формы поле is_active.
+    Хозяин выбирается поиском по пользователям (RemoteSelect).
     """
 
     class Meta(DogForm.Meta):
         exclude = ('is_active',)
+        widgets = dict(DogForm.Meta.widgets, owner=RemoteSelect('api:lookup_users'))
 
     # def clean_birth_date(self):
     #     clean_birth_date = super().clean_birth_date()
@@ -56,3 +64,4 @@ class DogParentForm(StyleFormMixin, forms.ModelForm):
     class Meta:
         model = DogParent
         fields = '__all__'
+        widgets = {'category': RemoteSelect('api:lookup_breeds')}
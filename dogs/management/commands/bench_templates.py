@@ -0,0 +1,76 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import BaseCommand
+from django.core.paginator import Paginator
+from django.template import engines
+from django.test import RequestFactory
+from django.utils.functional import SimpleLazyObject
+
+from dogs.models import Breed, Dog
+from reviews.models import Review
+from users.capabilities import get_capabilities
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Сравнение времени рендеринга шаблонов списков на движках Django и Jinja2.
+    Каждый шаблон рендерится с одинаковым контекстом (страница из --objects записей),
+    запросы к базе данных выполняются один раз до замера:
+    python manage.py bench_templates --objects 30 --iterations 200
+    """
+    help = 'Замер времени рендеринга шаблонов списков Django и Jinja2'
+
+    templates = {
+        'dogs/dogs.html': lambda: Dog.objects.filter(is_active=True).select_related('breed', 'owner'),
+        'dogs/breeds.html': lambda: Breed.objects.all(),
+        'reviews/reviews.html': lambda: Review.objects.filter(sign_of_review=True).select_related('dog__breed'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--objects', type=int, default=30, help='Количество записей на странице')
+        parser.add_argument('--iterations', type=int, default=200, help='Количество рендерингов каждого шаблона')
+        parser.add_argument('--email', help='Почта пользователя, от имени которого рендерятся шаблоны')
+
+    def handle(self, *args, **options):
+        user = User.objects.get(email=options['email']) if options['email'] else AnonymousUser()
+        request = RequestFactory().get('/')
+        request.user = user
+        request.capabilities = SimpleLazyObject(lambda: get_capabilities(user))
+        for template_name, get_queryset in self.templates.items():
+            context = self.get_context(get_queryset(), options['objects'])
+            timings = {}
+            for alias in ('django', 'jinja2'):
+                template = engines[alias].get_template(template_name)
+                template.render(context, request)
+                started = time.perf_counter()
+                for _ in range(options['iterations']):
+                    template.render(context, request)
+                timings[alias] = (time.perf_counter() - started) / options['iterations']
+            self.stdout.write(
+                f'{template_name} ({len(context["object_list"])} записей): '
+                f'Django {timings["django"] * 1000:.2f} мс, Jinja2 {timings["jinja2"] * 1000:.2f} мс, '
+                f'быстрее в {timings["django"] / timings["jinja2"]:.1f} раза'
+            )
+
+    @staticmethod
+    def get_context(queryset, per_page):
+        """
+        Загружает первую страницу записей и собирает контекст как у ListView.
+        Параметры:
+        queryset (QuerySet): Записи списка.
+        per_page (int): Количество записей на странице.
+        Возвращает:
+        dict: Контекст шаблона.
+        """
+        paginator = Paginator(queryset.order_by('pk'), per_page)
+        page = paginator.page(1)
+        object_list = list(page.object_list)
+        return {
+            'title': 'Замер рендеринга',
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': True,
+            'object_list': object_list,
+        }
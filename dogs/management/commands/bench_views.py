@@ -0,0 +1,98 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management import BaseCommand
+from django.test import AsyncClient, Client
+
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный тест представлений внутри одного процесса (одного воркера).
+    WSGI-путь обслуживает запросы пулом потоков, ASGI-путь - одним циклом событий.
+    Для сравнения асинхронных представлений запустите ASGI-замер с ASYNC_VIEWS=True:
+    python manage.py bench_views --handler wsgi
+    ASYNC_VIEWS=True python manage.py bench_views --handler asgi
+    """
+    help = 'Замер пропускной способности представлений через WSGI или ASGI обработчик'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--handler', choices=('wsgi', 'asgi'), default='wsgi')
+        parser.add_argument('--requests', type=int, default=200, help='Общее число запросов')
+        parser.add_argument('--concurrency', type=int, default=20, help='Число одновременных запросов')
+        parser.add_argument('--url', action='append', dest='urls', help='Адрес страницы (можно несколько)')
+        parser.add_argument('--email', help='Почта пользователя, от имени которого выполняются запросы')
+
+    def handle(self, *args, **options):
+        urls = options['urls'] or ['/dogs/', '/breeds/', '/reviews/']
+        user = User.objects.get(email=options['email']) if options['email'] else None
+        if options['handler'] == 'wsgi':
+            elapsed, latencies, statuses = self.run_wsgi(urls, user, options['requests'], options['concurrency'])
+        else:
+            elapsed, latencies, statuses = asyncio.run(
+                self.run_asgi(urls, user, options['requests'], options['concurrency'])
+            )
+        latencies.sort()
+        self.stdout.write(f'Обработчик: {options["handler"]}, одновременных запросов: {options["concurrency"]}')
+        self.stdout.write(f'Запросов: {len(latencies)} за {elapsed:.2f} с, {len(latencies) / elapsed:.1f} запросов/с')
+        self.stdout.write(f'Задержка p50: {statistics.median(latencies) * 1000:.1f} мс, '
+                          f'p95: {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} мс')
+        self.stdout.write(f'Коды ответов: {dict(sorted(statuses.items()))}')
+
+    @staticmethod
+    def run_wsgi(urls, user, total, concurrency):
+        """
+        Выполняет запросы через WSGI-обработчик пулом из concurrency потоков.
+        Возвращает:
+        tuple: Общее время, задержки запросов и количество ответов по кодам.
+        """
+        local = threading.local()
+        lock = threading.Lock()
+        statuses = {}
+
+        def fetch(number):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+                if user is not None:
+                    local.client.force_login(user)
+            started = time.perf_counter()
+            response = local.client.get(urls[number % len(urls)])
+            latency = time.perf_counter() - started
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            return latency
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(fetch, range(total)))
+        return time.perf_counter() - started, latencies, statuses
+
+    @staticmethod
+    async def run_asgi(urls, user, total, concurrency):
+        """
+        Выполняет запросы через ASGI-обработчик в одном цикле событий,
+        одновременно выполняется не больше concurrency запросов.
+        Возвращает:
+        tuple: Общее время, задержки запросов и количество ответов по кодам.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        statuses = {}
+        client = AsyncClient()
+        if user is not None:
+            await client.aforce_login(user)
+
+        async def fetch(number):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(urls[number % len(urls)])
+                latency = time.perf_counter() - started
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            return latency
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(fetch(number) for number in range(total)))
+        return time.perf_counter() - started, list(latencies), statuses
@@ -0,0 +1,19 @@
+from django.core.management import BaseCommand
+
+from dogs.view_stats import compact_view_stats
+
+
+class Command(BaseCommand):
+    """
+    Сворачивает дневную статистику просмотров собак старше срока хранения в месячную
+    (запускается по расписанию):
+    python manage.py compact_view_stats --days 90
+    """
+    help = 'Сворачивание дневной статистики просмотров собак в месячную'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Срок хранения дневных записей (VIEW_STATS_RETENTION_DAYS)')
+
+    def handle(self, *args, **options):
+        deleted, months = compact_view_stats(options['days'])
+        self.stdout.write(f'Удалено дневных записей: {deleted}, месячных записей: {months}')
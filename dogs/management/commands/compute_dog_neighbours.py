@@ -0,0 +1,21 @@
+from django.core.management import BaseCommand
+
+from dogs.neighbours import compute_neighbours, NEIGHBOURS_COUNT
+
+
+class Command(BaseCommand):
+    """
+    Рассчитывает похожих собак для панели на странице собаки.
+    По умолчанию пересчитываются только изменённые собаки и затронутые ими списки
+    (запускается по расписанию), --full пересчитывает всех собак:
+    python manage.py compute_dog_neighbours --full
+    """
+    help = 'Расчет похожих собак'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Пересчитать всех собак')
+        parser.add_argument('--count', type=int, default=NEIGHBOURS_COUNT, help='Количество похожих собак')
+
+    def handle(self, *args, **options):
+        count = compute_neighbours(full=options['full'], count=options['count'])
+        self.stdout.write(f'Пересчитано собак: {count}')
@@ -0,0 +1,20 @@
+from django.core.management import BaseCommand
+
+from config.storage import collect_garbage
+
+
+class Command(BaseCommand):
+    """
+    Удаляет загруженные файлы, на которые не ссылается ни одна собака и ни один пользователь
+    (запускается по расписанию):
+    python manage.py gc_media --dry-run
+    """
+    help = 'Удаление фото и аватаров без ссылок'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Только посчитать файлы без ссылок')
+
+    def handle(self, *args, **options):
+        checked, deleted = collect_garbage(dry_run=options['dry_run'])
+        action = 'найдено' if options['dry_run'] else 'удалено'
+        self.stdout.write(f'Проверено файлов: {checked}, {action} файлов без ссылок: {deleted}')
@@ -0,0 +1,19 @@
+from django.core.management import BaseCommand
+
+from dogs.trending import rebuild_trending
+
+
+class Command(BaseCommand):
+    """
+    Перестраивает рейтинг популярных собак по статистике просмотров и отзывам
+    (запускается по расписанию, например раз в час):
+    python manage.py rebuild_trending --days 14
+    """
+    help = 'Перестроение рейтинга популярных собак'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Глубина пересчета в днях (TRENDING_WINDOW_DAYS)')
+
+    def handle(self, *args, **options):
+        count = rebuild_trending(options['days'])
+        self.stdout.write(f'Собак в рейтинге: {count}')
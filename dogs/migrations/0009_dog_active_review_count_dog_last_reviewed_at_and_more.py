@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0008_breed_updated_at_dog_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dog',
+            name='active_review_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Активных отзывов'),
+        ),
+        migrations.AddField(
+            model_name='dog',
+            name='last_reviewed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Последний отзыв'),
+        ),
+        migrations.AddField(
+            model_name='dog',
+            name='review_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Отзывов'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-19 15:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0009_dog_active_review_count_dog_last_reviewed_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DogViewStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'День'), ('month', 'Месяц')], default='day', max_length=5, verbose_name='Период')),
+                ('day', models.DateField(verbose_name='День')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Просмотры')),
+                ('dog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_stats', to='dogs.dog', verbose_name='Собака')),
+            ],
+            options={
+                'verbose_name': 'dog view stat',
+                'verbose_name_plural': 'dog view stats',
+                'unique_together': {('dog', 'period', 'day')},
+            },
+        ),
+    ]
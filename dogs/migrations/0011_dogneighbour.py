@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-19 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0010_dogviewstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DogNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Место')),
+                ('score', models.FloatField(verbose_name='Близость')),
+                ('computed_at', models.DateTimeField(verbose_name='Рассчитана')),
+                ('dog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='dogs.dog', verbose_name='Собака')),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dogs.dog', verbose_name='Похожая собака')),
+            ],
+            options={
+                'verbose_name': 'dog neighbour',
+                'verbose_name_plural': 'dog neighbours',
+                'ordering': ('dog', 'rank'),
+                'unique_together': {('dog', 'rank')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-19 15:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0012_dog_dog_active_name_idx_dog_dog_active_views_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['name'], name='breed_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dog',
+            index=models.Index(fields=['name'], name='dog_name_idx'),
+        ),
+    ]
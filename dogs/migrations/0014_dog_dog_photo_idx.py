@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-19 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0013_breed_breed_name_idx_dog_dog_name_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dog',
+            index=models.Index(fields=['photo'], name='dog_photo_idx'),
+        ),
+    ]
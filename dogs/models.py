@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models
+from django.db.models import F
 from django.conf import settings
 
 from users.models import NULLABLE
@@ -10,9 +11,11 @@ class Breed(models.Model):
     Атрибуты:
     name (CharField): Название породы.
     description (CharField): Описание породы.
+    updated_at (DateTimeField): Дата и время последнего изменения.
     """
     name = models.CharField(max_length=100, verbose_name='Порода')
     description = models.CharField(max_length=1000, verbose_name='Описание', **NULLABLE)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменена')
 
     def __str__(self):
         """
@@ -25,6 +28,10 @@ class Breed(models.Model):
     class Meta:
         verbose_name = 'breed'
         verbose_name_plural = 'breeds'
+        # Поиск породы по началу названия в админке и в полях выбора породы.
+        indexes = [
+            models.Index(fields=['name'], name='breed_name_idx'),
+        ]
 
 
 class Dog(models.Model):
@@ -38,7 +45,15 @@ class Dog(models.Model):
     is_active (BooleanField): Статус активности собаки.
     owner (ForeignKey): Хозяин собаки.
     views (IntegerField): Количество просмотров профиля собаки.
+    updated_at (DateTimeField): Дата и время последнего изменения (счетчик просмотров не влияет).
+    review_count (IntegerField): Количество отзывов о собаке.
+    active_review_count (IntegerField): Количество активных отзывов о собаке.
+    last_reviewed_at (DateTimeField): Дата последнего отзыва.
+    Счетчики отзывов поддерживает приложение reviews (см. reviews.counters),
+    save() существующей собаки их не перезаписывает.
     """
+    REVIEW_COUNTER_FIELDS = ('review_count', 'active_review_count', 'last_reviewed_at')
+
     name = models.CharField(max_length=250, verbose_name='Кличка')
     breed = models.ForeignKey(Breed, on_delete=models.CASCADE, verbose_name='Порода')
     photo = models.ImageField(upload_to='dogs/', **NULLABLE, verbose_name='Фото')
@@ -47,6 +62,10 @@ class Dog(models.Model):
 
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, **NULLABLE, verbose_name='Хозяин')
     views = models.IntegerField(default=0, verbose_name='Просмотры')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменена')
+    review_count = models.IntegerField(default=0, editable=False, verbose_name='Отзывов')
+    active_review_count = models.IntegerField(default=0, editable=False, verbose_name='Активных отзывов')
+    last_reviewed_at = models.DateTimeField(**NULLABLE, editable=False, verbose_name='Последний отзыв')
 
     def __str__(self):
         """
@@ -59,6 +78,16 @@ class Dog(models.Model):
     class Meta:
         verbose_name = 'dog'
         verbose_name_plural = 'dogs'
+        # Индексы для сортировок фасетного поиска (dogs.facets.SORTS).
+        indexes = [
+            models.Index(fields=['is_active', 'name'], name='dog_active_name_idx'),
+            models.Index(fields=['is_active', '-views'], name='dog_active_views_idx'),
+            models.Index(fields=['is_active', 'birth_date'], name='dog_active_birth_date_idx'),
+            # Поиск и сортировка по кличке в админке и поиск собаки в ReviewForm.
+            models.Index(fields=['name'], name='dog_name_idx'),
+            # Подсчет ссылок на файл фото (config.storage).
+            models.Index(fields=['photo'], name='dog_photo_idx'),
+        ]
         # варианты работы с мета классом
         # abstract = True
         # app_label = 'dogs'
@@ -69,10 +98,95 @@ class Dog(models.Model):
 
     def views_count(self):
         """
-        Увеличивает количество просмотров профиля собаки на 1 и сохраняет изменения.
+        Увеличивает количество просмотров профиля собаки на 1.
+        Счетчик увеличивается атомарно в базе данных через update(),
+        поэтому дата изменения собаки (updated_at) не меняется.
+        """
+        Dog.objects.filter(pk=self.pk).update(views=F('views') + 1)
+        # Новое значение читается из основной базы: реплика может еще не получить обновление.
+        self.refresh_from_db(using=DEFAULT_DB_ALIAS, fields=['views'])
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет собаку. При изменении существующей собаки счетчики отзывов
+        не записываются, чтобы не затереть значения, измененные параллельно.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.REVIEW_COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class DogViewStat(models.Model):
+    """
+    Модель для представления количества просмотров собаки за день или месяц.
+    Просмотры копятся в памяти процесса и записываются пачками (см. dogs.view_stats),
+    дневные записи старше срока хранения сворачиваются в месячные.
+    Атрибуты:
+    dog (ForeignKey): Собака.
+    period (CharField): Период записи: день или месяц.
+    day (DateField): День (для месячной записи - первый день месяца).
+    count (PositiveIntegerField): Количество просмотров за период.
+    """
+    DAY = 'day'
+    MONTH = 'month'
+    PERIODS = (
+        (DAY, 'День'),
+        (MONTH, 'Месяц'),
+    )
+
+    dog = models.ForeignKey(Dog, on_delete=models.CASCADE, related_name='view_stats', verbose_name='Собака')
+    period = models.CharField(max_length=5, choices=PERIODS, default=DAY, verbose_name='Период')
+    day = models.DateField(verbose_name='День')
+    count = models.PositiveIntegerField(default=0, verbose_name='Просмотры')
+
+    def __str__(self):
+        """
+        Возвращает строковое представление записи.
+        Возвращает:
+        str: Собака, период и количество просмотров.
         """
-        self.views += 1
-        self.save()
+        return f'{self.dog_id} {self.period} {self.day}: {self.count}'
+
+    class Meta:
+        verbose_name = 'dog view stat'
+        verbose_name_plural = 'dog view stats'
+        unique_together = ('dog', 'period', 'day')
+
+
+class DogNeighbour(models.Model):
+    """
+    Модель для представления похожей собаки.
+    Записи рассчитываются заранее командой compute_dog_neighbours (см. dogs.neighbours),
+    страница собаки читает их одним запросом по индексу (dog, rank).
+    Атрибуты:
+    dog (ForeignKey): Собака.
+    neighbour (ForeignKey): Похожая собака.
+    rank (PositiveSmallIntegerField): Место в списке похожих (с 1).
+    score (FloatField): Косинусная близость векторов признаков.
+    computed_at (DateTimeField): Дата и время расчета.
+    """
+    dog = models.ForeignKey(Dog, on_delete=models.CASCADE, related_name='neighbours', verbose_name='Собака')
+    neighbour = models.ForeignKey(Dog, on_delete=models.CASCADE, related_name='+', verbose_name='Похожая собака')
+    rank = models.PositiveSmallIntegerField(verbose_name='Место')
+    score = models.FloatField(verbose_name='Близость')
+    computed_at = models.DateTimeField(verbose_name='Рассчитана')
+
+    def __str__(self):
+        """
+        Возвращает строковое представление записи.
+        Возвращает:
+        str: Собака, место и похожая собака.
+        """
+        return f'{self.dog_id} #{self.rank}: {self.neighbour_id}'
+
+    class Meta:
+        verbose_name = 'dog neighbour'
+        verbose_name_plural = 'dog neighbours'
+        ordering = ('dog', 'rank')
+        unique_together = ('dog', 'rank')
 
 
 class DogParent(models.Model):
@@ -0,0 +1,172 @@
+import numpy as np
+from django.db import transaction
+from django.db.models import F, Max, Q
+from django.utils import timezone
+
+from dogs.models import Breed, Dog, DogNeighbour, DogParent
+
+NEIGHBOURS_COUNT = 6
+BATCH_SIZE = 512
+
+# Веса групп признаков в векторе собаки.
+BREED_WEIGHT = 1.0
+PARENT_BREED_WEIGHT = 0.5
+AGE_WEIGHT = 0.5
+POPULARITY_WEIGHT = 0.3
+
+
+def standardize(values):
+    """
+    Приводит столбец признака к нулевому среднему и единичному разбросу.
+    Пропущенные значения (nan) заменяются средним, то есть нулем.
+    Параметры:
+    values (np.ndarray): Значения признака.
+    Возвращает:
+    np.ndarray: Стандартизованные значения.
+    """
+    known = values[~np.isnan(values)]
+    if not known.size:
+        return np.zeros_like(values)
+    std = known.std() or 1.0
+    return np.nan_to_num((values - known.mean()) / std)
+
+
+def build_feature_matrix():
+    """
+    Строит векторы признаков всех активных собак:
+    порода (one-hot), породы родителей, возраст, популярность по просмотрам и отзывам.
+    Векторы нормируются, поэтому скалярное произведение равно косинусной близости.
+    Возвращает:
+    tuple: Список id собак и матрица признаков (собаки x признаки).
+    """
+    rows = list(Dog.objects.filter(is_active=True).order_by('pk').values_list(
+        'pk', 'breed_id', 'birth_date', 'views', 'active_review_count',
+    ))
+    dog_ids = [row[0] for row in rows]
+    position = {dog_id: index for index, dog_id in enumerate(dog_ids)}
+    breed_ids = Breed.objects.order_by('pk').values_list('pk', flat=True)
+    breed_column = {breed_id: index for index, breed_id in enumerate(breed_ids)}
+    features = np.zeros((len(rows), len(breed_column) * 2 + 3))
+
+    today = timezone.localdate()
+    ages = np.full(len(rows), np.nan)
+    for index, (_, breed_id, birth_date, views, review_count) in enumerate(rows):
+        features[index, breed_column[breed_id]] = BREED_WEIGHT
+        if birth_date:
+            ages[index] = (today - birth_date).days / 365.25
+        features[index, -2] = np.log1p(views)
+        features[index, -1] = np.log1p(review_count)
+
+    parents = DogParent.objects.filter(dog_id__in=position).values_list('dog_id', 'category_id')
+    offset = len(breed_column)
+    for dog_id, breed_id in parents:
+        features[position[dog_id], offset + breed_column[breed_id]] += 1
+    parent_block = features[:, offset:offset * 2]
+    parent_totals = parent_block.sum(axis=1, keepdims=True)
+    np.divide(parent_block, parent_totals, out=parent_block, where=parent_totals > 0)
+    parent_block *= PARENT_BREED_WEIGHT
+
+    features[:, -3] = standardize(ages) * AGE_WEIGHT
+    features[:, -2] = standardize(features[:, -2]) * POPULARITY_WEIGHT
+    features[:, -1] = standardize(features[:, -1]) * POPULARITY_WEIGHT
+
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    np.divide(features, norms, out=features, where=norms > 0)
+    return dog_ids, features
+
+
+def top_neighbours(features, rows, count):
+    """
+    Находит самых похожих собак для строк rows пачками по BATCH_SIZE.
+    Параметры:
+    features (np.ndarray): Матрица признаков всех активных собак.
+    rows (np.ndarray): Номера строк, для которых ищутся соседи.
+    count (int): Количество соседей.
+    Возвращает:
+    tuple: Матрицы номеров соседей и их близости (len(rows) x count), по убыванию близости.
+    """
+    count = min(count, len(features) - 1)
+    all_indices = np.empty((len(rows), max(count, 0)), dtype=np.int64)
+    all_scores = np.empty((len(rows), max(count, 0)))
+    if count <= 0:
+        return all_indices, all_scores
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        similarity = features[batch] @ features.T
+        similarity[np.arange(len(batch)), batch] = -np.inf
+        candidates = np.argpartition(-similarity, count - 1, axis=1)[:, :count]
+        candidate_scores = np.take_along_axis(similarity, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind='stable')
+        all_indices[start:start + len(batch)] = np.take_along_axis(candidates, order, axis=1)
+        all_scores[start:start + len(batch)] = np.take_along_axis(candidate_scores, order, axis=1)
+    return all_indices, all_scores
+
+
+def get_changed_dog_ids():
+    """
+    Возвращает активных собак, изменённых после последнего расчета соседей или ещё не рассчитанных.
+    Возвращает:
+    set: id собак.
+    """
+    return set(
+        Dog.objects.filter(is_active=True).annotate(computed_at=Max('neighbours__computed_at'))
+        .filter(Q(computed_at=None) | Q(updated_at__gt=F('computed_at'))).values_list('pk', flat=True)
+    )
+
+
+def compute_neighbours(full=False, count=NEIGHBOURS_COUNT):
+    """
+    Пересчитывает похожих собак.
+    При инкрементальном расчете пересчитываются изменённые собаки и собаки, в чьих списках
+    изменённая собака была или теперь должна оказаться; близость с изменёнными собаками
+    для всех собак вычисляется одним матричным умножением.
+    Параметры:
+    full (bool): Пересчитать всех собак.
+    count (int): Количество похожих собак.
+    Возвращает:
+    int: Количество пересчитанных собак.
+    """
+    dog_ids, features = build_feature_matrix()
+    position = {dog_id: index for index, dog_id in enumerate(dog_ids)}
+    if full:
+        recompute = set(dog_ids)
+    else:
+        changed = get_changed_dog_ids()
+        # Собаки, в списках которых есть отключенные собаки.
+        recompute = changed | set(
+            DogNeighbour.objects.filter(neighbour__is_active=False).values_list('dog_id', flat=True)
+        )
+        if changed:
+            changed_rows = np.array(sorted(position[dog_id] for dog_id in changed))
+            similarity = features @ features[changed_rows].T
+            current = {}
+            for dog_id, neighbour_id, score in DogNeighbour.objects.values_list('dog_id', 'neighbour_id', 'score'):
+                current.setdefault(dog_id, []).append((neighbour_id, score))
+            for dog_id, neighbours in current.items():
+                if dog_id not in position:
+                    continue
+                if any(neighbour_id in changed for neighbour_id, _ in neighbours):
+                    recompute.add(dog_id)
+                    continue
+                row = position[dog_id]
+                scores = similarity[row].copy()
+                scores[changed_rows == row] = -np.inf
+                threshold = min(score for _, score in neighbours) if len(neighbours) >= count else -np.inf
+                if scores.max() > threshold:
+                    recompute.add(dog_id)
+    recompute &= set(position)
+
+    rows = np.array(sorted(position[dog_id] for dog_id in recompute), dtype=np.int64)
+    indices, scores = top_neighbours(features, rows, count)
+    computed_at = timezone.now()
+    neighbours = [
+        DogNeighbour(dog_id=dog_ids[row], neighbour_id=dog_ids[index], rank=rank, score=float(score),
+                     computed_at=computed_at)
+        for row, row_indices, row_scores in zip(rows, indices, scores)
+        for rank, (index, score) in enumerate(zip(row_indices, row_scores), start=1)
+    ]
+    with transaction.atomic():
+        DogNeighbour.objects.exclude(dog_id__in=dog_ids).delete()
+        DogNeighbour.objects.filter(dog_id__in=recompute).delete()
+        DogNeighbour.objects.bulk_create(neighbours, batch_size=500)
+    return len(recompute)
@@ -1,8 +1,21 @@
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
 from django.core.mail import send_mail
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+
+from database.routers import bookkeeping_writes
+from dogs.models import Breed, Dog
+from dogs.trending import bump_dog, VIEW_WEIGHT
+from dogs.view_stats import record_view
+
+logger = logging.getLogger(__name__)
 
-from dogs.models import Breed
+_background_tasks = set()
 
 
 def get_breed_cache():
@@ -40,3 +53,44 @@ def send_views_mail(dog_object, owner_email, views_count):
         from_email=settings.EMAIL_HOST_USER,
         recipient_list=[owner_email, ]
     )
+
+
+def run_in_background(coroutine):
+    """
+    Запускает корутину в фоне, не задерживая ответ асинхронного представления.
+    Ссылка на задачу хранится до её завершения, ошибки записываются в лог.
+    Параметры:
+    coroutine: Корутина с побочным действием (счетчик просмотров, письмо).
+    """
+    task = asyncio.create_task(coroutine)
+    _background_tasks.add(task)
+    task.add_done_callback(_finish_background_task)
+
+
+def _finish_background_task(task):
+    """
+    Удаляет завершенную фоновую задачу и логирует её ошибку.
+    Параметры:
+    task (asyncio.Task): Завершенная задача.
+    """
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error('Ошибка фоновой задачи', exc_info=task.exception())
+
+
+async def acount_dog_view(dog_pk, dog_name, owner_email):
+    """
+    Асинхронно увеличивает количество просмотров собаки на 1.
+    Если количество просмотров кратно 20, отправляет уведомление владельцу.
+    Параметры:
+    dog_pk (int): Первичный ключ собаки.
+    dog_name (str): Кличка собаки.
+    owner_email (str | None): Электронная почта владельца собаки.
+    """
+    with bookkeeping_writes():
+        await Dog.objects.filter(pk=dog_pk).aupdate(views=F('views') + 1)
+        await sync_to_async(record_view)(dog_pk)
+    await sync_to_async(bump_dog)(dog_pk, VIEW_WEIGHT)
+    views = await Dog.objects.using(DEFAULT_DB_ALIAS).filter(pk=dog_pk).values_list('views', flat=True).afirst()
+    if owner_email and views and views % 20 == 0:
+        await sync_to_async(send_views_mail)(dog_name, owner_email, views)
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from config.storage import remember_replaced_file, pop_replaced_files, release_file
+from config.uploads import remember_new_upload, pop_new_uploads, schedule_normalization
+from dogs.models import Dog
+
+
+@receiver(pre_save, sender=Dog)
+def dog_photo_replacing(sender, instance, update_fields=None, **kwargs):
+    """
+    Запоминает новую загрузку фото и прежнее фото собаки, если оно заменяется или удаляется.
+    """
+    remember_new_upload(instance, 'photo')
+    remember_replaced_file(sender, instance, 'photo', update_fields)
+
+
+@receiver(post_save, sender=Dog)
+def dog_photo_replaced(sender, instance, **kwargs):
+    """
+    После фиксации транзакции удаляет прежнее фото собаки, если на него больше никто не ссылается,
+    и ставит новое фото в очередь нормализации.
+    """
+    for name in pop_replaced_files(instance):
+        transaction.on_commit(lambda name=name: release_file(name))
+    if pop_new_uploads(instance):
+        transaction.on_commit(lambda name=instance.photo.name: schedule_normalization(name))
+
+
+@receiver(post_delete, sender=Dog)
+def dog_photo_deleted(sender, instance, **kwargs):
+    """
+    После удаления собаки удаляет ее фото, если на него больше никто не ссылается.
+    """
+    if instance.photo:
+        transaction.on_commit(lambda name=instance.photo.name: release_file(name))
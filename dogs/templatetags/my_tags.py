@@ -16,3 +16,18 @@ def user_media(val):
     if val:
         return f'/media/{val}'
     return '/static/no_avatar.png'
+
+
+@register.simple_tag(takes_context=True)
+def can(context, action):
+    """
+    Проверяет, разрешено ли текущему пользователю действие.
+    Использование: {% can 'dog_delete' as can_delete %}.
+    Параметры:
+    context: Контекст шаблона с запросом request.
+    action (str): Действие из users.capabilities.ACTIONS.
+    Возвращает:
+    bool: True, если действие разрешено.
+    """
+    request = context.get('request')
+    return request is not None and action in request.capabilities
@@ -0,0 +1,234 @@
+import bisect
+import datetime
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from dogs.models import Dog, DogViewStat
+
+TRENDING_KEY = 'trending:dogs'
+TRENDING_EPOCH_KEY = 'trending:epoch'
+VIEW_WEIGHT = 1.0
+REVIEW_WEIGHT = 5.0
+# Сколько лишних собак запрашивается из рейтинга на случай, если часть из них отключена.
+INACTIVE_RESERVE = 10
+# Наибольший показатель степени очков события: 2 ** 1000 еще помещается в float.
+MAX_EXPONENT = 1000
+
+
+def get_epoch():
+    """
+    Возвращает точку отсчета рейтинга (время последней перестройки в секундах).
+    Возвращает:
+    float: Время в секундах.
+    """
+    epoch = cache.get(TRENDING_EPOCH_KEY)
+    if epoch is None:
+        epoch = time.time()
+        cache.add(TRENDING_EPOCH_KEY, epoch, None)
+        epoch = cache.get(TRENDING_EPOCH_KEY, epoch)
+    return epoch
+
+
+def decayed_weight(weight, timestamp, epoch):
+    """
+    Переводит вес события в очки рейтинга.
+    Вместо уменьшения всех очков со временем очки новых событий растут вдвое
+    каждые TRENDING_HALF_LIFE_HOURS часов, поэтому порядок собак совпадает с порядком
+    по затухающей сумме, а добавление события меняет очки только одной собаки.
+    Показатель степени ограничен MAX_EXPONENT, чтобы очки не переполнили float,
+    если рейтинг долго не перестраивался.
+    Параметры:
+    weight (float): Вес события.
+    timestamp (float): Время события в секундах.
+    epoch (float): Точка отсчета рейтинга.
+    Возвращает:
+    float: Очки события.
+    """
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 3600
+    exponent = min(max((timestamp - epoch) / half_life, -MAX_EXPONENT), MAX_EXPONENT)
+    return weight * math.pow(2, exponent)
+
+
+class LocalRanking:
+    """
+    Рейтинг в памяти процесса для работы без Redis.
+    Пары (-очки, id собаки) хранятся в отсортированном списке, поэтому первые N собак
+    читаются срезом списка. Каждый процесс строит рейтинг сам при первом обращении
+    и при смене точки отсчета (см. get_ranking).
+    Атрибуты:
+    epoch (float | None): Точка отсчета, по которой построен рейтинг (None - еще не построен).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.scores = {}
+        self.ordered = []
+        self.epoch = None
+
+    def incr(self, dog_id, amount):
+        with self.lock:
+            score = self.scores.get(dog_id)
+            if score is not None:
+                del self.ordered[bisect.bisect_left(self.ordered, (-score, dog_id))]
+            score = (score or 0) + amount
+            self.scores[dog_id] = score
+            bisect.insort(self.ordered, (-score, dog_id))
+
+    def top(self, count):
+        with self.lock:
+            return [(dog_id, -score) for score, dog_id in self.ordered[:count]]
+
+    def replace(self, scores, epoch=None):
+        with self.lock:
+            self.scores = dict(scores)
+            self.ordered = sorted((-score, dog_id) for dog_id, score in self.scores.items())
+            self.epoch = epoch
+
+
+class RedisRanking:
+    """
+    Рейтинг в отсортированном множестве Redis, общий для всех процессов.
+    ZINCRBY изменяет очки одной собаки за O(log M), ZREVRANGE читает первые N собак за O(log M + N).
+    """
+
+    def __init__(self, location):
+        import redis
+        self.client = redis.Redis.from_url(location)
+
+    def incr(self, dog_id, amount):
+        self.client.zincrby(TRENDING_KEY, amount, dog_id)
+
+    def top(self, count):
+        return [(int(dog_id), score) for dog_id, score in
+                self.client.zrevrange(TRENDING_KEY, 0, count - 1, withscores=True)]
+
+    def replace(self, scores, epoch=None):
+        # Новый рейтинг собирается под временным ключом и подменяет старый атомарно.
+        temporary_key = f'{TRENDING_KEY}:rebuild'
+        pipeline = self.client.pipeline()
+        pipeline.delete(temporary_key)
+        if scores:
+            pipeline.zadd(temporary_key, {str(dog_id): score for dog_id, score in scores.items()})
+            pipeline.rename(temporary_key, TRENDING_KEY)
+        else:
+            pipeline.delete(TRENDING_KEY)
+        pipeline.execute()
+
+
+_ranking = None
+_rebuild_lock = threading.Lock()
+
+
+def get_storage():
+    """
+    Возвращает хранилище рейтинга: Redis, если кэш хранится в Redis, иначе рейтинг в памяти процесса.
+    Возвращает:
+    LocalRanking | RedisRanking: Хранилище рейтинга.
+    """
+    global _ranking
+    if _ranking is None:
+        default_cache = settings.CACHES['default']
+        if default_cache['BACKEND'] == 'django.core.cache.backends.redis.RedisCache':
+            _ranking = RedisRanking(default_cache['LOCATION'])
+        else:
+            _ranking = LocalRanking()
+    return _ranking
+
+
+def get_ranking():
+    """
+    Возвращает хранилище рейтинга, готовое к работе.
+    Рейтинг в памяти процесса пуст после запуска процесса, а rebuild_trending перестраивает
+    только рейтинг процесса команды, поэтому процесс сам строит свой рейтинг по сохраненным
+    счетчикам, если еще не строил его или точка отсчета в кэше изменилась.
+    Возвращает:
+    LocalRanking | RedisRanking: Хранилище рейтинга.
+    """
+    ranking = get_storage()
+    if isinstance(ranking, LocalRanking):
+        epoch = get_epoch()
+        if ranking.epoch != epoch:
+            with _rebuild_lock:
+                if ranking.epoch != epoch:
+                    ranking.replace(compute_scores(epoch), epoch)
+    return ranking
+
+
+def bump_dog(dog_id, weight):
+    """
+    Добавляет собаке очки за просмотр или отзыв.
+    Параметры:
+    dog_id (int): Первичный ключ собаки.
+    weight (float): Вес события (VIEW_WEIGHT, REVIEW_WEIGHT).
+    """
+    get_ranking().incr(dog_id, decayed_weight(weight, time.time(), get_epoch()))
+
+
+def get_trending_dogs(count):
+    """
+    Возвращает самых популярных активных собак.
+    Параметры:
+    count (int): Количество собак.
+    Возвращает:
+    list: Собаки (с породой) в порядке убывания популярности.
+    """
+    dog_ids = [dog_id for dog_id, _ in get_ranking().top(count + INACTIVE_RESERVE)]
+    dogs = Dog.objects.filter(pk__in=dog_ids, is_active=True).select_related('breed').in_bulk()
+    return [dogs[dog_id] for dog_id in dog_ids if dog_id in dogs][:count]
+
+
+def compute_scores(epoch, days=None):
+    """
+    Считает очки собак по сохраненным счетчикам: дневной статистике просмотров
+    (DogViewStat) и активным отзывам за последние days дней.
+    Параметры:
+    epoch (float): Точка отсчета рейтинга.
+    days (int): Глубина пересчета в днях (по умолчанию TRENDING_WINDOW_DAYS).
+    Возвращает:
+    dict: id собаки -> очки.
+    """
+    from reviews.models import Review
+
+    if days is None:
+        days = settings.TRENDING_WINDOW_DAYS
+    since = timezone.localdate() - datetime.timedelta(days=days)
+    scores = defaultdict(float)
+    views = DogViewStat.objects.filter(period=DogViewStat.DAY, day__gte=since, dog__is_active=True)
+    for dog_id, day, count in views.values_list('dog_id', 'day', 'count'):
+        # Просмотры дня считаются в его середине.
+        moment = datetime.datetime.combine(day, datetime.time(12), tzinfo=timezone.get_current_timezone())
+        scores[dog_id] += decayed_weight(VIEW_WEIGHT * count, min(moment.timestamp(), epoch), epoch)
+    reviews = (
+        Review.objects.filter(sign_of_review=True, created__date__gte=since, dog__is_active=True)
+        .values('dog_id', 'created__date').annotate(count=Count('pk')).values_list('dog_id', 'created__date', 'count')
+        .order_by()
+    )
+    for dog_id, day, count in reviews:
+        moment = datetime.datetime.combine(day, datetime.time(12), tzinfo=timezone.get_current_timezone())
+        scores[dog_id] += decayed_weight(REVIEW_WEIGHT * count, min(moment.timestamp(), epoch), epoch)
+    return scores
+
+
+def rebuild_trending(days=None):
+    """
+    Перестраивает рейтинг по сохраненным счетчикам (см. compute_scores).
+    Точка отсчета сдвигается на текущее время, чтобы очки не росли неограниченно;
+    рейтинги в памяти других процессов перестраиваются при следующем обращении,
+    если точка отсчета хранится в общем кэше.
+    Параметры:
+    days (int): Глубина пересчета в днях (по умолчанию TRENDING_WINDOW_DAYS).
+    Возвращает:
+    int: Количество собак в рейтинге.
+    """
+    epoch = timezone.now().timestamp()
+    scores = compute_scores(epoch, days)
+    cache.set(TRENDING_EPOCH_KEY, epoch, None)
+    get_storage().replace(scores, epoch)
+    return len(scores)
@@ -1,12 +1,17 @@
+from django.conf import settings
 from django.urls import path
 from dogs.views import (IndexView, BreedsListView, DogBreedListView, DogListView, DogCreateView, DogDetailView,
                         DogUpdateView, DogDeleteView, DogDeactivatedListView, dog_toggle_activity, DogSearchListView,
-                        DogBreedSearchListView)
+                        DogBreedSearchListView, BreedsListAsyncView, DogListAsyncView, DogDetailAsyncView,
+                        dog_view_stats, PopularDogListView, DogFacetListView)
 from dogs.apps import DogsConfig
 from django.views.decorators.cache import cache_page, never_cache
 
 app_name = DogsConfig.name
 
+if settings.ASYNC_VIEWS:
+    BreedsListView, DogListView, DogDetailView = BreedsListAsyncView, DogListAsyncView, DogDetailAsyncView
+
 urlpatterns = [
     path('', cache_page(60)(IndexView.as_view()), name='index'),
     path('breeds/', cache_page(60)(BreedsListView.as_view()), name='breeds'),
@@ -14,11 +19,14 @@ urlpatterns = [
     path('breeds/search', DogBreedSearchListView.as_view(), name='breeds_search'),
 
     path('dogs/', DogListView.as_view(), name='dogs_list'),
+    path('dogs/browse/', DogFacetListView.as_view(), name='dogs_browse'),
+    path('dogs/popular/', PopularDogListView.as_view(), name='dogs_popular'),
     path('dogs/deactivate/', DogDeactivatedListView.as_view(), name='dogs_deactivated_list'),
     path('dogs/search/', DogSearchListView.as_view(), name='dogs_search'),
     path('dogs/create/', DogCreateView.as_view(), name='dog_create'),
     path('dogs/detail/<int:pk>/', DogDetailView.as_view(), name='dog_detail'),
     path('dogs/update/<int:pk>/', never_cache(DogUpdateView.as_view()), name='dog_update'),
     path('dogs/toggle/<int:pk>/', dog_toggle_activity, name='dog_toggle_activity'),
+    path('dogs/detail/<int:pk>/views/', dog_view_stats, name='dog_view_stats'),
     path('dogs/delete/<int:pk>/', DogDeleteView.as_view(), name='dog_delete'),
 ]
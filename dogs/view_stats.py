@@ -0,0 +1,177 @@
+import atexit
+import datetime
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from dogs.models import DogViewStat
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def record_view(dog_id):
+    """
+    Засчитывает просмотр собаки за текущий день в памяти процесса.
+    Накопленные просмотры записываются в базу данных пачкой, когда их набирается
+    VIEW_STATS_FLUSH_SIZE или с последней записи прошло VIEW_STATS_FLUSH_SECONDS секунд.
+    Параметры:
+    dog_id (int): Первичный ключ собаки.
+    """
+    global _last_flush
+    key = (dog_id, timezone.localdate())
+    with _lock:
+        _pending[key] += 1
+        due = (sum(_pending.values()) >= settings.VIEW_STATS_FLUSH_SIZE
+               or time.monotonic() - _last_flush >= settings.VIEW_STATS_FLUSH_SECONDS)
+    if due:
+        flush_views()
+
+
+def get_pending_views(dog_id):
+    """
+    Возвращает просмотры собаки, еще не записанные в базу данных этим процессом.
+    Параметры:
+    dog_id (int): Первичный ключ собаки.
+    Возвращает:
+    dict: День -> количество просмотров.
+    """
+    with _lock:
+        return {day: count for (pending_dog_id, day), count in _pending.items() if pending_dog_id == dog_id}
+
+
+def flush_views():
+    """
+    Записывает накопленные просмотры в базу данных.
+    Если запись не удалась, просмотры возвращаются в накопитель до следующей попытки,
+    а ошибка записывается в журнал: запись вызывается из обработки запроса просмотра собаки,
+    и ошибка статистики не должна прерывать ответ.
+    Возвращает:
+    int: Количество записанных просмотров (0, если запись не удалась).
+    """
+    global _last_flush
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+    try:
+        add_view_counts(DogViewStat.DAY, pending)
+    except Exception:
+        with _lock:
+            _pending.update(pending)
+        logger.exception('Не удалось записать просмотры собак (%s), повтор при следующей записи',
+                         sum(pending.values()))
+        return 0
+    return sum(pending.values())
+
+
+def add_view_counts(period, counts):
+    """
+    Прибавляет просмотры к записям статистики.
+    Недостающие записи создаются одним bulk_create(), затем все счетчики одного дня
+    увеличиваются одним запросом UPDATE с F()-выражением, поэтому параллельные записи
+    из разных процессов не теряют просмотры.
+    Параметры:
+    period (str): DogViewStat.DAY или DogViewStat.MONTH.
+    counts (dict): (id собаки, день) -> количество просмотров.
+    """
+    by_day = {}
+    for (dog_id, day), count in counts.items():
+        if count:
+            by_day.setdefault(day, {})[dog_id] = count
+    with transaction.atomic():
+        for day, dog_counts in by_day.items():
+            rows = DogViewStat.objects.filter(period=period, day=day, dog_id__in=dog_counts)
+            existing = set(rows.values_list('dog_id', flat=True))
+            missing = [DogViewStat(dog_id=dog_id, period=period, day=day)
+                       for dog_id in dog_counts if dog_id not in existing]
+            if missing:
+                try:
+                    with transaction.atomic():
+                        DogViewStat.objects.bulk_create(missing)
+                except IntegrityError:
+                    # Запись создана параллельно - создаем только оставшиеся.
+                    existing = set(rows.values_list('dog_id', flat=True))
+                    DogViewStat.objects.bulk_create([stat for stat in missing if stat.dog_id not in existing])
+            rows.update(count=F('count') + Case(
+                *(When(dog_id=dog_id, then=Value(count)) for dog_id, count in dog_counts.items()),
+                default=Value(0),
+            ))
+
+
+def get_view_series(dog_id, days=30, months=12):
+    """
+    Возвращает просмотры собаки по дням и месяцам для графика.
+    Учитываются и просмотры, еще не записанные в базу данных этим процессом.
+    Параметры:
+    dog_id (int): Первичный ключ собаки.
+    days (int): Количество последних дней.
+    months (int): Количество последних месяцев.
+    Возвращает:
+    dict: {'days': [(день, просмотры), ...], 'months': [(первый день месяца, просмотры), ...]}.
+    """
+    today = timezone.localdate()
+    first_day = today - datetime.timedelta(days=days - 1)
+    first_month = today.replace(day=1)
+    for _ in range(months - 1):
+        first_month = (first_month - datetime.timedelta(days=1)).replace(day=1)
+
+    daily = Counter()
+    monthly = Counter()
+    rows = DogViewStat.objects.filter(dog_id=dog_id, day__gte=min(first_day, first_month))
+    for period, day, count in rows.values_list('period', 'day', 'count'):
+        if period == DogViewStat.DAY:
+            daily[day] += count
+        monthly[day.replace(day=1)] += count
+    for day, count in get_pending_views(dog_id).items():
+        daily[day] += count
+        monthly[day.replace(day=1)] += count
+
+    series_days = [first_day + datetime.timedelta(days=offset) for offset in range(days)]
+    series_months = [first_month]
+    while len(series_months) < months:
+        last = series_months[-1]
+        series_months.append((last + datetime.timedelta(days=32)).replace(day=1))
+    return {
+        'days': [(day, daily[day]) for day in series_days],
+        'months': [(month, monthly[month]) for month in series_months],
+    }
+
+
+def compact_view_stats(retention_days=None):
+    """
+    Сворачивает дневные записи старше срока хранения в месячные.
+    Сворачиваются только месяцы, целиком вышедшие за срок хранения.
+    Параметры:
+    retention_days (int): Срок хранения дневных записей (по умолчанию VIEW_STATS_RETENTION_DAYS).
+    Возвращает:
+    tuple: Количество удаленных дневных записей и затронутых месячных записей.
+    """
+    if retention_days is None:
+        retention_days = settings.VIEW_STATS_RETENTION_DAYS
+    cutoff = (timezone.localdate() - datetime.timedelta(days=retention_days)).replace(day=1)
+    old_days = DogViewStat.objects.filter(period=DogViewStat.DAY, day__lt=cutoff)
+    with transaction.atomic():
+        totals = (
+            old_days.annotate(month=TruncMonth('day')).values('dog_id', 'month')
+            .annotate(total=Sum('count')).values_list('dog_id', 'month', 'total').order_by()
+        )
+        counts = {(dog_id, month): total for dog_id, month, total in totals}
+        add_view_counts(DogViewStat.MONTH, counts)
+        deleted, _ = old_days.delete()
+    return deleted, len(counts)
+
+
+atexit.register(flush_views)
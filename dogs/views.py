@@ -1,15 +1,22 @@
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
-from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.decorators import login_required
 from django.forms import inlineformset_factory
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
+from django.db.models import Max, OuterRef, Q, Subquery
 
-from dogs.models import Breed, Dog, DogParent
+from database.routers import bookkeeping_writes, mark_user_write
+from dogs.models import Breed, Dog, DogParent, DogNeighbour
+from dogs.facets import DogFacets
 from dogs.forms import DogForm, DogParentForm, DogAdminForm
-from dogs.services import send_views_mail
-from users.models import UserRoles
+from dogs.services import send_views_mail, run_in_background, acount_dog_view
+from dogs.trending import bump_dog, get_trending_dogs, VIEW_WEIGHT
+from dogs.view_stats import record_view, get_view_series
+from users.capabilities import CapabilityRequiredMixin
+from users.mixins import ConditionalResponseMixin, AsyncViewMixin, AsyncListMixin, FragmentListMixin
 
 
 class IndexView(LoginRequiredMixin, ListView):
@@ -24,6 +31,7 @@ class IndexView(LoginRequiredMixin, ListView):
     }
 
     paginate_by = 3
+    popular_count = 3
 
     def get_queryset(self):
         """
@@ -33,6 +41,14 @@ class IndexView(LoginRequiredMixin, ListView):
         """
         return Breed.objects.all()
 
+    def get_context_data(self, *, object_list=None, **kwargs):
+        """
+        Добавляет в контекст самых популярных собак.
+        """
+        context_data = super().get_context_data(object_list=object_list, **kwargs)
+        context_data['popular_dogs'] = get_trending_dogs(self.popular_count)
+        return context_data
+
 
 class BreedsListView(LoginRequiredMixin, ListView):
     """
@@ -95,7 +111,7 @@ class DogBreedListView(LoginRequiredMixin, ListView):
         return queryset
 
 
-class DogListView(ListView):
+class DogListView(FragmentListMixin, ListView):
     """
     Представление списка всех активных собак.
     Отображает только активных собак с пагинацией.
@@ -105,7 +121,9 @@ class DogListView(ListView):
         'title': 'Питомник - Все наши собаки',
     }
     template_name = 'dogs/dogs.html'
+    fragment_template_name = 'dogs/dogs_fragment.html'
     paginate_by = 3
+    ordering = ('pk',)
 
     def get_queryset(self):
         """
@@ -114,14 +132,88 @@ class DogListView(ListView):
         QuerySet: Активные собаки.
         """
         queryset = super().get_queryset()
-        queryset = queryset.filter(is_active=True)
+        queryset = queryset.filter(is_active=True).select_related('breed', 'owner')
         return queryset
 
 
+class PopularDogListView(ListView):
+    """
+    Представление списка популярных собак.
+    Собаки упорядочены по затухающей сумме просмотров и отзывов (см. dogs.trending);
+    рейтинг читается из отсортированного хранилища без сортировки таблицы собак.
+    """
+    extra_context = {
+        'title': 'Питомник - Популярные собаки',
+    }
+    template_name = 'dogs/dogs.html'
+    popular_count = 30
+
+    def get_queryset(self):
+        """
+        Возвращает популярных активных собак.
+        Возвращает:
+        list: Собаки в порядке убывания популярности.
+        """
+        return get_trending_dogs(self.popular_count)
+
+
+class DogFacetListView(ListView):
+    """
+    Представление фасетного поиска собак по породе, возрасту, активности, наличию хозяина и фото
+    с сортировкой по кличке, просмотрам или возрасту.
+    Количества для всех фасетов считаются одним запросом (см. DogFacets), общее количество
+    из того же запроса используется пагинатором вместо отдельного COUNT.
+    Неактивных чужих собак видят только пользователи с возможностью dog_view_inactive_all.
+    """
+    model = Dog
+    extra_context = {
+        'title': 'Питомник - Подбор собаки',
+    }
+    template_name = 'dogs/browse.html'
+    paginate_by = 6
+
+    def get_facets(self):
+        """
+        Возвращает фасеты для собак, доступных пользователю.
+        Возвращает:
+        DogFacets: Фасеты с выбранными значениями из параметров запроса.
+        """
+        queryset = Dog.objects.all()
+        if 'dog_view_inactive_all' not in self.request.capabilities:
+            visible = Q(is_active=True)
+            if self.request.user.is_authenticated:
+                visible |= Q(owner_id=self.request.user.pk)
+            queryset = queryset.filter(visible)
+        return DogFacets(queryset, self.request.GET)
+
+    def get_queryset(self):
+        """
+        Возвращает собак по выбранным фасетам и считает количества фасетов.
+        Возвращает:
+        QuerySet: Собаки с породой.
+        """
+        self.facets = self.get_facets()
+        self.facet_context = self.facets.get_context()
+        return self.facets.get_queryset()
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, orphans, allow_empty_first_page, **kwargs)
+        paginator.count = self.facet_context['total']
+        return paginator
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        """
+        Добавляет в контекст фасеты, варианты сортировки и параметры для пагинации.
+        """
+        context_data = super().get_context_data(object_list=object_list, **kwargs)
+        context_data.update(self.facet_context)
+        return context_data
+
+
 class DogDeactivatedListView(LoginRequiredMixin, ListView):
     """
     Представление списка неактивных собак.
-    Отображает неактивных собак в зависимости от роли пользователя.
+    Модераторы и администраторы видят всех неактивных собак, остальные - только своих.
     """
     model = Dog
     extra_context = {
@@ -131,15 +223,13 @@ class DogDeactivatedListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         """
-        Возвращает неактивных собак в зависимости от роли пользователя.
+        Возвращает неактивных собак в зависимости от возможностей пользователя.
         Возвращает:
         QuerySet: Неактивные собаки.
         """
-        queryset = super().get_queryset()
-        if self.request.user.role in [UserRoles.MODERATOR, UserRoles.ADMIN]:
-            queryset = queryset.filter(is_active=False)
-        if self.request.user.role == UserRoles.USER:
-            queryset = queryset.filter(is_active=False, owner=self.request.user)
+        queryset = super().get_queryset().filter(is_active=False)
+        if 'dog_view_inactive_all' not in self.request.capabilities:
+            queryset = queryset.filter(owner=self.request.user)
         return queryset
 
 
@@ -168,13 +258,14 @@ class DogSearchListView(LoginRequiredMixin, ListView):
         return object_list
 
 
-class DogCreateView(LoginRequiredMixin, CreateView):
+class DogCreateView(CapabilityRequiredMixin, CreateView):
     """
     Представление для создания новой собаки.
     Отображает форму для добавления новой собаки и сохраняет её в базе данных.
-    Доступно только для пользователей с ролью USER.
+    Доступно только пользователям с возможностью dog_create.
     """
     model = Dog
+    capability_required = 'dog_create'
     form_class = DogForm
     template_name = 'dogs/create_update.html'
     extra_context = {
@@ -187,28 +278,87 @@ class DogCreateView(LoginRequiredMixin, CreateView):
         """
         Обрабатывает валидную форму.
         Устанавливает владельца собаки и сохраняет объект.
-        Если пользователь не имеет права добавлять собаку, выбрасывает PermissionDenied.
         Параметры:
         form (DogForm): Валидная форма.
         Возвращает:
         HttpResponseRedirect: Перенаправление на страницу списка собак.
         """
-        if self.request.user.role != UserRoles.USER:
-            raise PermissionDenied()
-        self.object = form.save()
-        self.object.owner = self.request.user
-        self.object.save()
+        form.instance.owner = self.request.user
         return super().form_valid(form)
 
 
-class DogDetailView(DetailView):
+class DogDetailView(ConditionalResponseMixin, DetailView):
     """
     Представление для отображения подробной информации о собаке.
     Отображает информацию о выбранной собаке и увеличивает количество просмотров.
     Если количество просмотров кратно 20, отправляет уведомление владельцу.
+    Отвечает 304 Not Modified, если собака, её порода, хозяин и список похожих собак не менялись.
     """
     model = Dog
     template_name = 'dogs/detail.html'
+    conditional_fields = ('updated_at', 'breed__updated_at', 'owner__updated_at', 'neighbours_computed_at')
+    conditional_extra_fields = ('name', 'owner_id', 'owner__email')
+
+    def get_conditional_annotations(self):
+        """
+        Добавляет к датам изменения дату последнего расчета похожих собак (см. dogs.neighbours).
+        Возвращает:
+        dict: Имя -> подзапрос.
+        """
+        computed_at = (DogNeighbour.objects.filter(dog_id=OuterRef('pk')).values('dog_id')
+                       .annotate(last=Max('computed_at')).values('last'))
+        return {'neighbours_computed_at': Subquery(computed_at)}
+
+    def get_queryset(self):
+        """
+        Возвращает собак вместе с породой и хозяином.
+        Возвращает:
+        QuerySet: Собаки.
+        """
+        return super().get_queryset().select_related('breed', 'owner')
+
+    def is_view_counted(self, owner_id):
+        """
+        Проверяет, нужно ли засчитывать просмотр (хозяин собаки просмотры не накручивает).
+        Параметры:
+        owner_id (int | None): Первичный ключ хозяина собаки.
+        Возвращает:
+        bool: True, если просмотр нужно засчитать.
+        """
+        return owner_id is None or owner_id != self.request.user.pk
+
+    def count_view(self, dog):
+        """
+        Засчитывает просмотр собаки, если её смотрит не хозяин.
+        Если количество просмотров кратно 20, отправляет уведомление владельцу.
+        Параметры:
+        dog (Dog): Просматриваемая собака.
+        """
+        if not self.is_view_counted(dog.owner_id):
+            return
+        with bookkeeping_writes():
+            dog.views_count()
+            record_view(dog.pk)
+        bump_dog(dog.pk, VIEW_WEIGHT)
+        if dog.owner_id and dog.views % 20 == 0:
+            send_views_mail(dog.name, dog.owner.email, dog.views)
+
+    def get_similar_dogs(self):
+        """
+        Возвращает похожих активных собак, рассчитанных заранее (см. dogs.neighbours).
+        Возвращает:
+        QuerySet: Записи DogNeighbour с похожей собакой и её породой.
+        """
+        return (DogNeighbour.objects.filter(dog_id=self.object.pk, neighbour__is_active=True)
+                .select_related('neighbour__breed').order_by('rank'))
+
+    def not_modified(self, row):
+        """
+        Засчитывает просмотр, когда страница отдается из кэша браузера.
+        Параметры:
+        row (dict): Значения полей собаки.
+        """
+        self.count_view(Dog(pk=row['pk'], name=row['name'], owner_id=row['owner_id']))
 
     def get_context_data(self, **kwargs):
         """
@@ -217,25 +367,20 @@ class DogDetailView(DetailView):
         **kwargs: Дополнительные параметры.
         """
         context_data = super().get_context_data(**kwargs)
-        object_ = self.get_object()
-        context_data['title'] = f'Подробная информация о {object_}'
-        dog_object_increase = get_object_or_404(Dog, pk=object_.pk)
-        if object_.owner != self.request.user:
-            dog_object_increase.views_count()
-        if object_.owner:
-            object_owner_email = object_.owner.email
-            if dog_object_increase.views % 20 == 0 and dog_object_increase.views != 0:
-                send_views_mail(dog_object_increase.name, object_owner_email, dog_object_increase.views)
+        context_data['title'] = f'Подробная информация о {self.object}'
+        context_data['similar_dogs'] = list(self.get_similar_dogs())
+        self.count_view(self.object)
         return context_data
 
 
 class DogUpdateView(LoginRequiredMixin, UpdateView):
     """
     Представление для редактирования информации о собаке.
-    Позволяет владельцу или администратору изменять информацию о собаке.
+    Позволяет владельцу или пользователю с возможностью dog_update_any изменять информацию о собаке.
     """
     model = Dog
     template_name = 'dogs/create_update.html'
+    read_from_primary = True
     extra_context = {
         'title': 'Изменить информацию о собаке',
         'message': 'Пожалуйста, заполните форму ниже, чтобы добавить новую информацию о собаке.'
@@ -250,7 +395,7 @@ class DogUpdateView(LoginRequiredMixin, UpdateView):
     def get_object(self, queryset=None):
         """
         Получает объект собаки для редактирования.
-        Проверяет, является ли текущий пользователь владельцем собаки или администратором.
+        Проверяет, является ли текущий пользователь владельцем собаки или может изменять чужих собак.
         Если нет, выбрасывает PermissionDenied.
         Параметры:
         queryset (QuerySet): Опциональный набор объектов.
@@ -258,25 +403,19 @@ class DogUpdateView(LoginRequiredMixin, UpdateView):
         Объект собаки.
         """
         self.object = super().get_object(queryset)
-        # if self.object.owner != self.request.user and not self.request.user.is_staff:
-        if self.object.owner != self.request.user and self.request.user.role != UserRoles.ADMIN:
+        if self.object.owner_id != self.request.user.pk and 'dog_update_any' not in self.request.capabilities:
             raise PermissionDenied()
         return self.object
 
     def get_form_class(self):
         """
-        Возвращает класс формы в зависимости от роли пользователя.
+        Возвращает класс формы: со сменой хозяина для пользователей с возможностью dog_change_owner.
         Возвращает:
         Класс формы для редактирования собаки.
         """
-        dog_forms = {
-            'admin': DogAdminForm,
-            'moderator': DogForm,
-            'user': DogForm,
-        }
-        user_role = self.request.user.role
-        dog_form_class = dog_forms[user_role]
-        return dog_form_class
+        if 'dog_change_owner' in self.request.capabilities:
+            return DogAdminForm
+        return DogForm
 
     def get_context_data(self, **kwargs):
         """
@@ -309,10 +448,10 @@ class DogUpdateView(LoginRequiredMixin, UpdateView):
         return super().form_valid(form)
 
 
-class DogDeleteView(PermissionRequiredMixin, DeleteView):
+class DogDeleteView(LoginRequiredMixin, DeleteView):
     """
     Представление для удаления собаки.
-    Позволяет пользователю с необходимыми правами удалить собаку из базы данных.
+    Позволяет владельцу или пользователю с возможностью dog_delete удалить собаку из базы данных.
     """
     model = Dog
     template_name = 'dogs/delete.html'
@@ -320,14 +459,28 @@ class DogDeleteView(PermissionRequiredMixin, DeleteView):
         'title': 'Удалить собаку'
     }
     success_url = reverse_lazy('dogs:dogs_list')
-    permission_required = 'dogs.delete_dog'
-    permission_denied_message = "У вас нет нужных прав для этого действия"
 
+    def get_object(self, queryset=None):
+        """
+        Получает объект собаки для удаления.
+        Если пользователь не владелец и не может удалять чужих собак, выбрасывает PermissionDenied.
+        Параметры:
+        queryset (QuerySet): Опциональный набор объектов.
+        Возвращает:
+        Объект собаки.
+        """
+        dog = super().get_object(queryset)
+        if dog.owner_id != self.request.user.pk and 'dog_delete' not in self.request.capabilities:
+            raise PermissionDenied("У вас нет нужных прав для этого действия")
+        return dog
 
+
+@login_required
 def dog_toggle_activity(request, pk):
     """
     Переключает активность собаки.
     Если собака активна, делает её неактивной, и наоборот.
+    Доступно владельцу и пользователям с возможностью dog_toggle_any.
     Перенаправляет на страницу списка собак после изменения.
     Параметры:
     request : Запрос от клиента.
@@ -336,9 +489,85 @@ def dog_toggle_activity(request, pk):
     Перенаправление на страницу списка собак.
     """
     dog_item = get_object_or_404(Dog, pk=pk)
+    if dog_item.owner_id != request.user.pk and 'dog_toggle_any' not in request.capabilities:
+        raise PermissionDenied()
     if dog_item.is_active:
         dog_item.is_active = False
     else:
         dog_item.is_active = True
     dog_item.save()
+    mark_user_write()
     return redirect((reverse('dogs:dogs_list')))
+
+
+@login_required
+def dog_view_stats(request, pk):
+    """
+    Возвращает просмотры собаки по дням и месяцам для графика на странице собаки.
+    Доступно владельцу и пользователям с возможностью dog_update_any.
+    Параметры:
+    request : Запрос от клиента.
+    pk : Первичный ключ собаки.
+    Возвращает:
+    JsonResponse: {'days': [[дата, просмотры], ...], 'months': [[дата, просмотры], ...]}.
+    """
+    owner_id = get_object_or_404(Dog.objects.values_list('owner_id', flat=True), pk=pk)
+    if owner_id != request.user.pk and 'dog_update_any' not in request.capabilities:
+        raise PermissionDenied()
+    response = JsonResponse(get_view_series(pk))
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+class BreedsListAsyncView(AsyncListMixin, BreedsListView):
+    """
+    Асинхронная версия BreedsListView для запуска под ASGI.
+    """
+    pass
+
+
+class DogListAsyncView(AsyncListMixin, DogListView):
+    """
+    Асинхронная версия DogListView для запуска под ASGI.
+    """
+    pass
+
+
+class DogDetailAsyncView(AsyncViewMixin, DogDetailView):
+    """
+    Асинхронная версия DogDetailView для запуска под ASGI.
+    Собака загружается через асинхронный ORM, а подсчет просмотров
+    и отправка письма выполняются в фоне и не задерживают ответ.
+    """
+
+    def get_context_data(self, **kwargs):
+        """
+        Добавляет заголовок страницы и загруженных заранее похожих собак в контекст
+        без синхронного подсчета просмотров.
+        Параметры:
+        **kwargs: Дополнительные параметры.
+        """
+        context_data = super(DogDetailView, self).get_context_data(**kwargs)
+        context_data['title'] = f'Подробная информация о {self.object}'
+        context_data['similar_dogs'] = self.similar_dogs
+        return context_data
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Асинхронно обрабатывает GET-запрос к странице собаки.
+        Возвращает:
+        HttpResponse: 304 Not Modified или страница собаки.
+        """
+        row = await self.get_conditional_queryset().afirst()
+        if row is None:
+            raise Http404('Собака не найдена')
+        if self.is_view_counted(row['owner_id']):
+            run_in_background(acount_dog_view(row['pk'], row['name'], row['owner__email']))
+        response, etag, last_modified_timestamp = self.get_not_modified_response(row)
+        if response is not None:
+            return response
+        self.object = await self.get_queryset().aget(pk=row['pk'])
+        self.similar_dogs = [neighbour async for neighbour in self.get_similar_dogs()]
+        response = self.render_to_response(self.get_context_data(object=self.object))
+        self.set_validators(response, etag, last_modified_timestamp)
+        return response
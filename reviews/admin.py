@@ -1,17 +1,24 @@
 from django.contrib import admin
 
 from reviews.models import Review
+from users.admin_utils import AutocompleteFilter, LargeTableAdminMixin
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Админский интерфейс для модели отзывов (Review).
     Атрибуты:
     list_display: Поля, отображаемые в списке отзывов.
+    list_select_related: Собака (с породой для подписи) и автор загружаются вместе со списком.
     ordering: Порядок сортировки отзывов (по дате создания).
-    list_filter: Поля для фильтрации отзывов в админке.
+    list_filter: Поля для фильтрации отзывов в админке; собака и автор выбираются поиском.
+    search_fields: Поиск по началу заголовка (индекс review_title_idx).
+    autocomplete_fields: Внешние ключи, выбираемые поиском.
     """
     list_display = ('title', 'dog', 'author', 'created', 'sign_of_review',)
+    list_select_related = ('dog__breed', 'author')
     ordering = ('created',)
-    list_filter = ('dog', 'author',)
+    list_filter = (('dog', AutocompleteFilter), ('author', AutocompleteFilter), 'sign_of_review', 'rejected')
+    search_fields = ('^title',)
+    autocomplete_fields = ('dog', 'author')
@@ -0,0 +1,129 @@
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Value, When
+from django.utils import timezone
+
+from dogs.models import Dog
+from dogs.trending import bump_dog, REVIEW_WEIGHT
+from reviews.models import Review
+
+
+def apply_review_deltas(deltas, last_reviewed_at=None):
+    """
+    Изменяет счетчики отзывов собак одним запросом UPDATE с F()-выражениями.
+    Вместе со счетчиками обновляется дата изменения собаки, так как они выводятся на её странице.
+    Новые активные отзывы добавляют собаке очки в рейтинге популярных собак.
+    Параметры:
+    deltas (dict): id собаки -> (изменение числа отзывов, изменение числа активных отзывов).
+    last_reviewed_at (dict): id собаки -> дата нового последнего отзыва.
+    """
+    deltas = {dog_id: delta for dog_id, delta in deltas.items() if any(delta)}
+    last_reviewed_at = last_reviewed_at or {}
+    dog_ids = set(deltas) | set(last_reviewed_at)
+    if not dog_ids:
+        return
+
+    def case(values, default):
+        return Case(*(When(pk=dog_id, then=Value(value)) for dog_id, value in values.items()), default=default)
+
+    changes = {'updated_at': timezone.now()}
+    if deltas:
+        changes['review_count'] = F('review_count') + case({k: v[0] for k, v in deltas.items()}, Value(0))
+        changes['active_review_count'] = F('active_review_count') + case(
+            {k: v[1] for k, v in deltas.items()}, Value(0),
+        )
+    if last_reviewed_at:
+        changes['last_reviewed_at'] = case(last_reviewed_at, F('last_reviewed_at'))
+    Dog.objects.filter(pk__in=dog_ids).update(**changes)
+    for dog_id, (_, active_delta) in deltas.items():
+        if active_delta > 0:
+            bump_dog(dog_id, REVIEW_WEIGHT * active_delta)
+
+
+def refresh_last_reviewed_at(dog_ids):
+    """
+    Пересчитывает дату последнего отзыва собак (после удаления отзывов) одним запросом.
+    Параметры:
+    dog_ids (iterable): id собак.
+    """
+    latest = Review.objects.filter(dog_id=OuterRef('pk')).order_by('-created').values('created')[:1]
+    Dog.objects.filter(pk__in=set(dog_ids)).update(last_reviewed_at=Subquery(latest))
+
+
+def count_reviews(reviews):
+    """
+    Группирует отзывы по собакам.
+    Параметры:
+    reviews (iterable): Отзывы.
+    Возвращает:
+    tuple: id собаки -> (число отзывов, число активных отзывов) и id собаки -> дата последнего отзыва.
+    """
+    deltas = {}
+    latest = {}
+    for review in reviews:
+        total, active = deltas.get(review.dog_id, (0, 0))
+        deltas[review.dog_id] = (total + 1, active + int(review.sign_of_review))
+        if review.created and (review.dog_id not in latest or review.created > latest[review.dog_id]):
+            latest[review.dog_id] = review.created
+    return deltas, latest
+
+
+def repair_counters(batch_size=500):
+    """
+    Пересчитывает счетчики всех собак одним запросом GROUP BY по отзывам
+    и записывает только изменившиеся значения.
+    Параметры:
+    batch_size (int): Размер пачки для bulk_update().
+    Возвращает:
+    int: Количество исправленных собак.
+    """
+    stats = {
+        row['dog_id']: (row['total'], row['active'], row['last'])
+        for row in Review.objects.values('dog_id').annotate(
+            total=Count('pk'), active=Count('pk', filter=Q(sign_of_review=True)), last=Max('created'),
+        ).order_by()
+    }
+    changed = []
+    with transaction.atomic():
+        for dog in Dog.objects.only('pk', *Dog.REVIEW_COUNTER_FIELDS).select_for_update():
+            values = stats.get(dog.pk, (0, 0, None))
+            if (dog.review_count, dog.active_review_count, dog.last_reviewed_at) != values:
+                dog.review_count, dog.active_review_count, dog.last_reviewed_at = values
+                changed.append(dog)
+        Dog.objects.bulk_update(changed, Dog.REVIEW_COUNTER_FIELDS, batch_size=batch_size)
+    return len(changed)
+
+
+def review_saved(review, created):
+    """
+    Обновляет счетчики собаки после сохранения отзыва.
+    Для изменённого отзыва сравнивает собаку и статус с загруженными из базы значениями.
+    Параметры:
+    review (Review): Сохраненный отзыв.
+    created (bool): True, если отзыв только что создан.
+    """
+    current = {'dog_id': review.dog_id, 'sign_of_review': review.sign_of_review}
+    if created:
+        apply_review_deltas({review.dog_id: (1, int(review.sign_of_review))}, {review.dog_id: review.created})
+    else:
+        loaded = getattr(review, '_loaded_values', None)
+        if not loaded or 'dog_id' not in loaded or 'sign_of_review' not in loaded:
+            return
+        if loaded['dog_id'] != review.dog_id:
+            apply_review_deltas({
+                loaded['dog_id']: (-1, -int(loaded['sign_of_review'])),
+                review.dog_id: (1, int(review.sign_of_review)),
+            })
+            refresh_last_reviewed_at([loaded['dog_id'], review.dog_id])
+        elif loaded['sign_of_review'] != review.sign_of_review:
+            apply_review_deltas({review.dog_id: (0, 1 if review.sign_of_review else -1)})
+    review._loaded_values = {**getattr(review, '_loaded_values', {}), **current}
+
+
+def review_deleted(review):
+    """
+    Обновляет счетчики собаки после удаления отзыва.
+    Параметры:
+    review (Review): Удаленный отзыв.
+    """
+    apply_review_deltas({review.dog_id: (-1, -int(review.sign_of_review))})
+    refresh_last_reviewed_at([review.dog_id])
@@ -1,6 +1,7 @@
 from django import forms
 from reviews.models import Review
 from users.forms import StyleFormMixin
+from users.widgets import RemoteSelect
 
 
 class ReviewForm(StyleFormMixin, forms.ModelForm):
@@ -9,15 +10,20 @@ class ReviewForm(StyleFormMixin, forms.ModelForm):
     Атрибуты формы:
     title: Заголовок отзыва.
     content: Текст отзыва.
-    slug: Скрытое поле для уникального слага отзыва с начальным значением 'temp_slug'.
+    dog: Собака, выбирается поиском по активным собакам (RemoteSelect).
     Метаданные:
     model: Связанная модель Review.
     fields: Поля, включённые в форму.
     """
     title = forms.CharField(max_length=150, label='Заголовок')
     content = forms.TextInput()
-    slug = forms.SlugField(max_length=20, initial='temp_slug', widget=forms.HiddenInput())
 
     class Meta:
         model = Review
-        fields = ('dog', 'title', 'content', 'slug')
+        fields = ('dog', 'title', 'content')
+        widgets = {'dog': RemoteSelect('api:lookup_dogs')}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Подпись собаки включает породу: выбранная собака читается одним запросом вместе с ней.
+        self.fields['dog'].queryset = self.fields['dog'].queryset.select_related('breed')
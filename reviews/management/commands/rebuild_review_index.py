@@ -0,0 +1,18 @@
+from django.core.management import BaseCommand
+
+from reviews.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Полностью перестраивает поисковый индекс отзывов:
+    python manage.py rebuild_review_index --batch-size 1000
+    """
+    help = 'Перестроение поискового индекса отзывов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Количество отзывов в одной пачке')
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(f'Проиндексировано отзывов: {total}')
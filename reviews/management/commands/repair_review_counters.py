@@ -0,0 +1,19 @@
+from django.core.management import BaseCommand
+
+from reviews.counters import repair_counters
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает счетчики отзывов собак (review_count, active_review_count, last_reviewed_at)
+    одним запросом GROUP BY по отзывам:
+    python manage.py repair_review_counters
+    """
+    help = 'Пересчет счетчиков отзывов собак'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Размер пачки обновления')
+
+    def handle(self, *args, **options):
+        fixed = repair_counters(batch_size=options['batch_size'])
+        self.stdout.write(f'Исправлено собак: {fixed}')
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_review_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='review',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=25, unique=True, verbose_name='URL'),
+        ),
+    ]
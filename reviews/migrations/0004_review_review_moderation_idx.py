@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0008_breed_updated_at_dog_updated_at'),
+        ('reviews', '0003_alter_review_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['sign_of_review', 'created'], name='review_moderation_idx'),
+        ),
+    ]
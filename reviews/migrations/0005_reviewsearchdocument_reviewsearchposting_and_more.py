@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_review_review_moderation_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewSearchDocument',
+            fields=[
+                ('review', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='reviews.review', verbose_name='Отзыв')),
+                ('length', models.PositiveIntegerField(default=0, verbose_name='Длина')),
+            ],
+            options={
+                'verbose_name': 'review search document',
+                'verbose_name_plural': 'review search documents',
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewSearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Слово')),
+                ('frequency', models.PositiveIntegerField(default=1, verbose_name='Вхождений')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='reviews.reviewsearchdocument', verbose_name='Документ')),
+            ],
+            options={
+                'verbose_name': 'review search posting',
+                'verbose_name_plural': 'review search postings',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reviewsearchposting',
+            constraint=models.UniqueConstraint(fields=('term', 'document'), name='review_search_posting_unique'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:40
+
+from django.db import migrations
+from django.db.models import Count, Max, Q
+
+
+def fill_counters(apps, schema_editor):
+    Dog = apps.get_model('dogs', 'Dog')
+    Review = apps.get_model('reviews', 'Review')
+    stats = Review.objects.values('dog_id').annotate(
+        total=Count('pk'), active=Count('pk', filter=Q(sign_of_review=True)), last=Max('created'),
+    ).order_by()
+    dogs = []
+    for row in stats:
+        dogs.append(Dog(pk=row['dog_id'], review_count=row['total'], active_review_count=row['active'],
+                        last_reviewed_at=row['last']))
+    Dog.objects.bulk_update(dogs, ['review_count', 'active_review_count', 'last_reviewed_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0009_dog_active_review_count_dog_last_reviewed_at_and_more'),
+        ('reviews', '0005_reviewsearchdocument_reviewsearchposting_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 15:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0013_breed_breed_name_idx_dog_dog_name_idx'),
+        ('reviews', '0006_fill_dog_review_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title'], name='review_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['created'], name='review_created_idx'),
+        ),
+    ]
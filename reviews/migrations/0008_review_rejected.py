@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-19 16:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0014_dog_dog_photo_idx'),
+        ('reviews', '0007_review_review_title_idx_review_review_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_moderation_idx',
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='rejected',
+            field=models.BooleanField(default=False, verbose_name='Отклонен'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['sign_of_review', 'rejected', 'created'], name='review_moderation_idx'),
+        ),
+    ]
@@ -1,9 +1,102 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, router, transaction, IntegrityError
 from django.conf import settings
 from django.urls import reverse
+from django.utils import timezone
 
+from api.utils import bump_feed_version
 from users.models import NULLABLE
 from dogs.models import Dog
+from reviews.utils import slug_generator, slug_batch
+
+SLUG_ATTEMPTS = 5
+
+
+class ReviewManager(models.Manager):
+    """
+    Менеджер отзывов с массовым созданием и выдачей слагов.
+    """
+
+    def bulk_create_with_slugs(self, reviews, batch_size=None):
+        """
+        Массово создает отзывы, выдавая слаги отзывам без слага, обновляет счетчики отзывов
+        собак, добавляет отзывы в поисковый индекс и сбрасывает ленту отзывов.
+        Слаги, уже занятые в базе данных, заменяются до вставки;
+        если вставка все же нарушила уникальность (параллельное создание), слаги выдаются заново.
+        Ошибка, не связанная со слагами, передается сразу, выданные слаги сбрасываются.
+        Параметры:
+        reviews (list): Несохраненные отзывы.
+        batch_size (int): Размер пачки для bulk_create().
+        Возвращает:
+        list: Созданные отзывы.
+        Исключения:
+        IntegrityError: Если ошибка не связана со слагами или за SLUG_ATTEMPTS попыток не удалось создать отзывы.
+        """
+        reviews = list(reviews)
+        without_slug = [review for review in reviews if not review.slug]
+        for attempt in range(SLUG_ATTEMPTS):
+            for review, slug in zip(without_slug, slug_batch(len(without_slug))):
+                review.slug = slug
+            taken = set(self.filter(slug__in=[review.slug for review in without_slug]).values_list('slug', flat=True))
+            for review in without_slug:
+                while review.slug in taken:
+                    review.slug = slug_generator()
+            try:
+                with transaction.atomic(using=self.db):
+                    created = self.bulk_create(reviews, batch_size=batch_size)
+            except IntegrityError:
+                slugs_taken = self.filter(slug__in=[review.slug for review in without_slug]).exists()
+                if not slugs_taken or attempt == SLUG_ATTEMPTS - 1:
+                    for review in without_slug:
+                        review.slug = ''
+                    raise
+            else:
+                from reviews.counters import apply_review_deltas, count_reviews
+                from reviews.search import index_reviews
+                apply_review_deltas(*count_reviews(created))
+                index_reviews(created)
+                bump_feed_version('reviews')
+                return created
+
+    def set_activity(self, slugs, is_active):
+        """
+        Включает или отключает отзывы одним запросом UPDATE ... WHERE slug IN (...).
+        Отметка об отклонении снимается: отзыв снова проходит модерацию или уже одобрен.
+        Дата изменения обновляется явно, так как update() не вызывает save().
+        Изменяемые отзывы блокируются до UPDATE; счетчики активных отзывов собак изменяются
+        одним запросом по числу измененных отзывов каждой собаки.
+        Параметры:
+        slugs (list): Слаги отзывов.
+        is_active (bool): Новый статус активности.
+        Возвращает:
+        int: Количество измененных отзывов.
+        """
+        from reviews.counters import apply_review_deltas
+        queryset = self.filter(slug__in=slugs).exclude(sign_of_review=is_active)
+        with transaction.atomic(using=self.db):
+            # Строки блокируются обычным SELECT ... FOR UPDATE (без GROUP BY, который многие СУБД
+            # не допускают с FOR UPDATE), отзывы по собакам считаются в Python.
+            per_dog = Counter(queryset.select_for_update().values_list('dog_id', flat=True))
+            updated = queryset.update(sign_of_review=is_active, rejected=False, updated_at=timezone.now())
+            sign = 1 if is_active else -1
+            apply_review_deltas({dog_id: (0, sign * count) for dog_id, count in per_dog.items()})
+        if updated:
+            bump_feed_version('reviews')
+        return updated
+
+    def reject(self, slugs):
+        """
+        Отклоняет неактивные отзывы одним запросом UPDATE ... WHERE slug IN (...).
+        Отклоненные отзывы остаются в базе данных неактивными, но выходят из очереди модерации.
+        Параметры:
+        slugs (list): Слаги отзывов.
+        Возвращает:
+        int: Количество отклоненных отзывов.
+        """
+        return self.filter(slug__in=slugs, sign_of_review=False, rejected=False).update(
+            rejected=True, updated_at=timezone.now(),
+        )
 
 
 class Review(models.Model):
@@ -11,30 +104,112 @@ class Review(models.Model):
     Модель для представления отзыва о собаке.
     Атрибуты:
     title: Заголовок отзыва (максимум 150 символов).
-    slug: Уникальный слаг для URL (максимум 25 символов).
+    slug: Уникальный слаг для URL (максимум 25 символов), выдается при первом сохранении (см. reviews.utils).
     content: Содержимое отзыва.
     created: Дата и время создания отзыва (автоматически устанавливается при создании).
+    updated_at: Дата и время последнего изменения отзыва.
     sign_of_review: Статус активности отзыва (по умолчанию True).
+    rejected: Отзыв отклонен модератором (неактивный отзыв вне очереди модерации).
     author: Автор отзыва (ссылка на модель пользователя, может быть пустым).
     dog: Собака, к которой относится отзыв (ссылка на модель Dog).
     Методы:
     __str__(): Возвращает строковое представление отзыва (заголовок).
     get_absolute_url(): Возвращает URL для просмотра деталей отзыва.
+    save(): Сохраняет отзыв, при необходимости выдавая слаг.
     """
     title = models.CharField(max_length=150, verbose_name='Заголовок')
-    slug = models.SlugField(max_length=25, unique=True, db_index=True, verbose_name='URL')
+    slug = models.SlugField(max_length=25, unique=True, db_index=True, blank=True, verbose_name='URL')
     content = models.TextField(verbose_name='Содержимое')
     created = models.DateTimeField(verbose_name='Создан', auto_now_add=True)
+    updated_at = models.DateTimeField(verbose_name='Изменен', auto_now=True)
     sign_of_review = models.BooleanField(default=True, verbose_name='Активный')
+    rejected = models.BooleanField(default=False, verbose_name='Отклонен')
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, **NULLABLE, verbose_name='Автор')
     dog = models.ForeignKey(Dog, on_delete=models.CASCADE, related_name='dogs', verbose_name='Собака')
 
+    objects = ReviewManager()
+
     def __str__(self):
         return f'{self.title}'
 
     def get_absolute_url(self):
         return reverse('reviews:review_detail', kwargs={'slug': self.slug})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Запоминает загруженные из базы значения полей, чтобы после сохранения
+        определить, сменились ли собака и статус отзыва (см. reviews.counters).
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет отзыв, выдавая слаг до первой вставки, если он не задан.
+        Вставка выполняется в точке сохранения транзакции: при совпадении слага
+        с уже существующим выдается новый слаг, не больше SLUG_ATTEMPTS попыток.
+        Исключения:
+        IntegrityError: Если ошибка не связана со слагом или попытки исчерпаны.
+        """
+        if self.slug:
+            return super().save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = slug_generator()
+            try:
+                with transaction.atomic(using=using):
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                slug_taken = Review.objects.using(using).filter(slug=self.slug).exists()
+                if not slug_taken or attempt == SLUG_ATTEMPTS - 1:
+                    self.slug = ''
+                    raise
+
     class Meta:
         verbose_name = 'review'
         verbose_name_plural = 'reviews'
+        indexes = [
+            models.Index(fields=['sign_of_review', 'rejected', 'created'], name='review_moderation_idx'),
+            # Поиск по началу заголовка и сортировка списка отзывов в админке.
+            models.Index(fields=['title'], name='review_title_idx'),
+            models.Index(fields=['created'], name='review_created_idx'),
+        ]
+
+
+class ReviewSearchDocument(models.Model):
+    """
+    Документ поискового индекса отзывов (см. reviews.search).
+    Атрибуты:
+    review: Проиндексированный отзыв (первичный ключ документа).
+    length: Количество слов в заголовке и тексте отзыва (с учетом веса заголовка).
+    """
+    review = models.OneToOneField(Review, on_delete=models.CASCADE, primary_key=True,
+                                  related_name='search_document', verbose_name='Отзыв')
+    length = models.PositiveIntegerField(default=0, verbose_name='Длина')
+
+    class Meta:
+        verbose_name = 'review search document'
+        verbose_name_plural = 'review search documents'
+
+
+class ReviewSearchPosting(models.Model):
+    """
+    Запись инвертированного индекса: слово и число его вхождений в отзыв.
+    Атрибуты:
+    term: Слово (в нижнем регистре).
+    document: Документ индекса.
+    frequency: Количество вхождений слова в документ.
+    """
+    term = models.CharField(max_length=64, verbose_name='Слово')
+    document = models.ForeignKey(ReviewSearchDocument, on_delete=models.CASCADE, related_name='postings',
+                                 verbose_name='Документ')
+    frequency = models.PositiveIntegerField(default=1, verbose_name='Вхождений')
+
+    class Meta:
+        verbose_name = 'review search posting'
+        verbose_name_plural = 'review search postings'
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'document'], name='review_search_posting_unique'),
+        ]
@@ -0,0 +1,132 @@
+import math
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from reviews.models import Review, ReviewSearchDocument, ReviewSearchPosting
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 10
+TITLE_WEIGHT = 2
+
+# Параметры ранжирования BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    """
+    Разбивает текст на слова для индекса.
+    Параметры:
+    text (str): Текст.
+    Возвращает:
+    list: Слова в нижнем регистре (ё заменяется на е), короче MIN_TERM_LENGTH отбрасываются.
+    """
+    words = TOKEN_RE.findall((text or '').lower().replace('ё', 'е'))
+    return [word[:MAX_TERM_LENGTH] for word in words if len(word) >= MIN_TERM_LENGTH]
+
+
+def get_terms(review):
+    """
+    Считает вхождения слов в отзыв. Слова заголовка учитываются с весом TITLE_WEIGHT.
+    Параметры:
+    review (Review): Отзыв.
+    Возвращает:
+    Counter: Слово -> количество вхождений.
+    """
+    terms = Counter(tokenize(review.content))
+    for term in tokenize(review.title):
+        terms[term] += TITLE_WEIGHT
+    return terms
+
+
+def index_reviews(reviews):
+    """
+    Индексирует отзывы, заменяя их прежние записи в индексе.
+    Записи удаляются и создаются пачками, число запросов не зависит от количества отзывов.
+    Параметры:
+    reviews (list): Сохраненные отзывы.
+    """
+    reviews = [review for review in reviews if review.pk is not None]
+    if not reviews:
+        return
+    documents = []
+    postings = []
+    for review in reviews:
+        terms = get_terms(review)
+        documents.append(ReviewSearchDocument(review_id=review.pk, length=sum(terms.values())))
+        postings.extend(
+            ReviewSearchPosting(term=term, document_id=review.pk, frequency=frequency)
+            for term, frequency in terms.items()
+        )
+    with transaction.atomic():
+        ReviewSearchDocument.objects.filter(pk__in=[review.pk for review in reviews]).delete()
+        ReviewSearchDocument.objects.bulk_create(documents)
+        ReviewSearchPosting.objects.bulk_create(postings, batch_size=500)
+
+
+def rebuild_index(batch_size=500):
+    """
+    Полностью перестраивает индекс по всем отзывам.
+    Параметры:
+    batch_size (int): Количество отзывов, индексируемых за раз.
+    Возвращает:
+    int: Количество проиндексированных отзывов.
+    """
+    with transaction.atomic():
+        ReviewSearchDocument.objects.all().delete()
+        batch = []
+        total = 0
+        for review in Review.objects.only('pk', 'title', 'content').iterator(chunk_size=batch_size):
+            batch.append(review)
+            if len(batch) >= batch_size:
+                index_reviews(batch)
+                total += len(batch)
+                batch = []
+        index_reviews(batch)
+        return total + len(batch)
+
+
+def search_reviews(query, active=True, dog_id=None, breed_id=None):
+    """
+    Ищет отзывы по словам запроса и ранжирует их по BM25.
+    Выполняет три запроса: статистика индекса, частоты слов запроса
+    и вхождения слов в отзывы, подходящие под фильтры.
+    Параметры:
+    query (str): Поисковый запрос.
+    active (bool | None): Статус активности отзывов (None - любой).
+    dog_id (int): Только отзывы о собаке.
+    breed_id (int): Только отзывы о собаках породы.
+    Возвращает:
+    list: Пары (id отзыва, оценка) по убыванию оценки.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+    stats = ReviewSearchDocument.objects.aggregate(total=Count('pk'), average_length=Avg('length'))
+    if not stats['total']:
+        return []
+    average_length = stats['average_length'] or 1
+    document_frequency = dict(
+        ReviewSearchPosting.objects.filter(term__in=terms).values('term')
+        .annotate(count=Count('pk')).values_list('term', 'count')
+    )
+    postings = ReviewSearchPosting.objects.filter(term__in=terms)
+    if active is not None:
+        postings = postings.filter(document__review__sign_of_review=active)
+    if dog_id is not None:
+        postings = postings.filter(document__review__dog_id=dog_id)
+    if breed_id is not None:
+        postings = postings.filter(document__review__dog__breed_id=breed_id)
+    scores = {}
+    for term, review_id, frequency, length in postings.values_list('term', 'document_id', 'frequency',
+                                                                   'document__length'):
+        df = document_frequency.get(term, 0)
+        idf = math.log(1 + (stats['total'] - df + 0.5) / (df + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+        scores[review_id] = scores.get(review_id, 0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+    return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from reviews import counters
+from reviews.models import Review
+from reviews.search import index_reviews
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    Обновляет счетчики отзывов собаки и запись отзыва в поисковом индексе после сохранения.
+    Записи удаленного отзыва удаляются из индекса каскадно вместе с ним.
+    """
+    if not raw:
+        counters.review_saved(instance, created)
+        index_reviews([instance])
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """
+    Обновляет счетчики отзывов собаки после удаления отзыва.
+    """
+    counters.review_deleted(instance)
@@ -0,0 +1,253 @@
+from unittest import mock
+
+from django.db import IntegrityError
+from django.test import TestCase
+
+from dogs.models import Breed, Dog
+from reviews.counters import repair_counters
+from reviews.models import Review, ReviewSearchDocument, ReviewSearchPosting, SLUG_ATTEMPTS
+from reviews.search import rebuild_index, search_reviews
+from reviews.utils import slug_batch, slug_generator, SLUG_TIME_LENGTH, SLUG_RANDOM_LENGTH
+from users.models import User
+
+
+class ReviewTestMixin:
+    """
+    Общие данные тестов отзывов: порода, две собаки и автор.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.breed = Breed.objects.create(name='Такса')
+        cls.other_breed = Breed.objects.create(name='Бигль')
+        cls.dog = Dog.objects.create(name='Бобик', breed=cls.breed)
+        cls.other_dog = Dog.objects.create(name='Шарик', breed=cls.other_breed)
+        cls.author = User.objects.create(email='author@test.local')
+
+    def make_review(self, dog=None, **kwargs):
+        kwargs.setdefault('title', 'Отзыв')
+        kwargs.setdefault('content', 'Текст отзыва')
+        return Review(dog=dog or self.dog, author=self.author, **kwargs)
+
+
+class ReviewSlugTestCase(ReviewTestMixin, TestCase):
+    """
+    Тесты выдачи слагов отзывов.
+    """
+
+    def test_slug_batch_is_unique_and_sorted(self):
+        slugs = slug_batch(200)
+        self.assertEqual(len(set(slugs)), 200)
+        self.assertEqual(slugs, sorted(slugs))
+        self.assertTrue(all(len(slug) == SLUG_TIME_LENGTH + SLUG_RANDOM_LENGTH for slug in slugs))
+
+    def test_save_assigns_slug(self):
+        review = self.make_review()
+        review.save()
+        self.assertEqual(len(review.slug), SLUG_TIME_LENGTH + SLUG_RANDOM_LENGTH)
+
+    def test_save_retries_taken_slug(self):
+        self.make_review(slug='taken').save()
+        fresh = slug_generator()
+        with mock.patch('reviews.models.slug_generator', side_effect=['taken', fresh]) as generator:
+            review = self.make_review()
+            review.save()
+        self.assertEqual(generator.call_count, 2)
+        self.assertEqual(review.slug, fresh)
+        self.assertTrue(Review.objects.filter(pk=review.pk, slug=fresh).exists())
+
+    def test_save_gives_up_after_attempts(self):
+        self.make_review(slug='taken').save()
+        review = self.make_review()
+        with mock.patch('reviews.models.slug_generator', return_value='taken') as generator:
+            with self.assertRaises(IntegrityError):
+                review.save()
+        self.assertEqual(generator.call_count, SLUG_ATTEMPTS)
+        self.assertEqual(review.slug, '')
+
+    def test_save_reraises_other_integrity_error(self):
+        review = self.make_review(title=None)
+        with mock.patch('reviews.models.slug_generator', wraps=slug_generator) as generator:
+            with self.assertRaises(IntegrityError):
+                review.save()
+        self.assertEqual(generator.call_count, 1)
+        self.assertEqual(review.slug, '')
+        self.assertIsNone(review.pk)
+
+    def test_bulk_create_replaces_taken_slugs(self):
+        self.make_review(slug='taken').save()
+        fresh = slug_generator()
+        with mock.patch('reviews.models.slug_batch', return_value=['taken']), \
+                mock.patch('reviews.models.slug_generator', return_value=fresh):
+            created = Review.objects.bulk_create_with_slugs([self.make_review()])
+        self.assertEqual([review.slug for review in created], [fresh])
+
+    def test_bulk_create_retries_slug_taken_during_insert(self):
+        # Слаг, выданный взамен занятого, тоже оказался занят - вставка нарушает уникальность.
+        self.make_review(slug='taken').save()
+        self.make_review(slug='taken-later').save()
+        fresh = slug_generator()
+        with mock.patch('reviews.models.slug_batch', side_effect=[['taken'], [fresh]]) as batch, \
+                mock.patch('reviews.models.slug_generator', return_value='taken-later'):
+            created = Review.objects.bulk_create_with_slugs([self.make_review()])
+        self.assertEqual(batch.call_count, 2)
+        self.assertEqual([review.slug for review in created], [fresh])
+        self.assertEqual(Review.objects.count(), 3)
+
+    def test_bulk_create_reraises_other_integrity_error(self):
+        reviews = [self.make_review(), self.make_review(title=None)]
+        with mock.patch('reviews.models.slug_batch', wraps=slug_batch) as batch:
+            with self.assertRaises(IntegrityError):
+                Review.objects.bulk_create_with_slugs(reviews)
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual([review.slug for review in reviews], ['', ''])
+        self.assertFalse(Review.objects.exists())
+
+
+class ReviewCountersTestCase(ReviewTestMixin, TestCase):
+    """
+    Тесты счетчиков отзывов собак (review_count, active_review_count, last_reviewed_at).
+    """
+
+    def assertCounters(self, dog, review_count, active_review_count, last_reviewed_at):
+        dog.refresh_from_db()
+        self.assertEqual(
+            (dog.review_count, dog.active_review_count, dog.last_reviewed_at),
+            (review_count, active_review_count, last_reviewed_at),
+        )
+
+    def create_review(self, dog=None, **kwargs):
+        review = self.make_review(dog, **kwargs)
+        review.save()
+        return review
+
+    def test_create(self):
+        first = self.create_review()
+        self.assertCounters(self.dog, 1, 1, first.created)
+        second = self.create_review(sign_of_review=False)
+        self.assertCounters(self.dog, 2, 1, second.created)
+        self.assertCounters(self.other_dog, 0, 0, None)
+
+    def test_delete(self):
+        first = self.create_review()
+        second = self.create_review(sign_of_review=False)
+        second.delete()
+        self.assertCounters(self.dog, 1, 1, first.created)
+        first.delete()
+        self.assertCounters(self.dog, 0, 0, None)
+
+    def test_toggle_activity(self):
+        review = self.create_review()
+        review = Review.objects.get(pk=review.pk)
+        review.sign_of_review = False
+        review.save()
+        self.assertCounters(self.dog, 1, 0, review.created)
+        review.sign_of_review = True
+        review.save()
+        self.assertCounters(self.dog, 1, 1, review.created)
+
+    def test_save_without_changes(self):
+        review = self.create_review()
+        review = Review.objects.get(pk=review.pk)
+        review.title = 'Новый заголовок'
+        review.save()
+        self.assertCounters(self.dog, 1, 1, review.created)
+
+    def test_move_to_other_dog(self):
+        first = self.create_review()
+        moved = self.create_review(sign_of_review=False)
+        moved = Review.objects.get(pk=moved.pk)
+        moved.dog = self.other_dog
+        moved.save()
+        self.assertCounters(self.dog, 1, 1, first.created)
+        self.assertCounters(self.other_dog, 1, 0, moved.created)
+
+    def test_set_activity(self):
+        reviews = [self.create_review(), self.create_review(), self.create_review(self.other_dog)]
+        slugs = [review.slug for review in reviews]
+        self.assertEqual(Review.objects.set_activity(slugs, False), 3)
+        self.assertCounters(self.dog, 2, 0, reviews[1].created)
+        self.assertCounters(self.other_dog, 1, 0, reviews[2].created)
+        # Отзывы, уже имеющие нужный статус, не изменяются и не меняют счетчики.
+        self.assertEqual(Review.objects.set_activity(slugs[:1], False), 0)
+        self.assertEqual(Review.objects.set_activity(slugs, True), 3)
+        self.assertCounters(self.dog, 2, 2, reviews[1].created)
+        self.assertCounters(self.other_dog, 1, 1, reviews[2].created)
+
+    def test_bulk_create(self):
+        created = Review.objects.bulk_create_with_slugs([
+            self.make_review(), self.make_review(sign_of_review=False), self.make_review(self.other_dog),
+        ])
+        self.assertCounters(self.dog, 2, 1, max(review.created for review in created[:2]))
+        self.assertCounters(self.other_dog, 1, 1, created[2].created)
+
+    def test_repair_counters(self):
+        review = self.create_review()
+        self.create_review(self.other_dog)
+        self.assertEqual(repair_counters(), 0)
+        Dog.objects.filter(pk=self.dog.pk).update(review_count=10, active_review_count=0, last_reviewed_at=None)
+        self.assertEqual(repair_counters(), 1)
+        self.assertCounters(self.dog, 1, 1, review.created)
+        self.assertEqual(repair_counters(), 0)
+
+
+class ReviewSearchTestCase(ReviewTestMixin, TestCase):
+    """
+    Тесты поискового индекса отзывов и ранжирования BM25.
+    """
+
+    def create_review(self, title, content, dog=None, **kwargs):
+        review = self.make_review(dog, title=title, content=content, **kwargs)
+        review.save()
+        return review
+
+    def get_terms(self, review):
+        return set(ReviewSearchPosting.objects.filter(document_id=review.pk).values_list('term', flat=True))
+
+    def found_ids(self, query, **filters):
+        return [review_id for review_id, _ in search_reviews(query, **filters)]
+
+    def test_save_indexes_review(self):
+        review = self.create_review('Веселый щенок', 'Очень добрая собака')
+        self.assertEqual(self.get_terms(review), {'веселый', 'щенок', 'очень', 'добрая', 'собака'})
+        self.assertEqual(ReviewSearchDocument.objects.get(pk=review.pk).length, 7)
+        self.assertEqual(self.found_ids('щенок'), [review.pk])
+
+    def test_edit_replaces_postings(self):
+        review = self.create_review('Веселый щенок', 'Очень добрая собака')
+        review.title = 'Спокойный пес'
+        review.save()
+        self.assertEqual(self.get_terms(review), {'спокойный', 'пес', 'очень', 'добрая', 'собака'})
+        self.assertEqual(self.found_ids('щенок'), [])
+        self.assertEqual(self.found_ids('пес'), [review.pk])
+
+    def test_delete_removes_postings(self):
+        review = self.create_review('Веселый щенок', 'Очень добрая собака')
+        review.delete()
+        self.assertFalse(ReviewSearchDocument.objects.exists())
+        self.assertFalse(ReviewSearchPosting.objects.exists())
+        self.assertEqual(self.found_ids('щенок'), [])
+
+    def test_title_match_ranks_above_content_match(self):
+        in_content = self.create_review('Щенок', 'Хорошая овчарка')
+        in_title = self.create_review('Овчарка', 'Хорошая собака')
+        self.assertEqual(self.found_ids('овчарка'), [in_title.pk, in_content.pk])
+
+    def test_filters(self):
+        active = self.create_review('Щенок', 'Про таксу')
+        inactive = self.create_review('Щенок', 'Неактивный отзыв', sign_of_review=False)
+        other = self.create_review('Щенок', 'Про бигля', self.other_dog)
+        self.assertEqual(set(self.found_ids('щенок')), {active.pk, other.pk})
+        self.assertEqual(self.found_ids('щенок', active=False), [inactive.pk])
+        self.assertEqual(set(self.found_ids('щенок', active=None)), {active.pk, inactive.pk, other.pk})
+        self.assertEqual(self.found_ids('щенок', dog_id=self.other_dog.pk), [other.pk])
+        self.assertEqual(self.found_ids('щенок', breed_id=self.breed.pk), [active.pk])
+
+    def test_rebuild_index(self):
+        first = self.create_review('Веселый щенок', 'Очень добрая собака')
+        second = self.create_review('Спокойный пес', 'Любит гулять')
+        ReviewSearchDocument.objects.all().delete()
+        self.assertEqual(self.found_ids('щенок'), [])
+        self.assertEqual(rebuild_index(batch_size=1), 2)
+        self.assertEqual(self.found_ids('щенок'), [first.pk])
+        self.assertEqual(self.found_ids('гулять'), [second.pk])
@@ -1,15 +1,25 @@
+from django.conf import settings
 from django.urls import path
 
 from reviews.apps import ReviewsConfig
 
 from reviews.views import ReviewListview, ReviewDeactivatedListview, ReviewCreateView, ReviewDetailView, \
-    ReviewDeleteView, ReviewUpdateView, review_toggle_activity
+    ReviewDeleteView, ReviewUpdateView, review_toggle_activity, ReviewListAsyncView, DogReviewListView, \
+    AuthorReviewListView, ReviewModerationQueueView, review_moderate, ReviewSearchView
 
 app_name = ReviewsConfig.name
 
+if settings.ASYNC_VIEWS:
+    ReviewListview = ReviewListAsyncView
+
 urlpatterns = [
     path('', ReviewListview.as_view(), name='reviews_list'),
     path('deactivated', ReviewDeactivatedListview.as_view(), name='reviews_deactivated'),
+    path('search/', ReviewSearchView.as_view(), name='reviews_search'),
+    path('moderation/', ReviewModerationQueueView.as_view(), name='review_moderation'),
+    path('moderation/apply/', review_moderate, name='review_moderate'),
+    path('dog/<int:pk>/', DogReviewListView.as_view(), name='dog_reviews'),
+    path('author/<int:pk>/', AuthorReviewListView.as_view(), name='author_reviews'),
     path('review/create/', ReviewCreateView.as_view(), name='review_create'),
     path('review/detail/<slug:slug>/', ReviewDetailView.as_view(), name='review_detail'),
     path('review/update/<slug:slug>/', ReviewUpdateView.as_view(), name='review_update'),
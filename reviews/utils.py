@@ -1,12 +1,55 @@
+import secrets
 import string
-import random
+import time
 
+SLUG_ALPHABET = string.digits + string.ascii_lowercase
+SLUG_TIME_LENGTH = 9
+SLUG_RANDOM_LENGTH = 8
 
-def slug_generator():
+
+def to_base36(number, width):
+    """
+    Переводит неотрицательное число в строку base36 фиксированной ширины.
+    Параметры:
+    number (int): Число.
+    width (int): Ширина строки (дополняется нулями слева).
+    Возвращает:
+    str: Число в base36.
+    """
+    digits = []
+    while number:
+        number, remainder = divmod(number, 36)
+        digits.append(SLUG_ALPHABET[remainder])
+    return ''.join(reversed(digits)).rjust(width, '0')
+
+
+def slug_generator(timestamp_ms=None):
+    """
+    Генерирует слаг отзыва длиной 17 символов: 9 символов времени создания
+    в миллисекундах и 8 случайных символов (цифры и строчные латинские буквы).
+    Слаги, созданные позже, больше при сравнении строк, поэтому сортировка
+    по слагу совпадает с сортировкой по времени создания.
+    Параметры:
+    timestamp_ms (int): Время в миллисекундах (по умолчанию текущее).
+    Возвращает:
+    str: Слаг.
+    """
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    random_part = ''.join(secrets.choice(SLUG_ALPHABET) for _ in range(SLUG_RANDOM_LENGTH))
+    return to_base36(timestamp_ms, SLUG_TIME_LENGTH) + random_part
+
+
+def slug_batch(count):
     """
-    Генерирует случайный слаг длиной 20 символов.
-    Слаг состоит из случайных букв нижнего и верхнего регистра, а также цифр.
+    Генерирует count различных слагов для массового создания отзывов.
+    Параметры:
+    count (int): Количество слагов.
     Возвращает:
-    Случайно сгенерированный слаг длиной 20 символов.
+    list: Слаги в порядке возрастания.
     """
-    return ''.join(random.choices(string.ascii_lowercase + string.digits + string.ascii_uppercase, k=20))
+    timestamp_ms = time.time_ns() // 1_000_000
+    slugs = set()
+    while len(slugs) < count:
+        slugs.add(slug_generator(timestamp_ms))
+    return sorted(slugs)
@@ -1,26 +1,35 @@
-from django.http import HttpResponseForbidden
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
 from django.shortcuts import reverse, get_object_or_404, redirect
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView, CreateView, UpdateView, DetailView, DeleteView
-from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
 
+from database.routers import mark_user_write
+from dogs.models import Dog
 from reviews.models import Review
 from reviews.forms import ReviewForm
-from users.models import UserRoles
-from reviews.utils import slug_generator
+from reviews.search import search_reviews
+from users.capabilities import CapabilityRequiredMixin, capability_required
+from users.mixins import ConditionalResponseMixin, AsyncListMixin, FragmentListMixin
 
 
-class ReviewListview(ListView):
+class ReviewListview(FragmentListMixin, ListView):
     """
     Представление для отображения всех активных отзывов.
-    Отображает список всех отзывов, которые имеют статус 'активный'.
+    Отображает список всех отзывов, которые имеют статус 'активный',
+    от новых к старым. Собака, её порода и автор загружаются тем же запросом.
     """
     model = Review
     extra_context = {
         'title': 'Все отзывы'
     }
     template_name = 'reviews/reviews.html'
+    fragment_template_name = 'reviews/reviews_fragment.html'
     paginate_by = 2
+    ordering = ('-created', '-id')
 
     def get_queryset(self):
         """
@@ -29,21 +38,31 @@ class ReviewListview(ListView):
         QuerySet: Отзывы с активным статусом.
         """
         queryset = super().get_queryset()
-        queryset = queryset.filter(sign_of_review=True)
+        queryset = queryset.filter(sign_of_review=True).select_related('dog__breed', 'author')
         return queryset
 
 
-class ReviewDeactivatedListview(ListView):
+class ReviewListAsyncView(AsyncListMixin, ReviewListview):
+    """
+    Асинхронная версия ReviewListview для запуска под ASGI.
+    """
+    pass
+
+
+class ReviewDeactivatedListview(CapabilityRequiredMixin, ListView):
     """
     Представление для отображения неактивных отзывов.
     Отображает список всех отзывов, которые имеют статус 'неактивный'.
+    Доступно модераторам и администраторам.
     """
     model = Review
+    capability_required = 'review_moderate'
     extra_context = {
         'title': 'Неактивные отзывы'
     }
     template_name = 'reviews/reviews.html'
     paginate_by = 2
+    ordering = ('-created', '-id')
 
     def get_queryset(self):
         """
@@ -52,16 +71,180 @@ class ReviewDeactivatedListview(ListView):
         QuerySet: Отзывы с неактивным статусом.
         """
         queryset = super().get_queryset()
-        queryset = queryset.filter(sign_of_review=False)
+        queryset = queryset.filter(sign_of_review=False).select_related('dog__breed', 'author')
         return queryset
 
 
-class ReviewCreateView(LoginRequiredMixin, CreateView):
+class ReviewSearchView(ListView):
+    """
+    Представление поиска отзывов по заголовку и тексту.
+    Результаты ранжируются по BM25 (см. reviews.search) и разбиваются на страницы,
+    загружаются только отзывы текущей страницы.
+    Параметры запроса: q - поисковый запрос, dog и breed - фильтры по собаке и породе,
+    active=0 - поиск среди неактивных отзывов (для модераторов).
+    """
+    template_name = 'reviews/reviews.html'
+    paginate_by = 10
+    filter_params = ('dog', 'breed')
+
+    def get_filters(self):
+        """
+        Возвращает фильтры поиска из параметров запроса.
+        Возвращает:
+        dict: Аргументы search_reviews() кроме запроса.
+        """
+        filters = {'active': True}
+        if self.request.GET.get('active') == '0' and 'review_moderate' in self.request.capabilities:
+            filters['active'] = False
+        for param in self.filter_params:
+            value = self.request.GET.get(param, '')
+            if value.isdigit():
+                filters[f'{param}_id'] = int(value)
+        return filters
+
+    def get_queryset(self):
+        """
+        Возвращает найденные отзывы.
+        Возвращает:
+        list: Пары (id отзыва, оценка) по убыванию оценки.
+        """
+        return search_reviews(self.request.GET.get('q', ''), **self.get_filters())
+
+    def get_context_data(self, **kwargs):
+        """
+        Заменяет идентификаторы отзывов текущей страницы самими отзывами
+        и добавляет параметры запроса для ссылок пагинации.
+        """
+        context_data = super().get_context_data(**kwargs)
+        ids = [review_id for review_id, _ in context_data['object_list']]
+        reviews = Review.objects.select_related('dog__breed', 'author').in_bulk(ids)
+        context_data['object_list'] = [reviews[review_id] for review_id in ids if review_id in reviews]
+        query = self.request.GET.copy()
+        query.pop(self.page_kwarg, None)
+        context_data['page_query'] = f'{query.urlencode()}&' if query else ''
+        context_data['title'] = f'Поиск отзывов: {self.request.GET.get("q", "")}'
+        context_data['stats'] = [('Найдено', len(self.object_list))]
+        return context_data
+
+
+class ReviewGroupListView(ReviewListview):
+    """
+    Базовое представление активных отзывов одного объекта (собаки или автора).
+    Объект загружается одним запросом вместе с количеством его отзывов,
+    это количество используется пагинатором вместо отдельного COUNT.
+    Атрибуты:
+    group_queryset (QuerySet): Запрос объектов с количеством активных отзывов.
+    group_filter (str): Поле отзыва, ссылающееся на объект.
+    review_count_field (str): Поле или аннотация объекта с количеством активных отзывов.
+    """
+    group_queryset = None
+    group_filter = None
+    review_count_field = 'review_count'
+
+    def get_group(self):
+        """
+        Загружает объект, отзывы которого отображаются.
+        Возвращает:
+        Объект group_queryset.
+        Исключения:
+        Http404: Если объект не найден.
+        """
+        if not hasattr(self, 'group'):
+            self.group = get_object_or_404(self.group_queryset.all(), pk=self.kwargs.get('pk'))
+        return self.group
+
+    def get_queryset(self):
+        """
+        Возвращает активные отзывы объекта.
+        Возвращает:
+        QuerySet: Отзывы объекта.
+        """
+        return super().get_queryset().filter(**{self.group_filter: self.get_group().pk})
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        """
+        Создает пагинатор с заранее известным количеством отзывов.
+        """
+        paginator = super().get_paginator(queryset, per_page, orphans, allow_empty_first_page, **kwargs)
+        paginator.count = getattr(self.get_group(), self.review_count_field)
+        return paginator
+
+    def get_stats(self):
+        """
+        Возвращает показатели объекта для шапки списка.
+        Возвращает:
+        list: Пары (название, значение).
+        """
+        return [('Отзывов', getattr(self.get_group(), self.review_count_field))]
+
+    def get_context_data(self, **kwargs):
+        """
+        Добавляет в контекст объект и его показатели.
+        """
+        context_data = super().get_context_data(**kwargs)
+        context_data['group'] = self.get_group()
+        context_data['stats'] = self.get_stats()
+        return context_data
+
+
+class DogReviewListView(ReviewGroupListView):
+    """
+    Представление активных отзывов о выбранной активной собаке.
+    Отзывы о неактивной собаке не показываются, как и в остальных списках отзывов.
+    Количество отзывов берется из счетчика собаки (см. reviews.counters).
+    """
+    group_queryset = Dog.objects.filter(is_active=True).select_related('breed')
+    group_filter = 'dog_id'
+    review_count_field = 'active_review_count'
+
+    def get_context_data(self, **kwargs):
+        """
+        Добавляет в контекст заголовок страницы с кличкой собаки.
+        Возвращает:
+        dict: Контекст шаблона.
+        """
+        context_data = super().get_context_data(**kwargs)
+        context_data['title'] = f'Отзывы о собаке {self.group.name}'
+        return context_data
+
+
+class AuthorReviewListView(ReviewGroupListView):
+    """
+    Представление активных отзывов выбранного автора.
+    Пользователь загружается с количеством активных отзывов и собак, о которых они написаны.
+    """
+    group_queryset = get_user_model().objects.annotate(
+        review_count=Count('review', filter=Q(review__sign_of_review=True)),
+        dog_count=Count('review__dog', filter=Q(review__sign_of_review=True), distinct=True),
+    )
+    group_filter = 'author_id'
+
+    def get_stats(self):
+        """
+        Добавляет к показателям автора количество собак с его отзывами.
+        Возвращает:
+        list: Пары (название, значение).
+        """
+        return super().get_stats() + [('Собак с отзывами', self.group.dog_count)]
+
+    def get_context_data(self, **kwargs):
+        """
+        Добавляет в контекст заголовок страницы с именем автора.
+        Возвращает:
+        dict: Контекст шаблона.
+        """
+        context_data = super().get_context_data(**kwargs)
+        context_data['title'] = f'Отзывы пользователя {self.group}'
+        return context_data
+
+
+class ReviewCreateView(CapabilityRequiredMixin, CreateView):
     """
     Представление для создания нового отзыва.
-    Позволяет авторизованным пользователям писать новые отзывы.
+    Позволяет пользователям с возможностью review_create писать новые отзывы.
     """
     model = Review
+    capability_required = 'review_create'
     form_class = ReviewForm
     template_name = 'reviews/create_update.html'
     extra_context = {
@@ -70,36 +253,37 @@ class ReviewCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         """
-        Обрабатывает валидную форму и сохраняет новый отзыв.
-        Проверяет, имеет ли пользователь право на создание отзыва.
-        Генерирует слаг, если он временный.
+        Обрабатывает валидную форму и сохраняет новый отзыв одной вставкой
+        (слаг выдается при сохранении, см. Review.save()).
         Параметры:
         form (ReviewForm): Валидная форма.
         Возвращает:
         HttpResponseRedirect: Перенаправление на страницу деталей отзыва.
         """
-        if self.request.user.role not in [UserRoles.USER, UserRoles.ADMIN]:
-            return HttpResponseForbidden
-        self.object = form.save()
-        print(self.object.slug)
-        if self.object.slug == 'temp_slug':
-            self.object.slug = slug_generator()
-            print(self.object.slug)
-        self.object.author = self.request.user
-        self.object.save()
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class ReviewDetailView(LoginRequiredMixin, DetailView):
+class ReviewDetailView(LoginRequiredMixin, ConditionalResponseMixin, DetailView):
     """
     Представление для отображения деталей отзыва.
     Позволяет пользователям просматривать информацию о конкретном отзыве.
+    Отвечает 304 Not Modified, если отзыв, собака и автор не менялись.
     """
     model = Review
     template_name = 'reviews/detail.html'
     extra_context = {
         'title': 'Просмотр отзыва'
     }
+    conditional_fields = ('updated_at', 'dog__updated_at', 'author__updated_at')
+
+    def get_queryset(self):
+        """
+        Возвращает отзывы вместе с собакой и автором.
+        Возвращает:
+        QuerySet: Отзывы.
+        """
+        return super().get_queryset().select_related('dog', 'author')
 
 
 class ReviewUpdateView(LoginRequiredMixin, UpdateView):
@@ -110,6 +294,7 @@ class ReviewUpdateView(LoginRequiredMixin, UpdateView):
     model = Review
     form_class = ReviewForm
     template_name = 'reviews/create_update.html'
+    read_from_primary = True
     extra_context = {
         'title': 'Изменить отзыв'
     }
@@ -123,26 +308,40 @@ class ReviewUpdateView(LoginRequiredMixin, UpdateView):
     def get_object(self, queryset=None):
         """
         Получает объект отзыва для редактирования.
-        Проверяет, является ли текущий пользователь автором отзыва или администратором.
+        Проверяет, является ли текущий пользователь автором отзыва
+        или имеет возможность review_update_any (администратор, модератор).
         Параметры:
         queryset (QuerySet): Опциональный набор объектов.
         Возвращает:
         Объект отзыва.
         """
         self.object = super().get_object(queryset=queryset)
-        if self.object.author != self.request.user and self.request.user not in [UserRoles.ADMIN, UserRoles.MODERATOR]:
+        if self.object.author_id != self.request.user.pk and 'review_update_any' not in self.request.capabilities:
             raise PermissionDenied()
         return self.object
 
 
-class ReviewDeleteView(PermissionRequiredMixin, DeleteView):
+class ReviewDeleteView(LoginRequiredMixin, DeleteView):
     """
     Представление для удаления отзыва.
-    Позволяет пользователям с необходимыми правами удалять отзывы.
+    Позволяет автору и пользователям с возможностью review_delete удалять отзывы.
     """
     model = Review
     template_name = 'reviews/delete.html'
-    permission_required = 'reviews.delete_review'
+
+    def get_object(self, queryset=None):
+        """
+        Получает объект отзыва для удаления.
+        Если пользователь не автор и не может удалять чужие отзывы, выбрасывает PermissionDenied.
+        Параметры:
+        queryset (QuerySet): Опциональный набор объектов.
+        Возвращает:
+        Объект отзыва.
+        """
+        review = super().get_object(queryset=queryset)
+        if review.author_id != self.request.user.pk and 'review_delete' not in self.request.capabilities:
+            raise PermissionDenied()
+        return review
 
     def get_success_url(self):
         """
@@ -151,22 +350,75 @@ class ReviewDeleteView(PermissionRequiredMixin, DeleteView):
         return reverse('reviews:reviews_list')
 
 
+@capability_required('review_moderate')
 def review_toggle_activity(request, slug):
     """
     Переключает статус активности отзыва.
     Если отзыв активен, делает его неактивным, и наоборот.
+    Доступно модераторам и администраторам.
     После изменения статуса перенаправляет пользователя на соответствующую страницу:
     - На страницу неактивных отзывов, если отзыв был активирован.
     - На страницу активных отзывов, если отзыв был деактивирован.
     Возвращает:
     Перенаправление на страницу списка отзывов в зависимости от нового статуса.
     """
-    review_item = get_object_or_404(Review, slug=slug)
-    if review_item.sign_of_review:
-        review_item.sign_of_review = False
-        review_item.save()
+    is_active = get_object_or_404(Review.objects.values_list('sign_of_review', flat=True), slug=slug)
+    Review.objects.set_activity([slug], not is_active)
+    mark_user_write()
+    if is_active:
         return redirect(reverse('reviews:reviews_deactivated'))
+    return redirect(reverse('reviews:reviews_list'))
+
+
+class ReviewModerationQueueView(CapabilityRequiredMixin, ListView):
+    """
+    Очередь модерации: неактивные неотклоненные отзывы от старых к новым.
+    Модератор отмечает несколько отзывов и одобряет или отклоняет их одним действием
+    (см. review_moderate). Запрос очереди использует индекс (sign_of_review, rejected, created).
+    """
+    model = Review
+    capability_required = 'review_moderate'
+    template_name = 'reviews/moderation.html'
+    paginate_by = 20
+    ordering = ('created', 'id')
+    extra_context = {
+        'title': 'Модерация отзывов'
+    }
+
+    def get_queryset(self):
+        """
+        Возвращает неактивные отзывы вместе с собакой, породой и автором.
+        Возвращает:
+        QuerySet: Отзывы, ожидающие модерации.
+        """
+        queryset = super().get_queryset().filter(sign_of_review=False, rejected=False)
+        return queryset.select_related('dog__breed', 'author')
+
+
+MODERATION_BATCH_LIMIT = 100
+
+
+@require_POST
+@capability_required('review_moderate')
+def review_moderate(request):
+    """
+    Одобряет или отклоняет отмеченные в очереди отзывы.
+    Одобрение включает отзывы, отклонение отмечает их отклоненными (отзывы остаются в базе данных),
+    оба действия выполняются одним запросом UPDATE.
+    Обрабатывается не больше MODERATION_BATCH_LIMIT отзывов за раз.
+    Параметры:
+    request: POST-запрос с полями action ('approve' или 'reject') и slug (несколько значений).
+    Возвращает:
+    Перенаправление на очередь модерации (следующую пачку отзывов).
+    """
+    action = request.POST.get('action')
+    slugs = request.POST.getlist('slug')[:MODERATION_BATCH_LIMIT]
+    if action == 'approve' and slugs:
+        count = Review.objects.set_activity(slugs, True)
+        messages.success(request, f'Одобрено отзывов: {count}')
+    elif action == 'reject' and slugs:
+        count = Review.objects.reject(slugs)
+        messages.success(request, f'Отклонено отзывов: {count}')
     else:
-        review_item.sign_of_review = True
-        review_item.save()
-        return redirect(reverse('reviews:reviews_list'))
+        messages.warning(request, 'Отметьте отзывы и выберите действие')
+    return redirect(reverse('reviews:review_moderation'))
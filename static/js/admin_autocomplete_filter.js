@@ -0,0 +1,16 @@
+// Переход по значению фильтра users.admin_utils.AutocompleteFilter на странице списка админки.
+'use strict';
+{
+    const $ = django.jQuery;
+    $(function () {
+        $('.js-autocomplete-filter').on('change', function () {
+            const params = new URLSearchParams(window.location.search);
+            params.delete(this.dataset.lookupKwarg);
+            params.delete('p');
+            if (this.value) {
+                params.set(this.dataset.lookupKwarg, this.value);
+            }
+            window.location.search = params.toString();
+        });
+    });
+}
@@ -0,0 +1,72 @@
+// Подсказки для полей поиска (dogs/includes/inc_search_fields.html), данные из api/autocomplete/.
+(function () {
+    var inputs = document.querySelectorAll('input[data-autocomplete]');
+    if (!inputs.length || !window.fetch) {
+        return;
+    }
+
+    function attach(input) {
+        var timer = null;
+        var request = 0;
+        var list = document.createElement('div');
+        list.className = 'list-group';
+        list.style.position = 'absolute';
+        list.style.zIndex = '1000';
+        list.style.display = 'none';
+        input.parentNode.style.position = 'relative';
+        input.parentNode.appendChild(list);
+
+        function hide() {
+            list.style.display = 'none';
+        }
+
+        function show(items) {
+            list.innerHTML = '';
+            items.forEach(function (item) {
+                var link = document.createElement('a');
+                link.className = 'list-group-item list-group-item-action py-1';
+                link.href = item.url;
+                link.textContent = item.breed ? item.name + ' (' + item.breed + ')' : item.name;
+                list.appendChild(link);
+            });
+            list.style.display = items.length ? '' : 'none';
+        }
+
+        function load() {
+            var query = input.value.trim();
+            if (!query) {
+                hide();
+                return;
+            }
+            var current = ++request;
+            var type = input.getAttribute('data-autocomplete');
+            var url = input.getAttribute('data-autocomplete-url') + '?type=' + encodeURIComponent(type) +
+                '&limit=8&q=' + encodeURIComponent(query);
+            fetch(url, {credentials: 'same-origin'}).then(function (response) {
+                return response.ok ? response.json() : {};
+            }).then(function (data) {
+                // Ответ на устаревший ввод не показываем.
+                if (current === request) {
+                    show(data[type] || []);
+                }
+            }).catch(hide);
+        }
+
+        input.setAttribute('autocomplete', 'off');
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(load, 150);
+        });
+        input.addEventListener('blur', function () {
+            // Задержка, чтобы успел сработать переход по подсказке.
+            setTimeout(hide, 200);
+        });
+        input.addEventListener('keydown', function (event) {
+            if (event.key === 'Escape') {
+                hide();
+            }
+        });
+    }
+
+    Array.prototype.forEach.call(inputs, attach);
+})();
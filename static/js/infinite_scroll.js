@@ -0,0 +1,62 @@
+// Подгрузка следующих страниц списка при прокрутке (FragmentListMixin).
+// Без JavaScript или IntersectionObserver остается обычная пагинация.
+(function () {
+    var list = document.querySelector('[data-infinite-scroll]');
+    if (!list || !window.IntersectionObserver || !window.fetch) {
+        return;
+    }
+    var loading = false;
+    var observer = new IntersectionObserver(function (entries) {
+        entries.forEach(function (entry) {
+            if (entry.isIntersecting) {
+                load(entry.target);
+            }
+        });
+    }, {rootMargin: '300px'});
+
+    function watch() {
+        var marker = list.querySelector('.js-next-page');
+        if (marker) {
+            observer.observe(marker);
+        }
+        return marker;
+    }
+
+    function load(marker) {
+        if (loading) {
+            return;
+        }
+        loading = true;
+        observer.unobserve(marker);
+        fetch(marker.getAttribute('data-next-page'), {
+            headers: {'X-Fragment': '1'},
+            credentials: 'same-origin'
+        }).then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.status);
+            }
+            return response.text();
+        }).then(function (html) {
+            var template = document.createElement('template');
+            template.innerHTML = html;
+            marker.remove();
+            list.appendChild(template.content);
+            loading = false;
+            watch();
+        }).catch(function () {
+            // Карточки не подгрузились - возвращаем обычную пагинацию.
+            loading = false;
+            observer.disconnect();
+            pagination.forEach(function (element) {
+                element.style.display = '';
+            });
+        });
+    }
+
+    var pagination = Array.prototype.slice.call(document.querySelectorAll('.pagination'));
+    if (watch()) {
+        pagination.forEach(function (element) {
+            element.style.display = 'none';
+        });
+    }
+})();
@@ -0,0 +1,75 @@
+// Клавиатурное управление очередью модерации отзывов (reviews/moderation.html).
+(function () {
+    var form = document.getElementById('moderation-form');
+    if (!form) {
+        return;
+    }
+    var rows = Array.prototype.slice.call(form.querySelectorAll('.moderation-row'));
+    var current = 0;
+
+    function checkbox(row) {
+        return row.querySelector('input[type="checkbox"]');
+    }
+
+    function focusRow(index) {
+        if (!rows.length) {
+            return;
+        }
+        rows[current].classList.remove('table-active');
+        current = Math.max(0, Math.min(rows.length - 1, index));
+        rows[current].classList.add('table-active');
+        rows[current].scrollIntoView({block: 'nearest'});
+    }
+
+    function submit(action) {
+        var selected = rows.filter(function (row) {
+            return checkbox(row).checked;
+        });
+        if (!selected.length) {
+            checkbox(rows[current]).checked = true;
+        }
+        var input = document.createElement('input');
+        input.type = 'hidden';
+        input.name = 'action';
+        input.value = action;
+        form.appendChild(input);
+        form.submit();
+    }
+
+    document.addEventListener('keydown', function (event) {
+        if (event.ctrlKey || event.metaKey || event.altKey || /INPUT|TEXTAREA|SELECT/.test(event.target.tagName) &&
+            event.target.type !== 'checkbox') {
+            return;
+        }
+        switch (event.key) {
+            case 'j':
+                focusRow(current + 1);
+                break;
+            case 'k':
+                focusRow(current - 1);
+                break;
+            case 'x':
+                checkbox(rows[current]).checked = !checkbox(rows[current]).checked;
+                break;
+            case '*':
+                var check = rows.some(function (row) {
+                    return !checkbox(row).checked;
+                });
+                rows.forEach(function (row) {
+                    checkbox(row).checked = check;
+                });
+                break;
+            case 'a':
+                submit('approve');
+                break;
+            case 'r':
+                submit('reject');
+                break;
+            default:
+                return;
+        }
+        event.preventDefault();
+    });
+
+    focusRow(0);
+})();
@@ -0,0 +1,85 @@
+// Поиск вариантов для списков users.widgets.RemoteSelect, данные из api/lookup/*.
+(function () {
+    function attach(select) {
+        var url = select.getAttribute('data-remote-select');
+        var timer = null;
+        var request = 0;
+        var page = 1;
+        var search = document.createElement('input');
+        search.type = 'search';
+        search.className = 'form-control mb-1';
+        search.placeholder = 'Поиск...';
+        search.setAttribute('autocomplete', 'off');
+        var more = document.createElement('button');
+        more.type = 'button';
+        more.className = 'btn btn-sm btn-link px-0';
+        more.textContent = 'Показать еще';
+        more.style.display = 'none';
+        select.parentNode.insertBefore(search, select);
+        select.parentNode.insertBefore(more, select.nextSibling);
+
+        function keepSelected() {
+            // Пустой и выбранный варианты остаются в списке при любом поиске.
+            Array.prototype.slice.call(select.options).forEach(function (option) {
+                if (option.value && !option.selected) {
+                    select.removeChild(option);
+                }
+            });
+        }
+
+        function load(append) {
+            var current = ++request;
+            page = append ? page + 1 : 1;
+            var params = '?page=' + page + '&q=' + encodeURIComponent(search.value.trim());
+            fetch(url + params, {credentials: 'same-origin'}).then(function (response) {
+                return response.ok ? response.json() : {results: [], more: false};
+            }).then(function (data) {
+                // Ответ на устаревший ввод не показываем.
+                if (current !== request) {
+                    return;
+                }
+                if (!append) {
+                    keepSelected();
+                }
+                data.results.forEach(function (item) {
+                    if (select.querySelector('option[value="' + item.id + '"]')) {
+                        return;
+                    }
+                    var option = document.createElement('option');
+                    option.value = item.id;
+                    option.textContent = item.text;
+                    select.appendChild(option);
+                });
+                more.style.display = data.more ? '' : 'none';
+            });
+        }
+
+        search.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                load(false);
+            }, 200);
+        });
+        more.addEventListener('click', function () {
+            load(true);
+        });
+        select.addEventListener('focus', function () {
+            if (page === 1 && request === 0) {
+                load(false);
+            }
+        });
+    }
+
+    function init() {
+        if (!window.fetch) {
+            return;
+        }
+        Array.prototype.forEach.call(document.querySelectorAll('select[data-remote-select]'), attach);
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
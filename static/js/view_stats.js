@@ -0,0 +1,34 @@
+// График просмотров собаки на странице собаки (dogs/detail.html).
+(function () {
+    var chart = document.getElementById('view-stats');
+    if (!chart || !window.fetch) {
+        return;
+    }
+    fetch(chart.getAttribute('data-url'), {credentials: 'same-origin'}).then(function (response) {
+        if (!response.ok) {
+            throw new Error(response.status);
+        }
+        return response.json();
+    }).then(function (series) {
+        var max = Math.max.apply(null, series.days.map(function (item) {
+            return item[1];
+        }).concat([1]));
+        series.days.forEach(function (item) {
+            var bar = document.createElement('div');
+            bar.title = item[0] + ': ' + item[1];
+            bar.className = 'bg-info';
+            bar.style.flex = '1';
+            bar.style.margin = '0 1px';
+            bar.style.height = Math.max(1, Math.round(item[1] / max * 100)) + '%';
+            chart.appendChild(bar);
+        });
+        var months = document.getElementById('view-stats-months');
+        if (months) {
+            months.textContent = 'По месяцам: ' + series.months.map(function (item) {
+                return item[0].slice(0, 7) + ' - ' + item[1];
+            }).join(', ');
+        }
+    }).catch(function () {
+        chart.textContent = 'Не удалось загрузить статистику просмотров.';
+    });
+})();
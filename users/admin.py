@@ -1,14 +1,18 @@
 from django.contrib import admin
+from users.admin_utils import LargeTableAdminMixin
 from users.models import User
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Админский интерфейс для модели пользователей (User).
     Атрибуты:
     list_display (tuple): Поля, отображаемые в списке пользователей.
     list_filter (tuple): Поля для фильтрации пользователей в админке.
+    search_fields (tuple): Поиск по началу эл. почты (уникальный индекс) или фамилии (индекс user_last_name_idx),
+    используется и автодополнением полей хозяина и автора.
     """
     list_display = ('pk', 'email', 'last_name', 'first_name', 'is_active')
-    list_filter = ('last_name',)
+    list_filter = ('role', 'is_active')
+    search_fields = ('^email', '^last_name')
@@ -0,0 +1,63 @@
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.forms import Media
+
+from database.paginator import EstimatedCountPaginator
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """
+    Фильтр списка объектов админки по внешнему ключу с поиском вместо списка всех связанных объектов.
+    Выводит только выбранное значение, варианты ищет автодополнение админки (admin:autocomplete)
+    по search_fields админки связанной модели.
+    """
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.app_label = model._meta.app_label
+        self.model_name = model._meta.model_name
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def has_output(self):
+        return True
+
+    def field_choices(self, field, request, model_admin):
+        """
+        Возвращает только выбранный связанный объект (один запрос по первичному ключу
+        через queryset админки связанной модели, если она зарегистрирована).
+        Возвращает:
+        list: Пары (первичный ключ, подпись).
+        """
+        value = self.lookup_val[-1] if self.lookup_val else None
+        if not value:
+            return []
+        related_admin = model_admin.admin_site._registry.get(field.related_model)
+        if related_admin is not None:
+            queryset = related_admin.get_queryset(request)
+        else:
+            queryset = field.related_model._default_manager.all()
+        try:
+            return [(obj.pk, str(obj)) for obj in queryset.filter(pk=value)]
+        except (ValueError, TypeError):
+            return []
+
+
+class LargeTableAdminMixin:
+    """
+    Миксин админки для больших таблиц: количество записей списка оценивается
+    EstimatedCountPaginator, общее количество записей без фильтров не считается,
+    на страницу подключаются скрипты фильтров AutocompleteFilter.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        media = super().media
+        for list_filter in self.list_filter:
+            if isinstance(list_filter, (tuple, list)) and issubclass(list_filter[1], AutocompleteFilter):
+                field = self.model._meta.get_field(list_filter[0])
+                media += AutocompleteSelect(field, self.admin_site).media
+                media += Media(js=['js/admin_autocomplete_filter.js'])
+                break
+        return media
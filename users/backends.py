@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from users.services import get_user_cache_key
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    Бэкенд аутентификации, берущий пользователя запроса из кэша.
+    AuthenticationMiddleware получает пользователя через get_user() на каждый запрос;
+    снимок пользователя хранится в кэше под ключом с версией, которая увеличивается
+    при каждом сохранении пользователя (см. users.signals), поэтому изменения профиля,
+    роли, пароля и активности сразу становятся видны.
+    Работает только при включенном общем кэше (CACHE_ENABLED), иначе читает базу данных.
+    """
+
+    def get_user(self, user_id):
+        """
+        Возвращает пользователя по первичному ключу из кэша или базы данных.
+        Параметры:
+        user_id (int): Первичный ключ пользователя.
+        Возвращает:
+        User | None: Активный пользователь или None.
+        """
+        if not settings.CACHE_ENABLED:
+            return super().get_user(user_id)
+        key = get_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = self.get_primary_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+    def get_primary_user(self, user_id):
+        """
+        Читает пользователя из основной базы данных, минуя маршрутизатор реплик:
+        снимок из отстающей реплики остался бы в кэше до следующего сохранения пользователя.
+        Параметры:
+        user_id (int): Первичный ключ пользователя.
+        Возвращает:
+        User | None: Активный пользователь или None.
+        """
+        user_model = get_user_model()
+        try:
+            user = user_model._default_manager.db_manager(DEFAULT_DB_ALIAS).get(pk=user_id)
+        except user_model.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
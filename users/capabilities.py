@@ -0,0 +1,122 @@
+from functools import wraps
+
+from django.contrib.auth.mixins import AccessMixin
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied
+
+from users.models import UserRoles
+
+# Действия, права на которые проверяют представления и шаблоны.
+ACTIONS = frozenset({
+    'admin_site',             # доступ к админке
+    'dog_create',             # добавление собаки
+    'dog_update_any',         # изменение чужой собаки
+    'dog_change_owner',       # смена хозяина собаки (форма DogAdminForm)
+    'dog_delete',             # удаление чужой собаки
+    'dog_toggle_any',         # включение/отключение чужой собаки
+    'dog_view_inactive_all',  # просмотр всех неактивных собак
+    'review_create',          # написание отзыва
+    'review_update_any',      # изменение чужого отзыва
+    'review_delete',          # удаление чужого отзыва
+    'review_moderate',        # модерация отзывов (неактивные отзывы, включение/отключение)
+})
+
+# Разрешенные действия для каждой роли.
+ROLE_ACTIONS = {
+    UserRoles.ADMIN: ACTIONS - {'dog_create'},
+    UserRoles.MODERATOR: {'dog_toggle_any', 'dog_view_inactive_all', 'review_update_any', 'review_delete',
+                          'review_moderate'},
+    UserRoles.USER: {'dog_create', 'review_create'},
+}
+
+_capability_matrix = {}
+
+
+def compile_capability_matrix():
+    """
+    Один раз при запуске строит матрицу роль -> набор возможностей.
+    Вызывается из UsersConfig.ready().
+    Исключения:
+    ValueError: Если в ROLE_ACTIONS указано неизвестное действие.
+    """
+    for role, actions in ROLE_ACTIONS.items():
+        unknown = set(actions) - ACTIONS
+        if unknown:
+            raise ValueError(f'Неизвестные действия для роли {role}: {", ".join(sorted(unknown))}')
+        _capability_matrix[role] = Capabilities(actions)
+    _capability_matrix[None] = Capabilities(())
+    _capability_matrix['superuser'] = Capabilities(ACTIONS)
+
+
+class Capabilities:
+    """
+    Набор разрешенных пользователю действий.
+    Проверка выполняется без запросов к базе данных:
+    'dog_delete' in capabilities, capabilities.dog_delete или {{ request.capabilities.dog_delete }} в шаблоне.
+    """
+    __slots__ = ('actions',)
+
+    def __init__(self, actions):
+        self.actions = frozenset(actions)
+
+    def __contains__(self, action):
+        return action in self.actions
+
+    def __getattr__(self, action):
+        if action not in ACTIONS:
+            raise AttributeError(action)
+        return action in self.actions
+
+    def __repr__(self):
+        return f'<Capabilities {sorted(self.actions)}>'
+
+
+def get_capabilities(user):
+    """
+    Возвращает возможности пользователя из заранее построенной матрицы.
+    Параметры:
+    user: Пользователь (или AnonymousUser).
+    Возвращает:
+    Capabilities: Разрешенные действия.
+    """
+    if not user.is_authenticated or not user.is_active:
+        return _capability_matrix[None]
+    if user.is_superuser:
+        return _capability_matrix['superuser']
+    return _capability_matrix.get(user.role, _capability_matrix[None])
+
+
+class CapabilityRequiredMixin(AccessMixin):
+    """
+    Миксин, пропускающий к представлению только пользователей с возможностью capability_required.
+    Неавторизованный пользователь перенаправляется на страницу входа,
+    авторизованный без нужной возможности получает 403.
+    Атрибуты:
+    capability_required (str): Необходимое действие из ACTIONS.
+    """
+    capability_required = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.capability_required not in request.capabilities:
+            return self.handle_no_permission()
+        return super().dispatch(request, *args, **kwargs)
+
+
+def capability_required(action):
+    """
+    Декоратор функции-представления, требующий возможность action.
+    Параметры:
+    action (str): Необходимое действие из ACTIONS.
+    Возвращает:
+    Декоратор представления.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if action in request.capabilities:
+                return view_func(request, *args, **kwargs)
+            if not request.user.is_authenticated:
+                return redirect_to_login(request.get_full_path())
+            raise PermissionDenied()
+        return wrapper
+    return decorator
@@ -1,5 +1,6 @@
 from django import forms
 
+from config.uploads import BoundedImageField
 from users.models import User
 from users.validators import validate_password
 from django.contrib.auth.forms import PasswordChangeForm, UserCreationForm, AuthenticationForm
@@ -60,6 +61,7 @@ class UserForm(StyleFormMixin, forms.ModelForm):
     class Meta:
         model = User
         fields = ('email', 'first_name', 'last_name', 'phone', 'avatar')
+        field_classes = {'avatar': BoundedImageField}
         # exclude = ('is_active',)
 
 
@@ -71,6 +73,7 @@ class UserUpdateForm(StyleFormMixin, forms.ModelForm):
     class Meta:
         model = User
         fields = ('email', 'first_name', 'first_name', 'last_name', 'phone', 'telegram', 'avatar')
+        field_classes = {'avatar': BoundedImageField}
 
 
 class UserPasswordChangeForm(StyleFormMixin, PasswordChangeForm):
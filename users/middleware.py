@@ -0,0 +1,19 @@
+from django.utils.functional import SimpleLazyObject
+
+from users.capabilities import get_capabilities
+
+
+class CapabilitiesMiddleware:
+    """
+    Middleware, добавляющий в запрос request.capabilities - набор действий,
+    разрешенных текущему пользователю (см. users.capabilities).
+    Возможности вычисляются при первом обращении и запоминаются до конца запроса.
+    Должен стоять после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.capabilities = SimpleLazyObject(lambda: get_capabilities(request.user))
+        return self.get_response(request)
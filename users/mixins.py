@@ -0,0 +1,256 @@
+import hashlib
+import inspect
+
+from django.core.paginator import InvalidPage, Page
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.generic.base import ContextMixin
+
+
+class ConditionalResponseMixin:
+    """
+    Миксин для детальных представлений с поддержкой условных запросов.
+    До загрузки объекта и рендеринга шаблона выполняет дешевый запрос
+    values() по датам изменения и отвечает 304 Not Modified, если у клиента
+    актуальная версия страницы (If-None-Match / If-Modified-Since).
+    Атрибуты:
+    conditional_fields (tuple): Поля с датами изменения объекта и связанных объектов,
+    отображаемых на странице (в том числе имена выражений из get_conditional_annotations()).
+    conditional_extra_fields (tuple): Дополнительные поля, передаваемые в not_modified().
+    """
+    conditional_fields = ('updated_at',)
+    conditional_extra_fields = ()
+
+    def get_conditional_annotations(self):
+        """
+        Возвращает выражения дат изменения, которых нет среди полей объекта
+        (например, подзапросы по связанным записям).
+        Возвращает:
+        dict: Имя -> выражение.
+        """
+        return {}
+
+    def get_conditional_queryset(self):
+        """
+        Возвращает запрос дат изменения объекта без загрузки связанных объектов.
+        Возвращает:
+        QuerySet | None: Запрос values() или None, если в URL нет pk или slug.
+        """
+        queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        elif slug is not None:
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        else:
+            return None
+        annotations = self.get_conditional_annotations()
+        fields = [field for field in (*self.conditional_fields, *self.conditional_extra_fields)
+                  if field not in annotations]
+        return queryset.values('pk', *fields, **annotations)
+
+    def get_conditional_row(self):
+        """
+        Выбирает даты изменения объекта одним запросом.
+        Возвращает:
+        dict | None: Значения полей или None, если объект не найден.
+        """
+        queryset = self.get_conditional_queryset()
+        return queryset.first() if queryset is not None else None
+
+    def get_not_modified_response(self, row):
+        """
+        Проверяет условные заголовки запроса.
+        Параметры:
+        row (dict): Значения полей, полученные в get_conditional_row().
+        Возвращает:
+        tuple: Ответ 304 (или None, если страницу нужно отдать целиком), ETag
+        и дата последнего изменения в секундах (или None).
+        """
+        etag, last_modified = self.get_validators(row)
+        last_modified_timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=last_modified_timestamp)
+        return response, etag, last_modified_timestamp
+
+    @staticmethod
+    def set_validators(response, etag, last_modified_timestamp):
+        """
+        Проставляет в ответ заголовки ETag, Last-Modified и Cache-Control.
+        Параметры:
+        response (HttpResponse): Ответ с отрендеренной страницей.
+        etag (str): ETag страницы.
+        last_modified_timestamp (int | None): Дата последнего изменения в секундах.
+        """
+        response['ETag'] = etag
+        if last_modified_timestamp is not None:
+            response['Last-Modified'] = http_date(last_modified_timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+
+    def get_validators(self, row):
+        """
+        Вычисляет ETag и дату последнего изменения страницы.
+        ETag зависит от текущего пользователя, так как страница содержит
+        элементы, видимые только владельцу или администратору.
+        Параметры:
+        row (dict): Значения полей, полученные в get_conditional_row().
+        Возвращает:
+        tuple: ETag и дата последнего изменения (или None).
+        """
+        stamps = [row[field] for field in self.conditional_fields if row[field] is not None]
+        last_modified = max(stamps) if stamps else None
+        source = ':'.join([
+            self.model._meta.label,
+            str(row['pk']),
+            str(self.request.user.pk),
+            *(str(row[field]) for field in self.conditional_fields),
+        ])
+        etag = f'"{hashlib.md5(source.encode()).hexdigest()}"'
+        return etag, last_modified
+
+    def not_modified(self, row):
+        """
+        Вызывается перед ответом 304 Not Modified.
+        Параметры:
+        row (dict): Значения полей, полученные в get_conditional_row().
+        """
+        pass
+
+    def get(self, request, *args, **kwargs):
+        """
+        Обрабатывает GET-запрос с проверкой условных заголовков.
+        Возвращает:
+        HttpResponse: 304 Not Modified или полностью отрендеренную страницу
+        с заголовками ETag и Last-Modified.
+        """
+        row = self.get_conditional_row()
+        if row is None:
+            return super().get(request, *args, **kwargs)
+        response, etag, last_modified_timestamp = self.get_not_modified_response(row)
+        if response is not None:
+            self.not_modified(row)
+            return response
+        response = super().get(request, *args, **kwargs)
+        self.set_validators(response, etag, last_modified_timestamp)
+        return response
+
+
+class FragmentListMixin:
+    """
+    Миксин для списков с подгрузкой страниц при прокрутке (static/js/infinite_scroll.js).
+    Если запрос содержит заголовок X-Fragment: 1 или параметр ?fragment=1, рендерится
+    только шаблон fragment_template_name: карточки страницы и метка следующей страницы,
+    без base.html и остальной разметки.
+    Атрибуты:
+    fragment_template_name (str): Шаблон с карточками одной страницы.
+    """
+    fragment_template_name = None
+    fragment_header = 'X-Fragment'
+    fragment_param = 'fragment'
+
+    def is_fragment_request(self):
+        """
+        Проверяет, запрошены ли только карточки страницы.
+        Возвращает:
+        bool: True для запроса фрагмента.
+        """
+        return (self.request.headers.get(self.fragment_header) == '1'
+                or self.request.GET.get(self.fragment_param) == '1')
+
+    def get_template_names(self):
+        if self.is_fragment_request():
+            return [self.fragment_template_name]
+        return super().get_template_names()
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Рендерит страницу или фрагмент. Ответ различается по заголовку X-Fragment,
+        поэтому он добавляется в Vary, чтобы кэши не путали страницу и фрагмент.
+        """
+        response = super().render_to_response(context, **response_kwargs)
+        patch_vary_headers(response, (self.fragment_header,))
+        return response
+
+
+class AsyncViewMixin:
+    """
+    Миксин для асинхронных версий представлений.
+    Загружает пользователя асинхронно (request.auser()) до проверок доступа,
+    чтобы обращение к request.user не выполняло запрос к базе данных
+    в асинхронном контексте.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Загружает пользователя и передает запрос обработчику.
+        Возвращает:
+        HttpResponse: Ответ обработчика или перенаправление на страницу входа.
+        """
+        request.user = await request.auser()
+        response = super().dispatch(request, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+
+class AsyncListMixin(AsyncViewMixin):
+    """
+    Миксин, заменяющий get() ListView асинхронной версией.
+    Подсчет записей и выборка страницы выполняются через асинхронный ORM
+    (acount(), async for), набор записей берется из get_queryset() представления.
+    """
+
+    async def paginate_queryset_async(self, queryset, page_size):
+        """
+        Асинхронно разбивает набор записей на страницы.
+        Параметры:
+        queryset (QuerySet): Набор записей.
+        page_size (int): Размер страницы.
+        Возвращает:
+        tuple: Пагинатор, страница, список записей страницы и признак наличия других страниц.
+        Исключения:
+        Http404: Если номер страницы некорректен.
+        """
+        paginator = self.get_paginator(queryset, page_size, allow_empty_first_page=self.get_allow_empty())
+        paginator.count = await queryset.acount()
+        page_number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        if page_number == 'last':
+            page_number = paginator.num_pages
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as ex:
+            raise Http404(str(ex))
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        object_list = [obj async for obj in queryset[bottom:top]]
+        page = Page(object_list, number, paginator)
+        return paginator, page, object_list, page.has_other_pages()
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Асинхронно обрабатывает GET-запрос к списку записей.
+        Возвращает:
+        TemplateResponse: Страница со списком записей.
+        """
+        queryset = self.get_queryset()
+        page_size = self.get_paginate_by(queryset)
+        if page_size:
+            paginator, page, object_list, is_paginated = await self.paginate_queryset_async(queryset, page_size)
+        else:
+            paginator, page, is_paginated = None, None, False
+            object_list = [obj async for obj in queryset]
+        self.object_list = object_list
+        context = {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'object_list': object_list,
+        }
+        context_object_name = self.get_context_object_name(queryset)
+        if context_object_name is not None:
+            context[context_object_name] = object_list
+        context = ContextMixin.get_context_data(self, **context)
+        return self.render_to_response(context)
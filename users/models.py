@@ -27,6 +27,7 @@ class User(AbstractUser):
     telegram (CharField): Telegram пользователя (опционально).
     avatar (ImageField): Аватар пользователя (опционально).
     is_active (BooleanField): Статус активности пользователя.
+    updated_at (DateTimeField): Дата и время последнего изменения профиля.
     Атрибуты:
     USERNAME_FIELD: Поле, используемое для аутентификации (email).
     REQUIRED_FIELDS: Список обязательных полей для создания пользователя.
@@ -42,6 +43,7 @@ class User(AbstractUser):
     telegram = models.CharField(max_length=150, verbose_name='Телеграм', **NULLABLE)
     avatar = models.ImageField(upload_to='users/', verbose_name='Аватар', **NULLABLE)
     is_active = models.BooleanField(default=True, verbose_name='Активность')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменен')
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
@@ -53,3 +55,9 @@ class User(AbstractUser):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['id']
+        # Поиск пользователя по началу фамилии в админке.
+        indexes = [
+            models.Index(fields=['last_name'], name='user_last_name_idx'),
+            # Подсчет ссылок на файл аватара (config.storage).
+            models.Index(fields=['avatar'], name='user_avatar_idx'),
+        ]
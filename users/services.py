@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.cache import cache
 from django.core.mail import send_mail
 
 
@@ -31,3 +32,29 @@ def send_new_password(email, new_password):
         from_email=settings.EMAIL_HOST_USER,
         recipient_list=[email]
     )
+
+
+def get_user_cache_key(user_id):
+    """
+    Возвращает ключ кэша снимка пользователя с учетом текущей версии.
+    Параметры:
+    user_id (int): Первичный ключ пользователя.
+    Возвращает:
+    str: Ключ кэша вида users:user:<id>:<версия>.
+    """
+    version = cache.get(f'users:user_version:{user_id}', 0)
+    return f'users:user:{user_id}:{version}'
+
+
+def invalidate_user_cache(user_id):
+    """
+    Делает кэшированный снимок пользователя недействительным, увеличивая его версию.
+    Вызывается при любом сохранении пользователя (профиль, роль, пароль, активность).
+    Параметры:
+    user_id (int): Первичный ключ пользователя.
+    """
+    key = f'users:user_version:{user_id}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from config.storage import remember_replaced_file, pop_replaced_files, release_file
+from config.uploads import remember_new_upload, pop_new_uploads, schedule_normalization
+from users.models import User
+from users.services import invalidate_user_cache
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """
+    Сбрасывает кэшированный снимок пользователя после его изменения или удаления.
+    """
+    invalidate_user_cache(instance.pk)
+
+
+@receiver(pre_save, sender=User)
+def user_avatar_replacing(sender, instance, update_fields=None, **kwargs):
+    """
+    Запоминает новую загрузку аватара и прежний аватар, если он заменяется или удаляется.
+    """
+    remember_new_upload(instance, 'avatar')
+    remember_replaced_file(sender, instance, 'avatar', update_fields)
+
+
+@receiver(post_save, sender=User)
+def user_avatar_replaced(sender, instance, **kwargs):
+    """
+    После фиксации транзакции удаляет прежний аватар, если на него больше никто не ссылается,
+    и ставит новый аватар в очередь нормализации.
+    """
+    for name in pop_replaced_files(instance):
+        transaction.on_commit(lambda name=name: release_file(name))
+    if pop_new_uploads(instance):
+        transaction.on_commit(lambda name=instance.avatar.name: schedule_normalization(name))
+
+
+@receiver(post_delete, sender=User)
+def user_avatar_deleted(sender, instance, **kwargs):
+    """
+    После удаления пользователя удаляет его аватар, если на него больше никто не ссылается.
+    """
+    if instance.avatar:
+        transaction.on_commit(lambda name=instance.avatar.name: release_file(name))
@@ -8,6 +8,8 @@ from django.views.generic import CreateView, UpdateView, ListView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 
+from database.routers import mark_user_write
+from users.mixins import ConditionalResponseMixin, FragmentListMixin
 from users.models import User
 from users.forms import UserRegisterForm, UserLoginForm, UserUpdateForm, UserPasswordChangeForm, UserForm
 from users.services import send_new_password, send_register_email
@@ -54,7 +56,7 @@ class UserLoginView(LoginView):
     }
 
 
-class UserProfileView(UpdateView):
+class UserProfileView(LoginRequiredMixin, UpdateView):
     """
     Представление для отображения профиля пользователя.
     Позволяет пользователям просматривать информацию о своем профиле в режиме только для чтения.
@@ -62,6 +64,7 @@ class UserProfileView(UpdateView):
     model = User
     form_class = UserForm
     template_name = 'users/user_profile_read_only.html'
+    read_from_primary = True
     extra_context = {
         'title': 'Ваш профиль'
     }
@@ -70,7 +73,7 @@ class UserProfileView(UpdateView):
         return self.request.user
 
 
-class UserUpdateView(UpdateView):
+class UserUpdateView(LoginRequiredMixin, UpdateView):
     """
     Представление для обновления информации о пользователе.
     Позволяет пользователям изменять свои данные, такие как email, имя и аватар.
@@ -78,6 +81,7 @@ class UserUpdateView(UpdateView):
     model = User
     form_class = UserUpdateForm
     template_name = 'users/user_update.html'
+    read_from_primary = True
     success_url = reverse_lazy('users:user_profile')
     extra_context = {
         'title': 'Обновить профиль',
@@ -102,6 +106,7 @@ class UserPasswordChangeView(PasswordChangeView):
     """
     form_class = UserPasswordChangeForm
     template_name = 'users/user_change_password.html'
+    read_from_primary = True
     success_url = reverse_lazy('users:user_profile')
     extra_context = {
         'title': 'Изменение пароля',
@@ -120,7 +125,7 @@ class UserLogoutView(LogoutView):
     }
 
 
-class UserListView(LoginRequiredMixin, ListView):
+class UserListView(LoginRequiredMixin, FragmentListMixin, ListView):
     """
     Представление для отображения списка пользователей.
     Отображает всех активных пользователей в системе.
@@ -130,6 +135,7 @@ class UserListView(LoginRequiredMixin, ListView):
         'title': 'Питомник все наши пользователи'
     }
     template_name = 'users/users.html'
+    fragment_template_name = 'users/users_fragment.html'
     paginate_by = 3
 
     def get_queryset(self):
@@ -143,10 +149,11 @@ class UserListView(LoginRequiredMixin, ListView):
         return queryset
 
 
-class UserDetailView(DetailView):
+class UserDetailView(ConditionalResponseMixin, DetailView):
     """
     Представление для отображения деталей профиля пользователя.
     Позволяет пользователям просматривать информацию о конкретном пользователе.
+    Отвечает 304 Not Modified, если профиль не менялся.
     """
     model = User
     template_name = 'users/user_detail_view.html'
@@ -159,9 +166,8 @@ class UserDetailView(DetailView):
         Возвращает:
         Объект контекста с добавленным заголовком профиля пользователя.
         """
-        context_data = super().get_context_data()
-        user_obj = self.get_object()
-        context_data['title'] = f'Профиль пользователя {user_obj}'
+        context_data = super().get_context_data(**kwargs)
+        context_data['title'] = f'Профиль пользователя {self.object}'
         return context_data
 
 
@@ -179,5 +185,6 @@ def user_generate_new_password_view(request):
     new_password = ''.join(random.sample((string.ascii_letters + string.digits), 12))
     request.user.set_password(new_password)
     request.user.save()
+    mark_user_write()
     send_new_password(request.user.email, new_password)
     return redirect(reverse('dogs:index'))
@@ -0,0 +1,56 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse_lazy
+
+
+class RemoteSelect(forms.Select):
+    """
+    Выпадающий список для внешнего ключа на большую таблицу.
+    В разметку попадают только пустой вариант и выбранные значения (одним запросом по первичному ключу),
+    остальные варианты подгружает static/js/remote_select.js постранично из lookup_url по введенному тексту.
+    Проверка значения при отправке формы остается за ModelChoiceField: один запрос queryset.get(pk=...).
+    Атрибуты:
+    lookup_url (str): Адрес поиска вариантов (см. api.views.LookupView).
+    """
+
+    class Media:
+        js = ('js/remote_select.js',)
+
+    def __init__(self, lookup_url_name, attrs=None):
+        """
+        Параметры:
+        lookup_url_name (str): Имя маршрута поиска вариантов.
+        attrs (dict): HTML-атрибуты списка.
+        """
+        super().__init__(attrs)
+        self.lookup_url = reverse_lazy(lookup_url_name)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-remote-select'] = str(self.lookup_url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        """
+        Возвращает варианты списка: пустой вариант и выбранные значения.
+        Параметры:
+        name (str): Имя поля.
+        value (list): Выбранные значения в виде строк.
+        Возвращает:
+        list: Группы вариантов в формате forms.Select.optgroups.
+        """
+        field = self.choices.field
+        selected = [item for item in value if item not in ('', None)]
+        options = []
+        if field.empty_label is not None:
+            options.append(self.create_option(name, '', field.empty_label, not selected, 0))
+        try:
+            objects = list(self.choices.queryset.filter(pk__in=selected)) if selected else []
+        except (ValueError, ValidationError):
+            # Некорректное значение из отправленной формы: ошибку покажет проверка поля.
+            objects = []
+        for index, obj in enumerate(objects, start=len(options)):
+            options.append(self.create_option(
+                name, str(field.prepare_value(obj)), field.label_from_instance(obj), True, index,
+            ))
+        return [(None, options, 0)]